@@ -0,0 +1,127 @@
+"""
+Codec Micro-Benchmark
+
+Compares the table-driven decode_strategy/encode_strategy against the
+original per-character reference loops and checks that both produce
+identical output. Codec caches are disabled while timing so every call
+does the full work.
+"""
+import base64
+import struct
+import sys
+import os
+import timeit
+import zlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from ff14_strategy_pack.ff14_strategy import (
+    decode_strategy, encode_strategy,
+    _char_to_value, _value_to_char, _substitute_decode, _substitute_encode,
+)
+from ff14_strategy_pack.ff14_strategy_cache import configure_cache, get_cache
+from ff14_strategy_pack.ff14_strategy_numpy import (
+    HAS_NUMPY, decode_strategies, encode_strategies,
+)
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), '..', 'all_48_jobs.txt')
+
+CODEC_CACHES = ('decode', 'encode', 'compress')
+
+
+def reference_decode(stgy_code: str) -> bytes:
+    """Per-character decode (original implementation)."""
+    code = stgy_code.replace('[stgy:a', '').rstrip(']')
+    substituted = ''.join(_substitute_decode(c) for c in code)
+    seed = _char_to_value(substituted[0])
+    deobfuscated = []
+    for i, char in enumerate(substituted[1:]):
+        val = _char_to_value(char)
+        deobfuscated.append(_value_to_char((val - i - seed) & 0x3f))
+    b64 = ''.join(deobfuscated).replace('-', '+').replace('_', '/')
+    while len(b64) % 4:
+        b64 += '='
+    raw = base64.b64decode(b64)
+    crc_stored = struct.unpack('<I', raw[0:4])[0]
+    if crc_stored != zlib.crc32(raw[4:]) & 0xffffffff:
+        raise ValueError("CRC mismatch")
+    return zlib.decompress(raw[6:])
+
+
+def reference_encode(binary_data: bytes, seed: int = 10) -> str:
+    """Per-character encode (original implementation)."""
+    payload = struct.pack('<H', len(binary_data)) + zlib.compress(binary_data, 6)
+    raw = struct.pack('<I', zlib.crc32(payload) & 0xffffffff) + payload
+    b64 = base64.b64encode(raw).decode().rstrip('=')
+    b64 = b64.replace('+', '-').replace('/', '_')
+    obfuscated = []
+    for i, c in enumerate(b64):
+        obfuscated.append(_value_to_char((_char_to_value(c) + i + seed) & 0x3f))
+    substituted = ''.join(_substitute_encode(c) for c in obfuscated)
+    return f"[stgy:a{_substitute_encode(_value_to_char(seed))}{substituted}]"
+
+
+def load_sample() -> str:
+    with open(SAMPLE_FILE, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('[stgy:'):
+                return line.strip()
+    raise RuntimeError(f"No strategy code found in {SAMPLE_FILE}")
+
+
+def bench(label: str, fn, number: int, items: int = 1) -> float:
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    ops = number * items
+    per_call = best / ops * 1e6
+    print(f"  {label:<24} {per_call:9.2f} us/op  {ops / best:12,.0f} ops/s")
+    return per_call
+
+
+def run():
+    code = load_sample()
+    data = decode_strategy(code)
+
+    # Byte-for-byte compatibility check
+    for seed in range(64):
+        encoded = encode_strategy(data, seed)
+        assert encoded == reference_encode(data, seed), f"encode mismatch (seed={seed})"
+        assert decode_strategy(encoded) == reference_decode(encoded) == data
+
+    print(f"Sample: {len(code)} chars, {len(data)} bytes decoded")
+    print("-" * 60)
+
+    number = 2000
+    ref_dec = bench("decode (reference)", lambda: reference_decode(code), number)
+    new_dec = bench("decode (table)", lambda: decode_strategy(code), number)
+    ref_enc = bench("encode (reference)", lambda: reference_encode(data), number)
+    new_enc = bench("encode (table)", lambda: encode_strategy(data), number)
+
+    print("-" * 60)
+    print(f"  decode speedup: {ref_dec / new_dec:.1f}x")
+    print(f"  encode speedup: {ref_enc / new_enc:.1f}x")
+
+    # Bulk backend (NumPy when installed, pure-Python fallback otherwise)
+    batch = [code] * 1000
+    binaries = [data] * 1000
+    assert decode_strategies(batch) == binaries
+    assert encode_strategies(binaries) == [encode_strategy(data)] * 1000
+
+    backend = "numpy" if HAS_NUMPY else "pure-python"
+    print("-" * 60)
+    print(f"Batch of {len(batch)} ({backend} backend):")
+    bench("decode_strategies", lambda: decode_strategies(batch), 5, len(batch))
+    bench("encode_strategies", lambda: encode_strategies(binaries), 5, len(binaries))
+
+
+def main():
+    saved_limits = {name: get_cache(name).max_items for name in CODEC_CACHES}
+    for name in CODEC_CACHES:
+        configure_cache(name, max_items=0)
+    try:
+        run()
+    finally:
+        for name, limit in saved_limits.items():
+            configure_cache(name, max_items=limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compact Board Memory Benchmark
+
+Holds the same set of decoded boards in memory twice, once as
+decode_full() dicts and once as CompactBoard struct-of-arrays, and
+compares the bytes allocated (tracemalloc) and the build time.
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ff14_strategy_pack.ff14_strategy import decode_strategy
+from ff14_strategy_pack.ff14_strategy_compact import CompactBoard
+from ff14_strategy_pack.strategy_generator import TYPES, generate_strategy
+from benchmark_codec import load_sample
+from decode_strategy import decode_full, get_type_name
+
+BOARDS = 20000
+
+
+def make_codes(n: int) -> list:
+    """The 48-job sample plus generated boards of 1-48 objects."""
+    names = sorted(TYPES)
+    codes = [load_sample()]
+    for i in range(1, 64):
+        count = 1 + i % 48
+        objects = [(names[(i + j) % len(names)], 20 + (j * 37) % 470, 20 + (j * 53) % 340)
+                   for j in range(count)]
+        codes.append(generate_strategy(f"Board {i}", objects))
+    return [codes[i % len(codes)] for i in range(n)]
+
+
+def measure(label: str, build, codes: list) -> int:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = [build(c) for c in codes]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    objects = sum(len(h["objects"]) if isinstance(h, dict) else len(h) for h in held)
+    print(f"  {label:<14} {current / 1e6:9.1f} MB  {current / len(held):8.0f} B/board  "
+          f"{current / objects:6.1f} B/object  {elapsed:6.2f} s")
+    del held
+    return current
+
+
+def main():
+    codes = make_codes(BOARDS)
+    for code in set(codes):
+        decode_strategy(code)  # warm the decode cache so only the held form is measured
+
+    print(f"{len(codes)} boards")
+    print("-" * 72)
+    dicts = measure("decode_full", decode_full, codes)
+    compact = measure("CompactBoard", CompactBoard.from_code, codes)
+    print("-" * 72)
+    print(f"  CompactBoard uses {dicts / compact:.1f}x less memory")
+
+    # Same content through the proxy
+    sample = codes[0]
+    expected = decode_full(sample)
+    as_dict = CompactBoard.from_code(sample).to_dict(get_type_name)
+    assert as_dict["objects"] == expected["objects"] and as_dict["title"] == expected["title"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Benchmark Suite
+
+Times every codec and edit path across object counts from 1 to
+MAX_OBJECTS and guards against regressions:
+
+    decode, encode, validate, generate_strategy, decode_full,
+    modify_coordinates (codec + utils), modify_sizes, modify_angles,
+    modify_transparency, modify_all_params,
+    find_coord_block (parsed index and the method-3 value scan)
+
+For each case it reports ops/s (best of several timed runs) and the peak
+bytes allocated by one call (tracemalloc). Codec caches are disabled
+while timing so every call does the full work (--with-caches keeps them).
+
+Baselines:
+    python examples/benchmark_suite.py --save baseline.json
+    python examples/benchmark_suite.py --compare baseline.json --threshold 0.15
+
+--compare exits with status 1 when any case is slower than its baseline
+by more than --threshold (fraction of ops/s), or allocates more than
+--alloc-threshold above its baseline peak.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from ff14_strategy_pack import ff14_strategy, ff14_strategy_utils
+from ff14_strategy_pack.ff14_strategy import decode_strategy, encode_strategy, validate_strategy
+from ff14_strategy_pack.ff14_strategy_board import BLOCK_COORD, StrategyBoard
+from ff14_strategy_pack.ff14_strategy_cache import configure_cache, get_cache
+from ff14_strategy_pack.ff14_strategy_synth import MAX_OBJECTS
+from ff14_strategy_pack.strategy_generator import TYPES, generate_strategy
+from decode_strategy import decode_full
+
+DEFAULT_COUNTS = (1, 2, 4, 8, 16, 32, 48, MAX_OBJECTS)
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_ALLOC_THRESHOLD = 0.25
+DEFAULT_MIN_TIME = 0.1   # seconds per timed run
+DEFAULT_REPEAT = 5
+
+CODEC_CACHES = ('decode', 'encode', 'compress', 'board')
+
+# Every type but Text (no text block); each generated object gets a position
+# the method-3 value scan accepts (x, y x10 within 500-5000 / 500-3800)
+_OBJECT_TYPES = sorted(name for name in TYPES if name != 'text')
+
+
+class Case(NamedTuple):
+    name: str
+    count: int
+    fn: Callable[[], object]
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.count}]"
+
+
+class Result(NamedTuple):
+    ops_per_sec: float
+    peak_bytes: int
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+def make_objects(n: int) -> list:
+    return [(_OBJECT_TYPES[i % len(_OBJECT_TYPES)], 60 + (i * 37) % 390, 60 + (i * 53) % 280)
+            for i in range(n)]
+
+
+def corrupt_coord_header(data: bytes) -> bytes:
+    """Binary whose COORD header is unrecognizable, forcing the method-3 scan."""
+    board = StrategyBoard(data)
+    broken = bytearray(data)
+    broken[board.offset(BLOCK_COORD) - 6] = 0xEE
+    assert ff14_strategy_utils.try_parse_board(bytes(broken)) is None
+    return bytes(broken)
+
+
+def build_cases(counts) -> List[Case]:
+    cases = []
+    for n in counts:
+        objects = make_objects(n)
+        title = f"Benchmark {n}"
+        code = generate_strategy(title, objects)
+        data = decode_strategy(code)
+        broken = corrupt_coord_header(data)
+        sizes = [50 + i % 150 for i in range(n)]
+        angles = [(i * 15) % 360 for i in range(n)]
+        alphas = [i % 100 for i in range(n)]
+
+        cases += [
+            Case('decode', n, lambda code=code: decode_strategy(code)),
+            Case('encode', n, lambda data=data: encode_strategy(data)),
+            Case('validate', n, lambda code=code: validate_strategy(code)),
+            Case('generate_strategy', n, lambda t=title, o=objects: generate_strategy(t, o)),
+            Case('decode_full', n, lambda code=code: decode_full(code)),
+            Case('modify_coordinates.codec', n,
+                 lambda code=code: ff14_strategy.modify_coordinates(code, 0, 100.0, 120.0)),
+            Case('modify_coordinates', n,
+                 lambda code=code, n=n: ff14_strategy_utils.modify_coordinates(code, n - 1, 100.0, 120.0)),
+            Case('modify_sizes', n,
+                 lambda code=code, n=n, v=sizes: ff14_strategy_utils.modify_sizes(code, n, v)),
+            Case('modify_angles', n,
+                 lambda code=code, n=n, v=angles: ff14_strategy_utils.modify_angles(code, n, v)),
+            Case('modify_transparency', n,
+                 lambda code=code, n=n, v=alphas: ff14_strategy_utils.modify_transparency(code, n, v)),
+            Case('modify_all_params', n,
+                 lambda code=code, n=n, s=sizes, a=angles, t=alphas:
+                 ff14_strategy_utils.modify_all_params(code, n, s, a, t)),
+            Case('find_coord_block', n,
+                 lambda data=data, n=n: ff14_strategy_utils.find_coord_block(data, n)),
+            Case('find_coord_block.scan', n,
+                 lambda data=broken, n=n: ff14_strategy_utils.find_coord_block(data, n)),
+        ]
+    return cases
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+def time_case(fn, min_time: float, repeat: int) -> float:
+    """Best ops/s over repeat runs of at least min_time seconds each."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        number *= 2
+    number = max(1, int(number * min_time / elapsed))
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return 1.0 / best if best else float('inf')
+
+
+def peak_allocation(fn) -> int:
+    """Peak bytes allocated during one call."""
+    fn()  # warm lazy state (templates, tables) outside the measurement
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def run(cases: List[Case], min_time: float, repeat: int) -> Dict[str, Result]:
+    results = {}
+    print(f"{'case':<36} {'ops/s':>14} {'peak alloc':>12}")
+    print("-" * 64)
+    for case in cases:
+        result = Result(time_case(case.fn, min_time, repeat), peak_allocation(case.fn))
+        results[case.key] = result
+        print(f"{case.key:<36} {result.ops_per_sec:14,.0f} {result.peak_bytes:10,d} B")
+    return results
+
+
+# ============================================================================
+# Baselines
+# ============================================================================
+
+def save_baseline(path: str, results: Dict[str, Result], with_caches: bool):
+    payload = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'with_caches': with_caches,
+        },
+        'results': {key: r._asdict() for key, r in results.items()},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    print(f"Saved {len(results)} results to {path}")
+
+
+def compare(path: str, results: Dict[str, Result], threshold: float,
+            alloc_threshold: float) -> List[str]:
+    """Regression messages for results worse than the baseline at path."""
+    with open(path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    failures = []
+    print()
+    print(f"{'case':<36} {'ops/s vs base':>14} {'alloc vs base':>14}")
+    print("-" * 66)
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<36} {'(new)':>14}")
+            continue
+        speed = result.ops_per_sec / base['ops_per_sec'] - 1.0
+        alloc = (result.peak_bytes / base['peak_bytes'] - 1.0) if base['peak_bytes'] else 0.0
+        flag = ''
+        if speed < -threshold:
+            failures.append(f"{key}: {-speed:.0%} slower than baseline")
+            flag = '  SLOWER'
+        if alloc > alloc_threshold:
+            failures.append(f"{key}: {alloc:.0%} more peak allocation than baseline")
+            flag += '  ALLOC'
+        print(f"{key:<36} {speed:+13.1%} {alloc:+13.1%}{flag}")
+    return failures
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark codec and edit paths with regression baselines.")
+    parser.add_argument('--counts', default=','.join(map(str, DEFAULT_COUNTS)),
+                        help="Comma-separated object counts (default: %(default)s)")
+    parser.add_argument('--filter', default='', help="Only run cases whose name contains this")
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--with-caches', action='store_true', help="Keep the codec caches enabled")
+    parser.add_argument('--save', metavar='PATH', help="Write results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="Compare against a JSON baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed ops/s drop as a fraction (default: %(default)s)")
+    parser.add_argument('--alloc-threshold', type=float, default=DEFAULT_ALLOC_THRESHOLD,
+                        help="Allowed peak allocation growth as a fraction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    counts = sorted({min(max(int(c), 1), MAX_OBJECTS) for c in args.counts.split(',')})
+    cases = [c for c in build_cases(counts) if args.filter in c.name]
+
+    saved_limits = {name: get_cache(name).max_items for name in CODEC_CACHES}
+    if not args.with_caches:
+        for name in CODEC_CACHES:
+            configure_cache(name, max_items=0)
+    try:
+        results = run(cases, args.min_time, args.repeat)
+    finally:
+        for name, limit in saved_limits.items():
+            configure_cache(name, max_items=limit)
+
+    if args.save:
+        save_baseline(args.save, results, args.with_caches)
+    if args.compare:
+        failures = compare(args.compare, results, args.threshold, args.alloc_threshold)
+        if failures:
+            print()
+            for failure in failures:
+                print(f"REGRESSION {failure}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Generate Every Light Party Composition
+- Tank x Healer x Melee DPS x Ranged/Caster DPS (4 x 4 x 5 x 6 = 480 boards)
+- 1 Circle AOE in center
+- Written to an indexed variant file instead of one print per code
+"""
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from ff14_strategy_pack.strategy_variants import VariantSpace, read_variants, load_space
+
+# Job pools
+TANKS = ["paladin", "warrior", "dark_knight", "gunbreaker"]
+HEALERS = ["white_mage", "scholar", "astrologian", "sage"]
+DPS_MELEE = ["monk", "dragoon", "ninja", "samurai", "reaper"]
+DPS_RANGED = ["bard", "machinist", "dancer"]
+DPS_CASTER = ["black_mage", "summoner", "red_mage"]
+
+
+def main():
+    # Base layout (types in slots 0-3 are replaced per variant)
+    layout = [
+        ("tank", 180, 120),
+        ("healer", 330, 120),
+        ("dps", 180, 260),
+        ("dps", 330, 260),
+        ("circle_aoe", 256, 192),
+    ]
+
+    space = VariantSpace("Light Party", layout, {
+        0: TANKS,
+        1: HEALERS,
+        2: DPS_MELEE,
+        3: DPS_RANGED + DPS_CASTER,
+    })
+
+    # Optional argument: sample size instead of the full space
+    sample = int(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    out = "light_party_variants.txt"
+    count = space.write(out, sample=sample, rng_seed=0, mode='auto')
+    print(f"Wrote {count} of {space.total} compositions to {out}")
+
+    # Look up the first variant in the file
+    header, rows = read_variants(out)
+    index, code = next(rows)
+    names = load_space(header).names_for(index)
+    print(f"\nVariant #{index}: {', '.join(n.replace('_', ' ').title() for n in names)}")
+    print(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ A Python library for encoding and decoding FF14 Strategy Board codes.
 Features:
 - Decode strategy codes to binary data
 - Encode binary data to strategy codes
+- Validate strategy codes without decompressing
+- Transparent LRU caching of decode/encode results (ff14_strategy_cache)
+- Opt-in per-stage timing and counters (ff14_strategy_metrics)
 - Modify coordinates in existing strategies
 
 Key Discovery:
@@ -22,13 +25,22 @@ Usage:
     # Encode
     code = encode_strategy(binary_data)
 
+    # Encode, searching compression settings for the shortest code
+    code = encode_strategy(binary_data, optimize="size")
+
 Author: Reverse-engineered from FF14 game client
 """
 
 import base64
+import hashlib
+import math
 import struct
+import time
 import zlib
-from typing import Tuple, List, Dict, Optional
+from typing import Tuple, List, Dict, NamedTuple, Optional
+
+from .ff14_strategy_cache import LRUCache, register_cache
+from .ff14_strategy_metrics import SINKS, stage
 
 # Substitution table from game (address 0x1420cf4a0, 256 bytes)
 _SUBSTITUTION_TABLE = bytes([
@@ -89,6 +101,301 @@ def _substitute_decode(c: str) -> str:
     return c
 
 
+# =============================================================================
+# Lookup Tables
+# =============================================================================
+# The per-character helpers above are the reference definition of the cipher.
+# They are folded into 256-byte translate tables once at import so the codec
+# can work on whole strings with bytes.translate instead of per-char calls.
+
+_B64_ALPHABET = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+# Code char -> 6-bit value (DEC substitution + Base64 alphabet)
+_DEC_VALUE_TABLE = bytes(
+    _char_to_value(_substitute_decode(chr(o))) for o in range(256)
+)
+
+# 6-bit value -> code char (Base64 alphabet + ENC substitution)
+_ENC_CHAR_TABLE = bytes(
+    ord(_substitute_encode(_value_to_char(v))) for v in range(64)
+) + bytes(192)
+
+# Standard Base64 char <-> 6-bit value
+_B64_VALUE_TABLE = bytes(
+    _B64_ALPHABET.find(o) & 0x3f for o in range(256)
+)
+_B64_CHAR_TABLE = _B64_ALPHABET + bytes(192)
+
+# Index shift patterns, one 64-byte row per seed.
+# Row s holds (s + i) & 0x3f for encoding and -(s + i) & 0x3f for decoding;
+# the pattern repeats every 64 positions.
+_SHIFT_ROWS = tuple(
+    bytes((s + i) & 0x3f for i in range(64)) for s in range(64)
+)
+_UNSHIFT_ROWS = tuple(
+    bytes(-(s + i) & 0x3f for i in range(64)) for s in range(64)
+)
+
+
+def _shift_values(values: bytes, row: bytes) -> bytes:
+    """
+    Add a repeating shift row to a string of 6-bit values, modulo 64.
+
+    Each byte is at most 63 + 63, so adding the two strings as big integers
+    never carries into the neighbouring byte and one AND masks every lane.
+    """
+    n = len(values)
+    shift = (row * (n // 64 + 1))[:n]
+    total = int.from_bytes(values, 'big') + int.from_bytes(shift, 'big')
+    return (total & int.from_bytes(b'\x3f' * n, 'big')).to_bytes(n, 'big')
+
+
+# =============================================================================
+# Caches
+# =============================================================================
+# Bounded LRU caches (see ff14_strategy_cache). Decoded binaries and codes
+# are immutable, so cached values are shared as-is.
+
+_DECODE_CACHE = register_cache('decode', LRUCache(max_items=4096, max_bytes=32 << 20))
+_ENCODE_CACHE = register_cache('encode', LRUCache(max_items=4096, max_bytes=16 << 20))
+_COMPRESS_CACHE = register_cache('compress', LRUCache(
+    max_items=4096, max_bytes=16 << 20, sizeof=lambda entry: len(entry.stream)))
+
+
+def _binary_key(binary_data: bytes) -> bytes:
+    """Content hash used to key caches by binary."""
+    return hashlib.blake2b(binary_data, digest_size=16).digest()
+
+
+def _encode_key(binary_data: bytes, seed: int, optimize: str, time_budget: float = None) -> tuple:
+    """Encode cache key; size-optimized codes also depend on the search budget."""
+    if optimize is not None and time_budget is None:
+        time_budget = SIZE_SEARCH_BUDGET
+    return (_binary_key(binary_data), seed & 0x3f, optimize,
+            time_budget if optimize is not None else None)
+
+
+# =============================================================================
+# Shortest-Code Compression Search
+# =============================================================================
+# optimize="size" tries zlib levels, memLevel, window bits and strategies
+# and keeps the smallest stream. Every candidate's header is rewritten to
+# 78 9c: CINFO 7 (32K window) is valid for streams made with any smaller
+# window, FLEVEL is informational only, and 0x789c passes the FCHECK test.
+# Preset dictionaries are not tried since FDICT streams need the game to
+# supply the same dictionary.
+
+OPTIMIZE_SIZE = 'size'
+
+# Default wall-clock budget for one search, in seconds
+SIZE_SEARCH_BUDGET = 0.05
+
+_ZLIB_HEADER = b'\x78\x9c'
+
+_STRATEGIES = (
+    zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED, zlib.Z_RLE, zlib.Z_FIXED, zlib.Z_HUFFMAN_ONLY,
+)
+
+
+def _size_candidates():
+    """Yield (level, wbits, memLevel, strategy), likeliest winners first."""
+    seen = set()
+    plan = (
+        [(9, 15, 9, s) for s in _STRATEGIES]
+        + [(lvl, 15, mem, s) for lvl in range(9, 0, -1) for mem in (9, 8) for s in _STRATEGIES]
+        + [(lvl, 15, mem, s) for mem in range(7, 0, -1) for lvl in (9, 6, 4) for s in _STRATEGIES]
+        + [(9, wb, mem, s) for wb in range(14, 8, -1) for mem in (9, 8) for s in _STRATEGIES]
+    )
+    for params in plan:
+        if params not in seen:
+            seen.add(params)
+            yield params
+
+
+class _SizeSearch(NamedTuple):
+    """Cached size search result."""
+    stream: bytes
+    budget: float  # budget it was searched with; inf once every candidate was tried
+
+
+def _compress_smallest(binary_data: bytes, time_budget: float = None) -> bytes:
+    """
+    Smallest 78 9c zlib stream found within the time budget (cached).
+
+    A cached result is reused for any budget up to the one it was found
+    with; a larger budget searches again.
+    """
+    budget = SIZE_SEARCH_BUDGET if time_budget is None else time_budget
+    key = _binary_key(binary_data)
+    cached = _COMPRESS_CACHE.get(key)
+    if cached is not None and cached.budget >= budget:
+        return cached.stream
+
+    deadline = time.perf_counter() + budget
+    best = cached.stream if cached is not None else zlib.compress(binary_data, 6)
+    for level, wbits, mem_level, strategy in _size_candidates():
+        if time.perf_counter() > deadline:
+            break
+        c = zlib.compressobj(level, zlib.DEFLATED, wbits, mem_level, strategy)
+        out = c.compress(binary_data) + c.flush()
+        if len(out) < len(best):
+            best = _ZLIB_HEADER + out[2:]
+    else:
+        budget = math.inf  # search completed; no budget can do better
+
+    # Paranoia: the rewritten header must still inflate to the input
+    if zlib.decompress(best) != binary_data:
+        best = zlib.compress(binary_data, 6)
+
+    _COMPRESS_CACHE.put(key, _SizeSearch(best, budget))
+    return best
+
+
+# =============================================================================
+# Pipeline Stages
+# =============================================================================
+
+def _strip_wrapper(stgy_code: str) -> str:
+    """Remove wrapper - prefix is "stgy:a" (6 chars)."""
+    return stgy_code.replace('[stgy:a', '').rstrip(']')
+
+
+# Each stage is one small function shared by the plain and the instrumented
+# paths, so the two cannot drift apart.
+
+def _code_values(stgy_code: str) -> bytes:
+    """Strip the wrapper, apply DEC substitution and map to 6-bit values."""
+    # Non-Latin-1 chars become '?', which maps to 0 like any unknown char
+    return _strip_wrapper(stgy_code).encode('latin-1', 'replace').translate(_DEC_VALUE_TABLE)
+
+
+def _unshift(values: bytes) -> bytes:
+    """First value is the seed; the rest is (val - index - seed) & 0x3f. Returns Base64 text."""
+    return _shift_values(values[1:], _UNSHIFT_ROWS[values[0]]).translate(_B64_CHAR_TABLE)
+
+
+def _b64decode(b64: bytes) -> bytes:
+    return base64.b64decode(b64 + b'=' * (-len(b64) % 4))
+
+
+def _check_crc(raw: bytes):
+    crc_stored = struct.unpack('<I', raw[0:4])[0]
+    crc_calc = zlib.crc32(raw[4:]) & 0xffffffff
+    if crc_stored != crc_calc:
+        raise ValueError(f"CRC mismatch: stored=0x{crc_stored:08x}, calc=0x{crc_calc:08x}")
+
+
+def _compress(binary_data: bytes, optimize: str, time_budget: float) -> bytes:
+    if optimize is None:
+        # Level 6 matches game's 78 9c header
+        return zlib.compress(binary_data, 6)
+    if optimize == OPTIMIZE_SIZE:
+        return _compress_smallest(binary_data, time_budget)
+    raise ValueError(f"Unknown optimize mode {optimize!r}")
+
+
+def _frame(binary_data: bytes, compressed: bytes) -> bytes:
+    """[CRC32][length][compressed]"""
+    payload = struct.pack('<H', len(binary_data)) + compressed
+    return struct.pack('<I', zlib.crc32(payload) & 0xffffffff) + payload
+
+
+def _shift(b64: bytes, seed: int) -> bytes:
+    """(val + index + seed) & 0x3f over the Base64 values."""
+    return _shift_values(b64.translate(_B64_VALUE_TABLE), _SHIFT_ROWS[seed])
+
+
+def _wrap(obfuscated: bytes, seed: int) -> str:
+    """URL-safe alphabet + ENC substitution, seed char and wrapper."""
+    return f"[stgy:a{chr(_ENC_CHAR_TABLE[seed])}{obfuscated.translate(_ENC_CHAR_TABLE).decode('ascii')}]"
+
+
+def _deobfuscate(stgy_code: str) -> bytes:
+    """Undo wrapper, substitution and index shift; returns Base64 text."""
+    if SINKS:
+        return _deobfuscate_instrumented(stgy_code)
+    return _unshift(_code_values(stgy_code))
+
+
+def _unpack_payload(b64: bytes) -> bytes:
+    """Base64 decode, verify CRC32 and inflate."""
+    if SINKS:
+        return _unpack_payload_instrumented(b64)
+    raw = _b64decode(b64)
+    _check_crc(raw)
+    return zlib.decompress(raw[6:])
+
+
+def _pack_payload(binary_data: bytes, optimize: str = None,
+                  time_budget: float = None) -> bytes:
+    """Compress, prepend CRC32 + length and Base64 encode (unpadded)."""
+    if SINKS:
+        return _pack_payload_instrumented(binary_data, optimize, time_budget)
+    raw = _frame(binary_data, _compress(binary_data, optimize, time_budget))
+    return base64.b64encode(raw).rstrip(b'=')
+
+
+def _obfuscate(b64: bytes, seed: int) -> str:
+    """Apply index shift, substitution and wrapper to Base64 text."""
+    seed &= 0x3f
+    if SINKS:
+        return _obfuscate_instrumented(b64, seed)
+    return _wrap(_shift(b64, seed), seed)
+
+
+# =============================================================================
+# Instrumented Stages
+# =============================================================================
+# The stages above, each timed. Only used while a metrics sink is registered
+# (see ff14_strategy_metrics).
+
+def _deobfuscate_instrumented(stgy_code: str) -> bytes:
+    with stage('decode.substitution', len(stgy_code)) as s:
+        values = _code_values(stgy_code)
+        s.bytes_out = len(values)
+    with stage('decode.deobfuscation', len(values)) as s:
+        b64 = _unshift(values)
+        s.bytes_out = len(b64)
+    return b64
+
+
+def _unpack_payload_instrumented(b64: bytes) -> bytes:
+    with stage('decode.base64', len(b64)) as s:
+        raw = _b64decode(b64)
+        s.bytes_out = len(raw)
+    with stage('decode.crc', len(raw)) as s:
+        _check_crc(raw)
+        s.bytes_out = len(raw) - 6
+    with stage('decode.inflate', len(raw) - 6) as s:
+        binary_data = zlib.decompress(raw[6:])
+        s.bytes_out = len(binary_data)
+    return binary_data
+
+
+def _pack_payload_instrumented(binary_data: bytes, optimize: str = None,
+                               time_budget: float = None) -> bytes:
+    with stage('encode.deflate', len(binary_data)) as s:
+        compressed = _compress(binary_data, optimize, time_budget)
+        s.bytes_out = len(compressed)
+    with stage('encode.crc', len(compressed) + 2) as s:
+        raw = _frame(binary_data, compressed)
+        s.bytes_out = len(raw)
+    with stage('encode.base64', len(raw)) as s:
+        b64 = base64.b64encode(raw).rstrip(b'=')
+        s.bytes_out = len(b64)
+    return b64
+
+
+def _obfuscate_instrumented(b64: bytes, seed: int) -> str:
+    with stage('encode.obfuscation', len(b64)) as s:
+        obfuscated = _shift(b64, seed)
+        s.bytes_out = len(obfuscated)
+    with stage('encode.substitution', len(obfuscated)) as s:
+        code = _wrap(obfuscated, seed)
+        s.bytes_out = len(code)
+    return code
+
+
 def decode_strategy(stgy_code: str) -> bytes:
     """
     Decode FF14 strategy code to binary data.
@@ -102,80 +409,138 @@ def decode_strategy(stgy_code: str) -> bytes:
     Raises:
         ValueError: If CRC check fails or format is invalid
     """
-    # Remove wrapper - prefix is "stgy:a" (6 chars)
-    code = stgy_code.replace('[stgy:a', '').rstrip(']')
-
-    # Step 1: Apply DEC substitution
-    substituted = ''.join(_substitute_decode(c) for c in code)
-
-    # Step 2: Extract seed from first char
-    seed = _char_to_value(substituted[0])
-
-    # Step 3: Deobfuscate remaining chars
-    deobfuscated = []
-    for i, char in enumerate(substituted[1:]):
-        val = _char_to_value(char)
-        new_val = (val - i - seed) & 0x3f
-        deobfuscated.append(_value_to_char(new_val))
-    deob_str = ''.join(deobfuscated)
-
-    # Step 4: Base64 decode (URL-safe to standard)
-    b64 = deob_str.replace('-', '+').replace('_', '/')
-    while len(b64) % 4:
-        b64 += '='
-    raw = base64.b64decode(b64)
-
-    # Step 5: Parse and verify
-    crc_stored = struct.unpack('<I', raw[0:4])[0]
-    crc_calc = zlib.crc32(raw[4:]) & 0xffffffff
+    cached = _DECODE_CACHE.get(stgy_code)
+    if cached is not None:
+        return cached
 
-    if crc_stored != crc_calc:
-        raise ValueError(f"CRC mismatch: stored=0x{crc_stored:08x}, calc=0x{crc_calc:08x}")
+    # Steps 1-3: Substitution, seed extraction, deobfuscation
+    b64 = _deobfuscate(stgy_code)
 
-    # Step 6: Decompress
-    return zlib.decompress(raw[6:])
+    # Steps 4-6: Base64 decode, CRC check, decompress
+    binary_data = _unpack_payload(b64)
+    _DECODE_CACHE.put(stgy_code, binary_data)
+    return binary_data
 
 
-def encode_strategy(binary_data: bytes, seed: int = 10) -> str:
+def encode_strategy(binary_data: bytes, seed: int = 10, optimize: str = None,
+                    time_budget: float = None) -> str:
     """
     Encode binary data to FF14 strategy code.
 
     Args:
         binary_data: Binary data to encode
         seed: Obfuscation seed (0-63), default 10
+        optimize: None for the game's default compression (zlib level 6),
+            or "size" to search compression settings for the shortest code
+        time_budget: Search budget in seconds for optimize="size"
+            (default SIZE_SEARCH_BUDGET); results are cached per binary
 
     Returns:
         Strategy code in format "[stgy:aXXXX...]"
     """
-    # Step 1: Compress (Level 6 matches game's 78 9c header)
-    compressed = zlib.compress(binary_data, 6)
+    key = None
+    if _ENCODE_CACHE.enabled:
+        key = _encode_key(binary_data, seed, optimize, time_budget)
+        cached = _ENCODE_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    # Steps 1-3: Compress, CRC32 + length, Base64 encode
+    b64 = _pack_payload(binary_data, optimize, time_budget)
+
+    # Steps 4-6: Obfuscate, ENC substitution, seed char + wrapper
+    code = _obfuscate(b64, seed)
+    if key is not None:
+        _ENCODE_CACHE.put(key, code)
+    return code
+
+
+# =============================================================================
+# Validation
+# =============================================================================
+
+STATUS_OK = 'ok'
+STATUS_BAD_PREFIX = 'bad_prefix'
+STATUS_BAD_LENGTH = 'bad_length'
+STATUS_BAD_ALPHABET = 'bad_alphabet'
+STATUS_BAD_BASE64 = 'bad_base64'
+STATUS_CRC_MISMATCH = 'crc_mismatch'
+STATUS_BAD_HEADER = 'bad_header'
+
+_CODE_PREFIX = '[stgy:a'
+
+# Every char an encoder can emit (seed char included)
+_CODE_ALPHABET = _ENC_CHAR_TABLE[:64]
+
+# [CRC32][length][zlib header][Adler-32] -> at least 16 Base64 chars
+_MIN_PAYLOAD_CHARS = 16
+
+# Fixed header size of a decoded binary
+_MIN_BINARY_SIZE = 28
+
+
+class ValidationResult(NamedTuple):
+    """Outcome of validate_strategy."""
+    status: str
+    detail: str = ''
+    length: Optional[int] = None  # declared uncompressed length
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+
+def validate_strategy(stgy_code: str) -> ValidationResult:
+    """
+    Check a strategy code without decompressing it.
+
+    Runs de-substitution, deobfuscation and Base64, then verifies the CRC32,
+    the declared uncompressed length (bytes 4-6) and the zlib stream header.
+    Wrapper, length and alphabet problems are rejected before any Base64
+    work. Unlike decode_strategy, the "[stgy:a...]" wrapper is required.
+
+    Args:
+        stgy_code: Strategy code in format "[stgy:aXXXX...]"
+
+    Returns:
+        ValidationResult with one of the STATUS_* values
+    """
+    if not (stgy_code.startswith(_CODE_PREFIX) and stgy_code.endswith(']')):
+        return ValidationResult(STATUS_BAD_PREFIX, "expected [stgy:a...] wrapper")
+
+    body = stgy_code[len(_CODE_PREFIX):-1]
+    n = len(body) - 1
+    if n < _MIN_PAYLOAD_CHARS or n % 4 == 1:
+        return ValidationResult(STATUS_BAD_LENGTH, f"{n} payload chars")
 
-    # Step 2: Build raw: [CRC32][length][compressed]
-    length = len(binary_data)
-    payload = struct.pack('<H', length) + compressed
-    crc = zlib.crc32(payload) & 0xffffffff
-    raw = struct.pack('<I', crc) + payload
+    if not body.isascii() or body.encode('ascii').translate(None, _CODE_ALPHABET):
+        return ValidationResult(STATUS_BAD_ALPHABET, "unexpected characters")
 
-    # Step 3: Base64 encode (standard to URL-safe)
-    b64 = base64.b64encode(raw).decode().rstrip('=')
-    b64 = b64.replace('+', '-').replace('/', '_')
+    b64 = _deobfuscate(stgy_code)
+    try:
+        raw = base64.b64decode(b64 + b'=' * (-len(b64) % 4))
+    except ValueError as e:
+        return ValidationResult(STATUS_BAD_BASE64, str(e))
 
-    # Step 4: Obfuscate: (val + index + seed) & 0x3f
-    obfuscated = []
-    for i, c in enumerate(b64):
-        val = _char_to_value(c)
-        new_val = (val + i + seed) & 0x3f
-        obfuscated.append(_value_to_char(new_val))
-    obf_str = ''.join(obfuscated)
+    crc_stored = struct.unpack_from('<I', raw, 0)[0]
+    crc_calc = zlib.crc32(raw[4:]) & 0xffffffff
+    if crc_stored != crc_calc:
+        return ValidationResult(
+            STATUS_CRC_MISMATCH,
+            f"stored=0x{crc_stored:08x}, calc=0x{crc_calc:08x}",
+        )
 
-    # Step 5: Apply ENC substitution
-    substituted = ''.join(_substitute_encode(c) for c in obf_str)
+    length = struct.unpack_from('<H', raw, 4)[0]
+    if length < _MIN_BINARY_SIZE:
+        return ValidationResult(STATUS_BAD_HEADER, f"length {length} too small", length)
 
-    # Step 6: Add seed char (with ENC substitution)
-    seed_char = _value_to_char(seed)
-    seed_sub = _substitute_encode(seed_char)
+    cmf, flg = raw[6], raw[7]
+    if cmf & 0x0f != 8 or (cmf << 8 | flg) % 31 or flg & 0x20:
+        return ValidationResult(
+            STATUS_BAD_HEADER, f"bad zlib header {cmf:02x} {flg:02x}", length
+        )
 
-    return f"[stgy:a{seed_sub}{substituted}]"
+    return ValidationResult(STATUS_OK, length=length)
 
 
 def modify_coordinates(stgy_code: str, coord_index: int, x: float, y: float) -> str:
@@ -238,5 +603,19 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"  Error: {e}")
 
+    # Test size optimization
+    print(f"\nTest optimize='size':")
+    try:
+        small = encode_strategy(data, optimize=OPTIMIZE_SIZE)
+        print(f"  Length: {len(re_encoded)} -> {len(small)} chars")
+        print(f"  Round-trip: {'SUCCESS' if decode_strategy(small) == data else 'FAILED'}")
+    except Exception as e:
+        print(f"  Error: {e}")
+
+    # Test validate
+    print(f"\nTest validate:")
+    print(f"  Valid:   {validate_strategy(test_code)}")
+    print(f"  Garbage: {validate_strategy('[stgy:ahello world]')}")
+
     print("\n" + "=" * 60)
     print("Library ready for use!")
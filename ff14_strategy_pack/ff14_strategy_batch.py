@@ -0,0 +1,259 @@
+"""
+FF14 Strategy Batch Codec
+
+Bulk variants of decode_strategy/encode_strategy for re-verifying large
+archives of codes.
+
+Results are streamed back in input order as BatchResult tuples. A failing
+item (CRC mismatch, malformed code, ...) produces a result with `error`
+set instead of aborting the whole batch.
+
+Execution modes:
+- "serial":  run in the calling thread
+- "thread":  ThreadPoolExecutor (zlib releases the GIL on large payloads)
+- "process": ProcessPoolExecutor
+- "auto":    serial for a single chunk, threads for large payloads,
+             processes otherwise
+
+Each chunk runs its obfuscation layer through ff14_strategy_numpy, so the
+text work is vectorized whenever NumPy is installed. Serial and thread
+modes share the decode/encode caches with decode_strategy/encode_strategy
+(process workers each have their own).
+
+Dependencies: ff14_strategy.py, ff14_strategy_numpy.py
+"""
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from .ff14_strategy import (
+    _DECODE_CACHE, _ENCODE_CACHE, _encode_key,
+    _deobfuscate, _pack_payload, _unpack_payload, validate_strategy,
+)
+from .ff14_strategy_numpy import deobfuscate_rows, obfuscate_rows
+
+MODES = ('auto', 'serial', 'thread', 'process')
+
+DEFAULT_CHUNK_SIZE = 256
+
+# Average item size (chars or bytes) above which "auto" prefers threads
+THREAD_PAYLOAD_THRESHOLD = 16 * 1024
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one item in a batch."""
+    index: int
+    value: Optional[object] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# ============================================================================
+# Chunk Workers (module level so they pickle for process pools)
+# ============================================================================
+
+def _decode_chunk(start: int, codes: list) -> list:
+    results = []
+    pending = []
+    others = []  # non-str items: decoded one by one so they fail on their own
+    for i, code in enumerate(codes, start):
+        if not isinstance(code, str):
+            others.append((i, code))
+            continue
+        cached = _DECODE_CACHE.get(code)
+        if cached is not None:
+            results.append(BatchResult(i, cached))
+        else:
+            pending.append((i, code))
+
+    try:
+        texts = deobfuscate_rows([code for _, code in pending])
+    except Exception:
+        texts = [None] * len(pending)  # per-item _deobfuscate reports each error
+    for (i, code), b64 in zip(pending + others, texts + [None] * len(others)):
+        try:
+            if b64 is None:
+                b64 = _deobfuscate(code)  # raises the same error as decode_strategy
+            data = _unpack_payload(b64)
+            _DECODE_CACHE.put(code, data)
+            results.append(BatchResult(i, data))
+        except Exception as e:
+            results.append(BatchResult(i, error=e))
+    if len(pending) != len(codes):
+        results.sort(key=lambda r: r.index)
+    return results
+
+
+def _validate_chunk(start: int, codes: list) -> list:
+    results = []
+    for i, code in enumerate(codes, start):
+        try:
+            results.append(BatchResult(i, validate_strategy(code)))
+        except Exception as e:
+            results.append(BatchResult(i, error=e))
+    return results
+
+
+def _encode_chunk(start: int, binaries: list, seed: int, optimize: str) -> list:
+    results = []
+    packed = []
+    for i, data in enumerate(binaries, start):
+        try:
+            key = _encode_key(data, seed, optimize) if _ENCODE_CACHE.enabled else None
+            cached = _ENCODE_CACHE.get(key) if key else None
+            if cached is not None:
+                results.append(BatchResult(i, cached))
+            else:
+                packed.append((i, key, _pack_payload(data, optimize)))
+        except Exception as e:
+            results.append(BatchResult(i, error=e))
+
+    codes = obfuscate_rows([b64 for _, _, b64 in packed], seed)
+    for (i, key, _), code in zip(packed, codes):
+        if key is not None:
+            _ENCODE_CACHE.put(key, code)
+        results.append(BatchResult(i, code))
+    results.sort(key=lambda r: r.index)
+    return results
+
+
+# ============================================================================
+# Scheduling
+# ============================================================================
+
+def _chunks(items: Iterable, chunk_size: int) -> Iterator[tuple]:
+    """Split an iterable into (start_index, list) chunks."""
+    it = iter(items)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(it, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _choose_mode(first: list, more: bool) -> str:
+    """Pick an execution mode from the first chunk."""
+    if not more:
+        return 'serial'
+    # Bad items (None, ...) are reported by the workers, not measured here
+    sizes = [len(x) for x in first if isinstance(x, (str, bytes, bytearray))]
+    if not sizes:
+        return 'process'
+    avg = sum(sizes) / len(sizes)
+    return 'thread' if avg >= THREAD_PAYLOAD_THRESHOLD else 'process'
+
+
+def _check_options(mode: str, chunk_size: int):
+    # Called before the lazy _run generator so bad options raise right away
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+
+def _run(worker, items: Iterable, extra: tuple, mode: str,
+         workers: Optional[int], chunk_size: int) -> Iterator[BatchResult]:
+    chunks = _chunks(items, chunk_size)
+
+    if mode == 'auto':
+        first = next(chunks, None)
+        if first is None:
+            return
+        second = next(chunks, None)
+        mode = _choose_mode(first[1], second is not None)
+        chunks = itertools.chain([first], [second] if second else [], chunks)
+
+    if mode == 'serial':
+        for start, chunk in chunks:
+            yield from worker(start, chunk, *extra)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    executor_cls = ThreadPoolExecutor if mode == 'thread' else ProcessPoolExecutor
+
+    # Keep a bounded number of chunks in flight so arbitrarily long inputs
+    # stream through with constant memory, and yield strictly in order.
+    with executor_cls(max_workers=workers) as executor:
+        pending = deque()
+        for start, chunk in chunks:
+            pending.append(executor.submit(worker, start, chunk, *extra))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+def decode_many(
+    codes: Iterable[str],
+    mode: str = 'auto',
+    workers: int = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    verify_only: bool = False,
+) -> Iterator[BatchResult]:
+    """
+    Decode many strategy codes.
+
+    Args:
+        codes: Any iterable of strategy code strings
+        mode: "auto", "serial", "thread" or "process"
+        workers: Pool size (default: CPU count)
+        chunk_size: Items per work unit
+        verify_only: Run validate_strategy instead of a full decode;
+            each value is then a ValidationResult
+
+    Yields:
+        BatchResult(index, binary, error) in input order
+    """
+    _check_options(mode, chunk_size)
+    worker = _validate_chunk if verify_only else _decode_chunk
+    return _run(worker, codes, (), mode, workers, chunk_size)
+
+
+def encode_many(
+    binaries: Iterable[bytes],
+    seed: int = 10,
+    mode: str = 'auto',
+    workers: int = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    optimize: str = None,
+) -> Iterator[BatchResult]:
+    """
+    Encode many strategy binaries.
+
+    Args:
+        binaries: Any iterable of binary strategy data
+        seed: Obfuscation seed (0-63) used for every item
+        mode: "auto", "serial", "thread" or "process"
+        workers: Pool size (default: CPU count)
+        chunk_size: Items per work unit
+        optimize: Compression mode passed to encode_strategy
+            (None or "size")
+
+    Yields:
+        BatchResult(index, code, error) in input order
+    """
+    _check_options(mode, chunk_size)
+    return _run(_encode_chunk, binaries, (seed, optimize), mode, workers, chunk_size)
+
+
+if __name__ == "__main__":
+    sample = "[stgy:abj1sYMCIBpzt8a0+C2ZlTHNWHr9pIj-JN7FoA+dCxfY8slZSfYai+NOwGI-4TVfab6BGd5f2u0KXaJzxu2aRlkchdGOUXKXLJX9EuglvoAEvIJEg8wXllhfBMbsPsNkICncRiAnDU]"
+    codes = [sample] * 1000 + ["[stgy:abroken]"]
+
+    bad = 0
+    for result in decode_many(codes, mode='process', chunk_size=100):
+        if not result.ok:
+            bad += 1
+            print(f"#{result.index}: {result.error}")
+    print(f"Decoded {len(codes) - bad}/{len(codes)} codes")
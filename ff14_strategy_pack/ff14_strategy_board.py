@@ -0,0 +1,385 @@
+"""
+FF14 Strategy Board Parser
+
+Parses a decoded strategy binary in a single pass and builds an offset
+index over its blocks, so edits and analysis never have to rediscover
+blocks with signature scans.
+
+Layout (see docs/BINARY_STRUCTURE.md):
+    [HEADER 28 bytes][TITLE][TYPE * N (+ text blocks)]
+    [LAYER][COORD][ANGLE][SIZE][TRANS][PARAM_A][PARAM_B][PARAM_C][FOOTER]
+
+Each block after the TYPE section starts with a 6-byte header
+[BlockID 00][SubType 00][Count uint16].
+
+Usage:
+    from ff14_strategy_board import StrategyBoard
+
+    board = StrategyBoard.from_code("[stgy:aXXXX...]")
+    board.set_coord(0, 256, 192)
+    code = board.encode()
+
+Dependencies: ff14_strategy.py (decode_strategy, encode_strategy), ff14_strategy_metrics.py
+"""
+import struct
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .ff14_strategy import decode_strategy, encode_strategy
+from .ff14_strategy_metrics import SINKS, stage
+from .ff14_strategy_cache import LRUCache, register_cache
+
+# ============================================================================
+# Block IDs
+# ============================================================================
+
+BLOCK_TYPE = 0x02
+BLOCK_FOOTER = 0x03
+BLOCK_TEXT = 0x03  # follows a Text (0x64) TYPE entry
+BLOCK_LAYER = 0x04
+BLOCK_COORD = 0x05
+BLOCK_ANGLE = 0x06
+BLOCK_SIZE = 0x07
+BLOCK_TRANS = 0x08
+BLOCK_UNKNOWN_09 = 0x09
+BLOCK_PARAM_A = 0x0A
+BLOCK_PARAM_B = 0x0B
+BLOCK_PARAM_C = 0x0C
+
+# Block ID -> (name, bytes per object)
+BLOCK_LAYOUT = {
+    BLOCK_LAYER: ('LAYER', 2),
+    BLOCK_COORD: ('COORD', 4),
+    BLOCK_ANGLE: ('ANGLE', 2),
+    BLOCK_SIZE: ('SIZE', 1),
+    BLOCK_TRANS: ('TRANS', 4),
+    BLOCK_UNKNOWN_09: ('UNKNOWN_09', 2),  # observed in some codes
+    BLOCK_PARAM_A: ('PARAM_A', 2),
+    BLOCK_PARAM_B: ('PARAM_B', 2),
+    BLOCK_PARAM_C: ('PARAM_C', 2),
+}
+
+# Block ID -> memoryview format of one column element
+VIEW_FORMATS = {
+    BLOCK_LAYER: 'H',
+    BLOCK_COORD: 'h',   # flat x0, y0, x1, y1, ...
+    BLOCK_ANGLE: 'h',
+    BLOCK_SIZE: 'B',
+    BLOCK_TRANS: 'B',   # flat r0, g0, b0, a0, r1, ...
+    BLOCK_UNKNOWN_09: 'H',
+    BLOCK_PARAM_A: 'H',
+    BLOCK_PARAM_B: 'H',
+    BLOCK_PARAM_C: 'H',
+}
+
+# memoryview.cast uses native byte order; the format is little-endian
+NATIVE_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+HEADER_SIZE = 28
+FOOTER_SIZE = 8
+TEXT_TYPE_ID = 0x64
+
+# Parsed block indexes keyed by the (immutable) binary they describe, so
+# re-parsing a cached decode_strategy() result is a dictionary lookup.
+_BOARD_CACHE = register_cache('board', LRUCache(max_items=4096, max_bytes=32 << 20,
+                                                sizeof=lambda index: index[0]))
+
+
+class Block(NamedTuple):
+    """Location of one content block."""
+    block_id: int
+    subtype: int
+    count: int
+    offset: int   # start of data (after the 6-byte header)
+    length: int   # data bytes, including alignment padding
+
+    @property
+    def name(self) -> str:
+        return BLOCK_LAYOUT[self.block_id][0]
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+
+# ============================================================================
+# Parsed Board
+# ============================================================================
+
+class StrategyBoard:
+    """
+    Decoded strategy binary plus a block offset index.
+
+    The binary is held as a bytearray; setters patch it in place and
+    to_bytes()/encode() return the edited board.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = bytearray(data)
+        self.title = ''
+        self.title_len = 0
+        self.type_ids: List[int] = []
+        self.type_offsets: List[int] = []
+        self.texts: Dict[int, str] = {}
+        self.blocks: Dict[int, Block] = {}
+        self.footer = -1
+        if isinstance(data, bytes) and _BOARD_CACHE.enabled:
+            self._parse_cached(data)
+        else:
+            self._parse()
+
+    @classmethod
+    def from_code(cls, code: str) -> 'StrategyBoard':
+        """Decode and parse a strategy code."""
+        return cls(decode_strategy(code))
+
+    # ------------------------------------------------------------------
+    # Parsing
+    # ------------------------------------------------------------------
+
+    def _parse_cached(self, key: bytes):
+        index = _BOARD_CACHE.get(key)
+        if index is None:
+            self._parse()
+            _BOARD_CACHE.put(key, (len(key), self.title, self.title_len, tuple(self.type_ids),
+                                   tuple(self.type_offsets), dict(self.texts),
+                                   dict(self.blocks), self.footer))
+            return
+        (_, self.title, self.title_len, type_ids, type_offsets,
+         texts, blocks, self.footer) = index
+        self.type_ids = list(type_ids)
+        self.type_offsets = list(type_offsets)
+        self.texts = dict(texts)
+        self.blocks = dict(blocks)
+
+    def _parse(self):
+        if SINKS:
+            with stage('parse', len(self.data)) as s:
+                self._parse_blocks()
+                s.bytes_out = len(self.data)
+        else:
+            self._parse_blocks()
+
+    def _parse_blocks(self):
+        data = self.data
+        size = len(data)
+        if size < HEADER_SIZE:
+            raise ValueError(f"Binary too short for header: {size} bytes")
+
+        # Title (offset 26 = length, 28 = start)
+        self.title_len = struct.unpack_from('<H', data, 26)[0]
+        pos = HEADER_SIZE + self.title_len
+        if pos > size:
+            raise ValueError(f"Title length {self.title_len} exceeds binary size")
+        self.title = bytes(data[HEADER_SIZE:pos]).split(b'\x00', 1)[0].decode('utf-8', errors='ignore')
+
+        # TYPE entries: 02 00 [TypeID uint16], each optionally followed by
+        # a text block 03 00 [Len uint16] [UTF-8, null-padded to Len]
+        while pos + 4 <= size and data[pos] == BLOCK_TYPE:
+            type_id = struct.unpack_from('<H', data, pos + 2)[0]
+            self.type_offsets.append(pos)
+            self.type_ids.append(type_id)
+            pos += 4
+            if type_id == TEXT_TYPE_ID and pos + 4 <= size and data[pos] == BLOCK_TEXT:
+                text_len = struct.unpack_from('<H', data, pos + 2)[0]
+                raw = bytes(data[pos + 4:pos + 4 + text_len])
+                self.texts[len(self.type_ids) - 1] = raw.split(b'\x00', 1)[0].decode('utf-8', errors='ignore')
+                pos += 4 + text_len
+
+        # Remaining blocks: [BlockID 00][SubType 00][Count uint16][data]
+        while pos + 6 <= size:
+            block_id = data[pos]
+            if block_id == BLOCK_FOOTER:
+                self.footer = pos
+                break
+            if block_id not in BLOCK_LAYOUT:
+                raise ValueError(f"Unknown block 0x{block_id:02x} at offset {pos}")
+
+            subtype = data[pos + 2]
+            count = struct.unpack_from('<H', data, pos + 4)[0]
+            length = count * BLOCK_LAYOUT[block_id][1]
+            length += length & 1  # SIZE block is padded to even length
+            if pos + 6 + length > size:
+                raise ValueError(f"Block 0x{block_id:02x} at offset {pos} overruns binary")
+
+            self.blocks[block_id] = Block(block_id, subtype, count, pos + 6, length)
+            pos += 6 + length
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    @property
+    def count(self) -> int:
+        """Number of objects (TYPE entries)."""
+        return len(self.type_ids)
+
+    def offset(self, block_id: int) -> int:
+        """Data offset of a block, or -1 if absent."""
+        block = self.blocks.get(block_id)
+        return block.offset if block else -1
+
+    def _block(self, block_id: int) -> Block:
+        block = self.blocks.get(block_id)
+        if block is None:
+            raise ValueError(f"{BLOCK_LAYOUT[block_id][0]} block not found")
+        return block
+
+    def _check_index(self, index: int):
+        if not 0 <= index < self.count:
+            raise IndexError(f"Object index {index} out of range (0-{self.count - 1})")
+
+    # ------------------------------------------------------------------
+    # Columns
+    # ------------------------------------------------------------------
+
+    def _column(self, block_id: int, fmt: str) -> list:
+        block = self._block(block_id)
+        raw = self.data[block.offset:block.offset + block.count * struct.calcsize(fmt)]
+        return [v for v, in struct.iter_unpack(fmt, raw)]
+
+    def coords(self) -> List[Tuple[float, float]]:
+        """(x, y) per object in game units."""
+        block = self._block(BLOCK_COORD)
+        raw = self.data[block.offset:block.offset + block.count * 4]
+        return [(x / 10.0, y / 10.0) for x, y in struct.iter_unpack('<hh', raw)]
+
+    def layers(self) -> List[int]:
+        return self._column(BLOCK_LAYER, '<H')
+
+    def angles(self) -> List[int]:
+        """Rotation per object in degrees."""
+        return self._column(BLOCK_ANGLE, '<h')
+
+    def sizes(self) -> List[int]:
+        """Size per object (0-255, default 100)."""
+        block = self._block(BLOCK_SIZE)
+        return list(self.data[block.offset:block.offset + block.count])
+
+    def colors(self) -> List[Tuple[int, int, int]]:
+        """(R, G, B) per object."""
+        block = self._block(BLOCK_TRANS)
+        raw = self.data[block.offset:block.offset + block.count * 4]
+        return [(r, g, b) for r, g, b, _ in struct.iter_unpack('BBBB', raw)]
+
+    def alphas(self) -> List[int]:
+        """Transparency per object (0 = opaque)."""
+        block = self._block(BLOCK_TRANS)
+        return list(self.data[block.offset + 3:block.offset + block.count * 4:4])
+
+    def params(self, block_id: int) -> List[int]:
+        """Values of PARAM_A, PARAM_B or PARAM_C."""
+        return self._column(block_id, '<H')
+
+    # ------------------------------------------------------------------
+    # Zero-copy views
+    # ------------------------------------------------------------------
+    # Views share memory with self.data: writes through them patch the
+    # board in place. The bytearray cannot be resized while a view is
+    # alive, so release views before replacing self.data.
+
+    def column(self, block_id: int) -> memoryview:
+        """Flat typed view over a block's data (padding excluded)."""
+        if not NATIVE_LITTLE_ENDIAN:
+            raise NotImplementedError("Column views require a little-endian host")
+        block = self._block(block_id)
+        fmt = VIEW_FORMATS[block_id]
+        end = block.offset + block.count * BLOCK_LAYOUT[block_id][1]
+        return memoryview(self.data)[block.offset:end].cast(fmt)
+
+    def coord_view(self) -> memoryview:
+        """int16 view over COORD: x of object i at [2*i], y at [2*i + 1] (x10)."""
+        return self.column(BLOCK_COORD)
+
+    def angle_view(self) -> memoryview:
+        """int16 view over ANGLE."""
+        return self.column(BLOCK_ANGLE)
+
+    def size_view(self) -> memoryview:
+        """uint8 view over SIZE."""
+        return self.column(BLOCK_SIZE)
+
+    def rgba_view(self) -> memoryview:
+        """uint8 view over TRANS shaped (count, 4): view[i, 3] is alpha."""
+        block = self._block(BLOCK_TRANS)
+        return self.column(BLOCK_TRANS).cast('B', shape=[block.count, 4])
+
+    def param_view(self, block_id: int) -> memoryview:
+        """uint16 view over PARAM_A, PARAM_B or PARAM_C."""
+        return self.column(block_id)
+
+    # ------------------------------------------------------------------
+    # Setters (patch in place)
+    # ------------------------------------------------------------------
+
+    def set_type(self, index: int, type_id: int):
+        self._check_index(index)
+        if index in self.texts and type_id != TEXT_TYPE_ID:
+            raise ValueError(f"Object {index} carries a text block and must stay Text")
+        struct.pack_into('<H', self.data, self.type_offsets[index] + 2, type_id)
+        self.type_ids[index] = type_id
+
+    def set_coord(self, index: int, x: float, y: float):
+        """Set position in game units (stored as int16 * 10)."""
+        self._check_index(index)
+        struct.pack_into('<hh', self.data, self._block(BLOCK_COORD).offset + index * 4,
+                         int(x * 10), int(y * 10))
+
+    def set_angle(self, index: int, angle: int):
+        self._check_index(index)
+        struct.pack_into('<H', self.data, self._block(BLOCK_ANGLE).offset + index * 2, angle & 0xffff)
+
+    def set_size(self, index: int, size: int):
+        self._check_index(index)
+        self.data[self._block(BLOCK_SIZE).offset + index] = size
+
+    def set_color(self, index: int, color: Tuple[int, int, int]):
+        self._check_index(index)
+        off = self._block(BLOCK_TRANS).offset + index * 4
+        self.data[off:off + 3] = bytes(color[:3])
+
+    def set_alpha(self, index: int, alpha: int):
+        self._check_index(index)
+        self.data[self._block(BLOCK_TRANS).offset + index * 4 + 3] = alpha
+
+    def set_param(self, block_id: int, index: int, value: int):
+        self._check_index(index)
+        struct.pack_into('<H', self.data, self._block(block_id).offset + index * 2, value)
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.data)
+
+    def encode(self, seed: int = 10) -> str:
+        return encode_strategy(bytes(self.data), seed)
+
+    def __repr__(self) -> str:
+        return f"StrategyBoard(title={self.title!r}, count={self.count}, size={len(self.data)})"
+
+
+def parse_board(data: bytes) -> StrategyBoard:
+    """Parse a decoded strategy binary."""
+    return StrategyBoard(data)
+
+
+def try_parse_board(data: bytes) -> Optional[StrategyBoard]:
+    """Parse a decoded strategy binary, or return None if it is malformed."""
+    try:
+        return StrategyBoard(data)
+    except (ValueError, struct.error):
+        return None
+
+
+if __name__ == "__main__":
+    sample = "[stgy:abj1sYMCIBpzt8a0+C2ZlTHNWHr9pIj-JN7FoA+dCxfY8slZSfYai+NOwGI-4TVfab6BGd5f2u0KXaJzxu2aRlkchdGOUXKXLJX9EuglvoAEvIJEg8wXllhfBMbsPsNkICncRiAnDU]"
+    board = StrategyBoard.from_code(sample)
+    print(board)
+    for block in board.blocks.values():
+        print(f"  {block.name:<10} offset={block.offset:4d} count={block.count} length={block.length}")
+    print(f"  FOOTER     offset={board.footer:4d}")
+    print(f"Types:  {[hex(t) for t in board.type_ids]}")
+    print(f"Coords: {board.coords()}")
+    print(f"Sizes:  {board.sizes()}")
@@ -0,0 +1,166 @@
+"""
+FF14 Strategy Caches
+
+Bounded, thread-safe LRU caches used transparently by the codec and the
+board parser:
+
+- "decode":   code string -> decoded binary        (decode_strategy)
+- "encode":   hash(binary), seed, mode -> code     (encode_strategy)
+- "compress": hash(binary) -> smallest zlib stream (optimize="size")
+- "board":    binary -> parsed block index         (StrategyBoard)
+
+Popular codes pasted over and over skip the whole pipeline after the
+first time. Caches evict least-recently-used entries once either their
+item limit or their byte limit is reached, and count hits, misses and
+evictions. A cache with max_items=0 is disabled.
+
+Usage:
+    from ff14_strategy_cache import cache_stats, configure_cache
+
+    configure_cache('decode', max_items=100_000, max_bytes=256 << 20)
+    print(cache_stats()['decode'])
+
+Dependencies: None
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    items: int
+    bytes: int
+    max_items: int
+    max_bytes: Optional[int]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with item and byte limits.
+
+    Args:
+        max_items: Maximum number of entries (0 disables the cache)
+        max_bytes: Optional limit on the summed sizeof() of values
+        sizeof: Size function for values (default len)
+    """
+
+    def __init__(self, max_items: int = 1024, max_bytes: int = None,
+                 sizeof: Callable = len):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data: 'OrderedDict' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 0
+
+    def get(self, key, default=None):
+        if not self.max_items:
+            return default
+        with self._lock:
+            try:
+                value = self._data[key][0]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if not self.max_items:
+            return
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._data and (
+            len(self._data) > self.max_items
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._data.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def resize(self, max_items: int = None, max_bytes: int = None):
+        """Change limits (evicting as needed). max_bytes=-1 removes the byte limit."""
+        with self._lock:
+            if max_items is not None:
+                self.max_items = max_items
+            if max_bytes is not None:
+                self.max_bytes = None if max_bytes < 0 else max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions,
+                              len(self._data), self._bytes, self.max_items, self.max_bytes)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+_CACHES: Dict[str, LRUCache] = {}
+
+
+def register_cache(name: str, cache: LRUCache) -> LRUCache:
+    """Register a cache under a name for stats/configuration."""
+    _CACHES[name] = cache
+    return cache
+
+
+def get_cache(name: str) -> LRUCache:
+    if name not in _CACHES:
+        raise KeyError(f"Unknown cache {name!r}, expected one of {sorted(_CACHES)}")
+    return _CACHES[name]
+
+
+def configure_cache(name: str, max_items: int = None, max_bytes: int = None):
+    """Resize a named cache; max_items=0 disables it."""
+    get_cache(name).resize(max_items, max_bytes)
+
+
+def cache_stats() -> Dict[str, CacheStats]:
+    """Hit/miss statistics for every registered cache."""
+    return {name: cache.stats() for name, cache in _CACHES.items()}
+
+
+def clear_caches():
+    """Empty every registered cache and reset its counters."""
+    for cache in _CACHES.values():
+        cache.clear()
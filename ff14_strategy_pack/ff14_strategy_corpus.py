@@ -0,0 +1,318 @@
+"""
+FF14 Strategy Corpus Store
+
+SQLite archive of every strategy seen. Codes are ingested in bulk
+transactions and deduplicated on a hash of the decompressed binary, so the
+same board encoded with different seeds is stored once (each distinct code
+is still remembered and maps to its board).
+
+Per-board metadata is kept in indexed columns so corpus queries never have
+to decode codes:
+
+- title, object count, player count (job/role icons)
+- bounding box of object positions
+- type histogram (one row per board and type ID)
+
+Usage:
+    from ff14_strategy_corpus import StrategyCorpus
+
+    with StrategyCorpus('corpus.db') as corpus:
+        corpus.add_file('chat.log')
+        # Boards with a Tower and a Donut AOE and at least 8 players
+        for rec in corpus.query(contains={0x6F: 1, 'donut_aoe': 1}, min_players=8):
+            print(rec.title, rec.code)
+
+Dependencies: ff14_strategy_batch.py, ff14_strategy_board.py,
+              ff14_strategy_scan.py, ff14_strategy_types.py (type names)
+"""
+import hashlib
+import itertools
+import sqlite3
+from collections import Counter, deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .ff14_strategy_batch import DEFAULT_CHUNK_SIZE, decode_many
+from .ff14_strategy_board import BLOCK_COORD, try_parse_board
+from .ff14_strategy_scan import scan_codes
+from .ff14_strategy_types import FLAG_PLAYER, ids_where, type_id
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Job, class and generic role icons (see docs/OBJECT_TYPES.md sections 1-3)
+PLAYER_TYPE_IDS = frozenset(ids_where(flags=FLAG_PLAYER))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    id           INTEGER PRIMARY KEY,
+    digest       BLOB NOT NULL UNIQUE,
+    code         TEXT NOT NULL,
+    title        TEXT NOT NULL,
+    size         INTEGER NOT NULL,
+    object_count INTEGER NOT NULL,
+    player_count INTEGER NOT NULL,
+    min_x REAL, min_y REAL, max_x REAL, max_y REAL
+);
+CREATE INDEX IF NOT EXISTS boards_title ON boards(title);
+CREATE INDEX IF NOT EXISTS boards_objects ON boards(object_count);
+CREATE INDEX IF NOT EXISTS boards_players ON boards(player_count);
+CREATE INDEX IF NOT EXISTS boards_bbox ON boards(min_x, max_x, min_y, max_y);
+
+CREATE TABLE IF NOT EXISTS board_types (
+    type_id  INTEGER NOT NULL,
+    board_id INTEGER NOT NULL REFERENCES boards(id),
+    count    INTEGER NOT NULL,
+    PRIMARY KEY (type_id, board_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS board_types_board ON board_types(board_id);
+
+CREATE TABLE IF NOT EXISTS codes (
+    code     TEXT PRIMARY KEY,
+    board_id INTEGER NOT NULL REFERENCES boards(id)
+) WITHOUT ROWID;
+"""
+
+_RECORD_COLUMNS = ('id, code, title, size, object_count, player_count, '
+                   'min_x, min_y, max_x, max_y')
+
+
+class BoardRecord(NamedTuple):
+    """One stored board."""
+    id: int
+    code: str
+    title: str
+    size: int
+    object_count: int
+    player_count: int
+    min_x: Optional[float]
+    min_y: Optional[float]
+    max_x: Optional[float]
+    max_y: Optional[float]
+
+    @property
+    def bbox(self) -> Optional[Tuple[float, float, float, float]]:
+        if self.min_x is None:
+            return None
+        return (self.min_x, self.min_y, self.max_x, self.max_y)
+
+
+class IngestStats(NamedTuple):
+    """Outcome of an ingest call."""
+    added: int = 0       # new boards
+    duplicates: int = 0  # codes whose board was already stored
+    errors: int = 0      # codes that failed to decode or parse
+
+
+def board_digest(binary_data: bytes) -> bytes:
+    """Dedup key: hash of the decompressed binary."""
+    return hashlib.blake2b(binary_data, digest_size=16).digest()
+
+
+def resolve_type_id(t: Union[int, str]) -> int:
+    """Type ID from a raw ID or a type name/alias ("donut_aoe", "Paladin")."""
+    return type_id(t)
+
+
+class StrategyCorpus:
+    """
+    SQLite-backed strategy archive.
+
+    Args:
+        path: Database file (default in-memory)
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'StrategyCorpus':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM boards').fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def add_codes(self, codes: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                  mode: str = 'auto', workers: int = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> IngestStats:
+        """
+        Ingest codes, one transaction per batch.
+
+        Codes already in the store are skipped without decoding; the rest
+        of the stream goes through a single decode_many call (one worker
+        pool, mode/workers/chunk_size as there) and its results are
+        regrouped into per-batch transactions.
+        """
+        batches = deque()  # (new codes, known count), filled as decode_many reads ahead
+
+        def new_codes() -> Iterator[str]:
+            it = iter(codes)
+            while True:
+                batch = list(dict.fromkeys(itertools.islice(it, batch_size)))
+                if not batch:
+                    return
+                new = self._unknown_codes(batch)
+                batches.append((new, len(batch) - len(new)))
+                yield from new
+
+        added = duplicates = errors = 0
+        group = []
+        offset = 0  # stream index of the first code in batches[0]
+        results = decode_many(new_codes(), mode, workers, chunk_size)
+        for result in itertools.chain(results, [None]):
+            while batches and (result is None or result.index >= offset + len(batches[0][0])):
+                new, known = batches.popleft()
+                a, d, e = self._ingest_batch(new, group)
+                added += a
+                duplicates += known + d
+                errors += e
+                offset += len(new)
+                group = []
+            if result is not None:
+                group.append(result)
+        return IngestStats(added, duplicates, errors)
+
+    def add_file(self, source, use_mmap: bool = False, **options) -> IngestStats:
+        """Ingest every code found in a text dump (see ff14_strategy_scan)."""
+        return self.add_codes((code for _, code in scan_codes(source, use_mmap)), **options)
+
+    def _unknown_codes(self, batch: List[str]) -> List[str]:
+        known = set()
+        for start in range(0, len(batch), 500):
+            part = batch[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT code FROM codes WHERE code IN ({','.join('?' * len(part))})", part)
+            known.update(code for code, in rows)
+        return [code for code in batch if code not in known]
+
+    def _ingest_batch(self, new: List[str], results: list) -> Tuple[int, int, int]:
+        conn = self.conn
+        added = duplicates = errors = 0
+        with conn:
+            for code, result in zip(new, results):
+                board = try_parse_board(result.value) if result.ok else None
+                if board is None:
+                    errors += 1
+                    continue
+
+                digest = board_digest(result.value)
+                row = conn.execute('SELECT id FROM boards WHERE digest = ?', (digest,)).fetchone()
+                if row is not None:
+                    duplicates += 1
+                    conn.execute('INSERT OR IGNORE INTO codes VALUES (?, ?)', (code, row[0]))
+                    continue
+
+                board_id = self._insert_board(digest, code, board)
+                conn.execute('INSERT INTO codes VALUES (?, ?)', (code, board_id))
+                added += 1
+        return added, duplicates, errors
+
+    def _insert_board(self, digest: bytes, code: str, board) -> int:
+        histogram = Counter(board.type_ids)
+        players = sum(n for t, n in histogram.items() if t in PLAYER_TYPE_IDS)
+        coords = board.coords() if board.offset(BLOCK_COORD) >= 0 else []
+        if coords:
+            xs = [x for x, _ in coords]
+            ys = [y for _, y in coords]
+            bbox = (min(xs), min(ys), max(xs), max(ys))
+        else:
+            bbox = (None, None, None, None)
+
+        cur = self.conn.execute(
+            'INSERT INTO boards (digest, code, title, size, object_count, player_count, '
+            'min_x, min_y, max_x, max_y) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (digest, code, board.title, len(board.data), board.count, players) + bbox)
+        board_id = cur.lastrowid
+        self.conn.executemany(
+            'INSERT INTO board_types VALUES (?, ?, ?)',
+            [(t, board_id, n) for t, n in histogram.items()])
+        return board_id
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, board_id: int) -> Optional[BoardRecord]:
+        row = self.conn.execute(
+            f'SELECT {_RECORD_COLUMNS} FROM boards WHERE id = ?', (board_id,)).fetchone()
+        return BoardRecord(*row) if row else None
+
+    def find_code(self, code: str) -> Optional[BoardRecord]:
+        """Board a code was stored under, if it was ever ingested."""
+        row = self.conn.execute('SELECT board_id FROM codes WHERE code = ?', (code,)).fetchone()
+        return self.get(row[0]) if row else None
+
+    def codes_for(self, board_id: int) -> List[str]:
+        """Every distinct code seen for a board."""
+        return [c for c, in self.conn.execute(
+            'SELECT code FROM codes WHERE board_id = ? ORDER BY code', (board_id,))]
+
+    def histogram(self, board_id: int) -> Dict[int, int]:
+        """Type ID -> count for one board."""
+        return dict(self.conn.execute(
+            'SELECT type_id, count FROM board_types WHERE board_id = ?', (board_id,)))
+
+    def query(
+        self,
+        title: str = None,
+        contains: Dict[Union[int, str], int] = None,
+        min_objects: int = None,
+        max_objects: int = None,
+        min_players: int = None,
+        max_players: int = None,
+        within: Tuple[float, float, float, float] = None,
+        limit: int = None,
+    ) -> Iterator[BoardRecord]:
+        """
+        Find boards by metadata.
+
+        Args:
+            title: SQL LIKE pattern on the title ("%P8S%")
+            contains: Type (ID or name) -> minimum count
+            min_objects/max_objects: Object count range
+            min_players/max_players: Job/role icon count range
+            within: (x0, y0, x1, y1) box containing every object position
+            limit: Maximum number of results
+        """
+        where = []
+        args = []
+        if title is not None:
+            where.append('title LIKE ?')
+            args.append(title)
+        for column, op, value in (('object_count', '>=', min_objects),
+                                  ('object_count', '<=', max_objects),
+                                  ('player_count', '>=', min_players),
+                                  ('player_count', '<=', max_players)):
+            if value is not None:
+                where.append(f'{column} {op} ?')
+                args.append(value)
+        if within is not None:
+            where.append('min_x >= ? AND min_y >= ? AND max_x <= ? AND max_y <= ?')
+            args.extend(within)
+        for t, n in (contains or {}).items():
+            where.append('id IN (SELECT board_id FROM board_types WHERE type_id = ? AND count >= ?)')
+            args.extend((resolve_type_id(t), n))
+
+        sql = f'SELECT {_RECORD_COLUMNS} FROM boards'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            args.append(limit)
+        for row in self.conn.execute(sql, args):
+            yield BoardRecord(*row)
+
+    def type_counts(self) -> Dict[int, int]:
+        """Type ID -> number of boards containing it, across the corpus."""
+        return dict(self.conn.execute(
+            'SELECT type_id, COUNT(*) FROM board_types GROUP BY type_id'))
@@ -0,0 +1,440 @@
+"""
+FF14 Strategy Board Diff
+
+Structural diff between two boards and a compact binary delta format, so
+a raid plan (a sequence of boards that differ by a few moved markers) can
+be stored as one base board plus small deltas.
+
+Objects are matched by aligning the two TYPE sequences (difflib), so an
+object inserted or deleted in the middle does not show up as every later
+object having moved. Matched objects are compared column by column:
+
+    moved, rotated, resized, recoloured, retyped, retexted, relayered,
+    reparam, plus added / removed objects and retitled boards
+
+Delta layout (little-endian):
+
+    magic "SD" | version u8 | flags u8 | base digest (8 bytes) | body
+    flags & FULL: body is the whole target binary
+    flags & ZLIB: body is zlib-compressed
+    patch body:
+        title u16 (0xFFFF = unchanged) [+ raw padded title bytes]
+        footer u8 (0 = unchanged)      [+ 8 bytes]
+        target count u16
+        run count u16, runs: kind u8 (0 copy, 1 insert) | start u16 | length u16
+        record count u16, records: target index u16 | field mask u16 | values
+
+Applying a delta that only patches columns copies the base buffer and
+writes the changed elements in place; structural deltas rebuild the
+binary block by block. make_delta() checks the round trip and falls back
+to storing the full target when a board uses a layout it cannot rebuild.
+
+Usage:
+    from ff14_strategy_diff import diff_boards, make_delta, apply_delta
+
+    for change in diff_boards(step1_code, step2_code):
+        print(change)
+    delta = make_delta(step1_code, step2_code)
+    step2_binary = apply_delta(step1_code, delta)
+
+Dependencies: ff14_strategy_board.py
+"""
+import difflib
+import hashlib
+import struct
+import zlib
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .ff14_strategy_board import (
+    BLOCK_ANGLE, BLOCK_COORD, BLOCK_LAYER, BLOCK_LAYOUT, BLOCK_PARAM_A, BLOCK_PARAM_B,
+    BLOCK_PARAM_C, BLOCK_SIZE, BLOCK_TEXT, BLOCK_TRANS, BLOCK_TYPE, BLOCK_UNKNOWN_09,
+    FOOTER_SIZE, HEADER_SIZE, StrategyBoard,
+)
+
+DELTA_MAGIC = b'SD'
+DELTA_VERSION = 1
+FLAG_FULL = 0x01
+FLAG_ZLIB = 0x02
+
+_UNCHANGED = 0xFFFF
+_RUN_COPY = 0
+_RUN_INSERT = 1
+
+# Per-object fields: (name, block id or None for the TYPE section, element
+# format, change kind). Order fixes the delta mask bits.
+FIELDS = (
+    ('type', None, '<H', 'retyped'),
+    ('text', None, None, 'retexted'),
+    ('layer', BLOCK_LAYER, '<H', 'relayered'),
+    ('pos', BLOCK_COORD, '<hh', 'moved'),
+    ('angle', BLOCK_ANGLE, '<h', 'rotated'),
+    ('size', BLOCK_SIZE, '<B', 'resized'),
+    ('color', BLOCK_TRANS, '<4B', 'recoloured'),
+    ('unknown_09', BLOCK_UNKNOWN_09, '<H', 'reparam'),
+    ('param_a', BLOCK_PARAM_A, '<H', 'reparam'),
+    ('param_b', BLOCK_PARAM_B, '<H', 'reparam'),
+    ('param_c', BLOCK_PARAM_C, '<H', 'reparam'),
+)
+_FIELD_STRUCTS = [struct.Struct(fmt) if fmt else None for _, _, fmt, _ in FIELDS]
+_TYPE_FIELD = 0
+_TEXT_FIELD = 1
+
+BoardLike = Union[str, bytes, StrategyBoard]
+
+
+class Change(NamedTuple):
+    """One difference between two boards."""
+    kind: str           # moved, rotated, ..., added, removed, retitled
+    index: int          # object index in the new board (old board for "removed")
+    old: object = None
+    new: object = None
+
+
+def _as_board(item: BoardLike) -> StrategyBoard:
+    if isinstance(item, StrategyBoard):
+        return item
+    if isinstance(item, str):
+        return StrategyBoard.from_code(item)
+    return StrategyBoard(item)
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+# ============================================================================
+# Object Rows
+# ============================================================================
+
+def _layout(board: StrategyBoard) -> tuple:
+    """(block id, subtype) of every column block, in file order."""
+    return tuple((b.block_id, b.subtype) for b in sorted(board.blocks.values(), key=lambda b: b.offset))
+
+
+def _columns_complete(board: StrategyBoard) -> bool:
+    """Whether every column block holds exactly one entry per TYPE entry."""
+    return all(board.blocks[block_id].count == board.count
+               for _, block_id, _, _ in FIELDS if block_id in board.blocks)
+
+
+def _raw_text(board: StrategyBoard, index: int) -> Optional[bytes]:
+    """Raw payload (including padding) of an object's text block, if any."""
+    if index not in board.texts:
+        return None
+    pos = board.type_offsets[index] + 4
+    length = struct.unpack_from('<H', board.data, pos + 2)[0]
+    return bytes(board.data[pos + 4:pos + 4 + length])
+
+
+def object_rows(board: StrategyBoard) -> List[list]:
+    """Per-object field values in FIELDS order (None where a block is absent)."""
+    data = board.data
+    columns = []
+    for f, (_, block_id, _, _) in enumerate(FIELDS):
+        if f == _TYPE_FIELD:
+            columns.append([(t,) for t in board.type_ids])
+        elif f == _TEXT_FIELD:
+            columns.append([_raw_text(board, i) for i in range(board.count)])
+        elif block_id in board.blocks:
+            block = board.blocks[block_id]
+            s = _FIELD_STRUCTS[f]
+            columns.append([s.unpack_from(data, block.offset + i * s.size) for i in range(block.count)])
+        else:
+            columns.append([None] * board.count)
+    return [[col[i] if i < len(col) else None for col in columns] for i in range(board.count)]
+
+
+def _title_bytes(board: StrategyBoard) -> bytes:
+    return bytes(board.data[HEADER_SIZE:HEADER_SIZE + board.title_len])
+
+
+def _footer_bytes(board: StrategyBoard) -> bytes:
+    if board.footer < 0:
+        return b''
+    return bytes(board.data[board.footer:board.footer + FOOTER_SIZE])
+
+
+# ============================================================================
+# Diff
+# ============================================================================
+
+def _match(old: StrategyBoard, new: StrategyBoard) -> List[Tuple[str, int, int, int, int]]:
+    """difflib opcodes aligning the TYPE sequences; equal-length replaces count as matches."""
+    matcher = difflib.SequenceMatcher(None, old.type_ids, new.type_ids, autojunk=False)
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'replace' and i2 - i1 == j2 - j1:
+            tag = 'equal'
+        ops.append((tag, i1, i2, j1, j2))
+    return ops
+
+
+def _value(name: str, value):
+    if value is None or name == 'text':
+        return value
+    if name == 'pos':
+        return (value[0] / 10.0, value[1] / 10.0)
+    return value if len(value) > 1 else value[0]
+
+
+def diff_boards(old: BoardLike, new: BoardLike) -> List[Change]:
+    """Per-object changes turning `old` into `new`."""
+    old, new = _as_board(old), _as_board(new)
+    changes = []
+    if old.title != new.title:
+        changes.append(Change('retitled', -1, old.title, new.title))
+
+    old_rows, new_rows = object_rows(old), object_rows(new)
+    for tag, i1, i2, j1, j2 in _match(old, new):
+        if tag == 'equal':
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                for f, (name, _, _, kind) in enumerate(FIELDS):
+                    a, b = old_rows[i][f], new_rows[j][f]
+                    if a != b:
+                        changes.append(Change(kind, j, _value(name, a), _value(name, b)))
+            continue
+        for i in range(i1, i2):
+            changes.append(Change('removed', i, old.type_ids[i], None))
+        for j in range(j1, j2):
+            changes.append(Change('added', j, None, new.type_ids[j]))
+    return changes
+
+
+# ============================================================================
+# Delta Encoding
+# ============================================================================
+
+def _pack_record(out: bytearray, index: int, mask: int, row: list):
+    out += struct.pack('<HH', index, mask)
+    for f in range(len(FIELDS)):
+        if mask >> f & 1:
+            value = row[f]
+            if f == _TEXT_FIELD:
+                value = value or b''
+                out += struct.pack('<H', len(value)) + value
+            else:
+                out += _FIELD_STRUCTS[f].pack(*value)
+
+
+def _full_delta(base_digest: bytes, target: bytes) -> bytes:
+    return DELTA_MAGIC + bytes([DELTA_VERSION, FLAG_FULL | FLAG_ZLIB]) + base_digest + zlib.compress(target, 9)
+
+
+def make_delta(base: BoardLike, target: BoardLike, compress: bool = True, verify: bool = True) -> bytes:
+    """
+    Delta that rebuilds `target` from `base`.
+
+    Args:
+        compress: zlib the body when that makes it smaller
+        verify: Apply the delta and fall back to a full-target delta if
+            the rebuild is not byte-identical
+    """
+    base, target = _as_board(base), _as_board(target)
+    base_bytes, target_bytes = base.to_bytes(), target.to_bytes()
+    digest = _digest(base_bytes)
+
+    if (_layout(base) != _layout(target) or base.footer < 0 or target.footer < 0
+            or not _columns_complete(base) or not _columns_complete(target)):
+        return _full_delta(digest, target_bytes)
+
+    body = bytearray()
+    title = _title_bytes(target)
+    if title == _title_bytes(base):
+        body += struct.pack('<H', _UNCHANGED)
+    else:
+        body += struct.pack('<H', len(title)) + title
+    footer = _footer_bytes(target)
+    if footer == _footer_bytes(base):
+        body += b'\x00'
+    else:
+        body += b'\x01' + footer
+    body += struct.pack('<H', target.count)
+
+    base_rows, target_rows = object_rows(base), object_rows(target)
+    runs = []
+    records = bytearray()
+    n_records = 0
+    for tag, i1, i2, j1, j2 in _match(base, target):
+        if tag == 'equal':
+            runs.append((_RUN_COPY, i1, i2 - i1))
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                mask = 0
+                for f in range(len(FIELDS)):
+                    if base_rows[i][f] != target_rows[j][f]:
+                        mask |= 1 << f
+                if mask:
+                    _pack_record(records, j, mask, target_rows[j])
+                    n_records += 1
+        elif j2 > j1:
+            runs.append((_RUN_INSERT, j1, j2 - j1))
+            for j in range(j1, j2):
+                mask = 0
+                for f, value in enumerate(target_rows[j]):
+                    if value is not None:
+                        mask |= 1 << f
+                _pack_record(records, j, mask, target_rows[j])
+                n_records += 1
+
+    body += struct.pack('<H', len(runs))
+    for kind, start, length in runs:
+        body += struct.pack('<BHH', kind, start, length)
+    body += struct.pack('<H', n_records) + records
+
+    flags = 0
+    if compress:
+        packed = zlib.compress(bytes(body), 9)
+        if len(packed) < len(body):
+            body, flags = packed, FLAG_ZLIB
+    delta = DELTA_MAGIC + bytes([DELTA_VERSION, flags]) + digest + bytes(body)
+
+    if verify:
+        try:
+            rebuilt = apply_delta(base, delta)
+        except (ValueError, IndexError, TypeError, struct.error):
+            rebuilt = None
+        if rebuilt != target_bytes:
+            return _full_delta(digest, target_bytes)
+    return delta
+
+
+def _read_record(body: bytes, pos: int) -> Tuple[int, int, list, int]:
+    index, mask = struct.unpack_from('<HH', body, pos)
+    pos += 4
+    row = [None] * len(FIELDS)
+    for f in range(len(FIELDS)):
+        if mask >> f & 1:
+            if f == _TEXT_FIELD:
+                length = struct.unpack_from('<H', body, pos)[0]
+                row[f] = body[pos + 2:pos + 2 + length] or None
+                pos += 2 + length
+            else:
+                s = _FIELD_STRUCTS[f]
+                row[f] = s.unpack_from(body, pos)
+                pos += s.size
+    return index, mask, row, pos
+
+
+def _rebuild(base: StrategyBoard, title: bytes, footer: bytes, rows: List[list]) -> bytes:
+    """Serialize object rows using the base board's header and block layout."""
+    count = len(rows)
+    content = bytearray()
+    for row in rows:
+        content += struct.pack('<HH', BLOCK_TYPE, row[_TYPE_FIELD][0])
+        text = row[_TEXT_FIELD]
+        if text is not None:
+            content += struct.pack('<HH', BLOCK_TEXT, len(text)) + text
+
+    for block in sorted(base.blocks.values(), key=lambda b: b.offset):
+        f = next(k for k, spec in enumerate(FIELDS) if spec[1] == block.block_id)
+        s = _FIELD_STRUCTS[f]
+        content += struct.pack('<BxBxH', block.block_id, block.subtype, count)
+        for row in rows:
+            content += s.pack(*row[f])
+        if (count * BLOCK_LAYOUT[block.block_id][1]) & 1:
+            content += b'\x00'
+    content += footer
+
+    total = HEADER_SIZE + len(title) + len(content)
+    header = bytearray(base.data[:HEADER_SIZE])
+    struct.pack_into('<I', header, 4, total - 16)
+    struct.pack_into('<H', header, 18, total - HEADER_SIZE)
+    struct.pack_into('<H', header, 26, len(title))
+    return bytes(header) + title + bytes(content)
+
+
+def apply_delta(base: BoardLike, delta: bytes) -> bytes:
+    """Rebuild the target binary from `base` and a make_delta() delta."""
+    if delta[:2] != DELTA_MAGIC or len(delta) < 12:
+        raise ValueError("Not a strategy delta")
+    if delta[2] != DELTA_VERSION:
+        raise ValueError(f"Unsupported delta version {delta[2]}")
+    flags = delta[3]
+    base = _as_board(base)
+    if delta[4:12] != _digest(base.to_bytes()):
+        raise ValueError("Delta does not belong to this base board")
+    body = delta[12:]
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+    if flags & FLAG_FULL:
+        return bytes(body)
+
+    pos = 0
+    title_len = struct.unpack_from('<H', body, pos)[0]
+    pos += 2
+    title = None
+    if title_len != _UNCHANGED:
+        title = body[pos:pos + title_len]
+        pos += title_len
+    footer = None
+    if body[pos]:
+        footer = body[pos + 1:pos + 1 + FOOTER_SIZE]
+        pos += FOOTER_SIZE
+    pos += 1
+    count, n_runs = struct.unpack_from('<HH', body, pos)
+    pos += 4
+    runs = []
+    for _ in range(n_runs):
+        runs.append(struct.unpack_from('<BHH', body, pos))
+        pos += 5
+    n_records = struct.unpack_from('<H', body, pos)[0]
+    pos += 2
+    records = []
+    for _ in range(n_records):
+        index, mask, row, pos = _read_record(body, pos)
+        records.append((index, mask, row))
+
+    structural = (title is not None or count != base.count
+                  or runs != ([(_RUN_COPY, 0, count)] if count else [])
+                  or any(mask & (1 << _TEXT_FIELD | 1 << _TYPE_FIELD) for _, mask, _ in records))
+    if not structural:
+        # Column patches only: write changed elements into a copy of the base
+        data = bytearray(base.data)
+        for index, mask, row in records:
+            for f, (_, block_id, _, _) in enumerate(FIELDS):
+                if mask >> f & 1:
+                    s = _FIELD_STRUCTS[f]
+                    s.pack_into(data, base.blocks[block_id].offset + index * s.size, *row[f])
+        if footer is not None:
+            data[base.footer:base.footer + FOOTER_SIZE] = footer
+        return bytes(data)
+
+    base_rows = object_rows(base)
+    rows: List[Optional[list]] = []
+    for kind, start, length in runs:
+        if kind == _RUN_COPY:
+            rows.extend(list(r) for r in base_rows[start:start + length])
+        else:
+            rows.extend([None] * length)
+    if len(rows) != count:
+        raise ValueError(f"Delta runs describe {len(rows)} objects, expected {count}")
+    for index, mask, row in records:
+        if rows[index] is None:
+            rows[index] = row
+        else:
+            for f in range(len(FIELDS)):
+                if mask >> f & 1:
+                    rows[index][f] = row[f]
+    return _rebuild(base, _title_bytes(base) if title is None else bytes(title),
+                    _footer_bytes(base) if footer is None else bytes(footer), rows)
+
+
+# ============================================================================
+# Plans
+# ============================================================================
+
+def make_plan(steps: Iterable[BoardLike], **options) -> Tuple[bytes, List[bytes]]:
+    """(base binary, deltas) where each delta rebuilds a step from the previous one."""
+    boards = [_as_board(s) for s in steps]
+    if not boards:
+        raise ValueError("A plan needs at least one board")
+    deltas = [make_delta(a, b, **options) for a, b in zip(boards, boards[1:])]
+    return boards[0].to_bytes(), deltas
+
+
+def replay_plan(base: bytes, deltas: Iterable[bytes]) -> Iterator[bytes]:
+    """Yield the binary of every step of a plan, starting with the base."""
+    current = bytes(base)
+    yield current
+    for delta in deltas:
+        current = apply_delta(current, delta)
+        yield current
@@ -0,0 +1,270 @@
+"""
+FF14 Strategy Edit Session
+
+Decode once, apply any number of per-object edits, encode once.
+
+The modify_* helpers in ff14_strategy_utils each run a full
+decode -> patch -> compress -> encode cycle. An EditSession keeps one
+parsed StrategyBoard, patches it in place, and only re-encodes when the
+code is requested. Every edit (or group of edits) records a snapshot of
+the decoded buffer, so undo/redo never re-decode. An edit that raises
+(bad index, unknown param, ...) leaves no undo step and keeps redo intact.
+
+Usage:
+    with EditSession(code) as session:
+        session.move(0, 256, 192)
+        session.rotate(1, 90)
+        with session.group():
+            session.recolor(2, (255, 0, 0))
+            session.set_alpha(2, 50)
+    new_code = session.code
+
+Dependencies: ff14_strategy_board.py (StrategyBoard)
+"""
+from contextlib import contextmanager
+from typing import Optional, Tuple, Union
+
+from .ff14_strategy_board import (
+    StrategyBoard, BLOCK_PARAM_A, BLOCK_PARAM_B, BLOCK_PARAM_C,
+)
+
+_PARAM_BLOCKS = {'a': BLOCK_PARAM_A, 'b': BLOCK_PARAM_B, 'c': BLOCK_PARAM_C}
+
+
+class EditSession:
+    """
+    Batched editor over one decoded strategy board.
+
+    Args:
+        source: Strategy code, decoded binary, or StrategyBoard
+        seed: Obfuscation seed used when re-encoding
+        max_undo: Maximum number of undo snapshots kept
+
+    Used as a context manager, the session commits on normal exit and
+    discards pending edits if the block raises.
+    """
+
+    def __init__(self, source: Union[str, bytes, StrategyBoard], seed: int = 10, max_undo: int = 100):
+        if isinstance(source, StrategyBoard):
+            self.board = source
+        elif isinstance(source, str):
+            self.board = StrategyBoard.from_code(source)
+        else:
+            self.board = StrategyBoard(source)
+        self.seed = seed
+        self.max_undo = max_undo
+        self._undo = []
+        self._redo = []
+        self._group_depth = 0
+        self._committed = bytes(self.board.data)
+        self._code: Optional[str] = source if isinstance(source, str) else None
+
+    # ------------------------------------------------------------------
+    # Context manager
+    # ------------------------------------------------------------------
+
+    def __enter__(self) -> 'EditSession':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def _push(self, snapshot: bytes):
+        """Add an undo step (the buffer before an edit)."""
+        self._undo.append(snapshot)
+        if len(self._undo) > self.max_undo:
+            del self._undo[0]
+        self._redo.clear()
+
+    def _restore(self, snapshot: bytes):
+        # All edits are fixed-size, so this never resizes the buffer
+        self.board.data[:] = snapshot
+        self.board.type_ids[:] = [
+            int.from_bytes(snapshot[off + 2:off + 4], 'little') for off in self.board.type_offsets
+        ]
+
+    @contextmanager
+    def _rollback_on_error(self):
+        """Restore the buffer if the block raises; yields the snapshot."""
+        snapshot = bytes(self.board.data)
+        try:
+            yield snapshot
+        except BaseException:
+            if self.board.data != snapshot:
+                self._restore(snapshot)
+            raise
+
+    @contextmanager
+    def _step(self):
+        """Run one edit; it becomes an undo step only if it succeeds."""
+        with self._rollback_on_error() as snapshot:
+            yield
+        if not self._group_depth:
+            self._push(snapshot)
+
+    @contextmanager
+    def group(self):
+        """
+        Record all edits inside the block as a single undo step.
+
+        If the block raises, all of its edits are rolled back and no step
+        is recorded.
+        """
+        outer = not self._group_depth
+        self._group_depth += 1
+        try:
+            with self._rollback_on_error() as snapshot:
+                yield self
+        finally:
+            self._group_depth -= 1
+        if outer and self.board.data != snapshot:
+            self._push(snapshot)
+
+    def undo(self) -> bool:
+        """Revert the last edit step. Returns False if nothing to undo."""
+        if not self._undo:
+            return False
+        self._redo.append(bytes(self.board.data))
+        self._restore(self._undo.pop())
+        return True
+
+    def redo(self) -> bool:
+        """Re-apply the last undone step. Returns False if nothing to redo."""
+        if not self._redo:
+            return False
+        self._undo.append(bytes(self.board.data))
+        self._restore(self._redo.pop())
+        return True
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    # ------------------------------------------------------------------
+    # Edits
+    # ------------------------------------------------------------------
+
+    def move(self, index: int, x: float, y: float):
+        """Set position in game units."""
+        with self._step():
+            self.board.set_coord(index, x, y)
+
+    def rotate(self, index: int, angle: int):
+        """Set rotation in degrees."""
+        with self._step():
+            self.board.set_angle(index, angle)
+
+    def resize(self, index: int, size: int):
+        """Set size (0-255, default 100)."""
+        with self._step():
+            self.board.set_size(index, size)
+
+    def recolor(self, index: int, color: Tuple[int, int, int]):
+        """Set (R, G, B)."""
+        with self._step():
+            self.board.set_color(index, color)
+
+    def set_alpha(self, index: int, alpha: int):
+        """Set transparency (0 = opaque)."""
+        with self._step():
+            self.board.set_alpha(index, alpha)
+
+    def set_param(self, index: int, param: str, value: int):
+        """Set PARAM 'a', 'b' or 'c'."""
+        with self._step():
+            self.board.set_param(_PARAM_BLOCKS[param.lower()], index, value)
+
+    def set_type(self, index: int, type_id: int):
+        """Change object type."""
+        with self._step():
+            self.board.set_type(index, type_id)
+
+    def update(self, index: int, **fields):
+        """
+        Apply several fields to one object as a single undo step
+        (all or nothing: if one field fails, none are applied).
+
+        Fields: x, y, angle, size, color, alpha, param_a, param_b,
+        param_c, type_id. x and y must be given together.
+        """
+        unknown = set(fields) - {
+            'x', 'y', 'angle', 'size', 'color', 'alpha',
+            'param_a', 'param_b', 'param_c', 'type_id',
+        }
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        if ('x' in fields) != ('y' in fields):
+            raise ValueError("x and y must be given together")
+
+        with self.group():
+            if 'x' in fields:
+                self.move(index, fields['x'], fields['y'])
+            if 'angle' in fields:
+                self.rotate(index, fields['angle'])
+            if 'size' in fields:
+                self.resize(index, fields['size'])
+            if 'color' in fields:
+                self.recolor(index, fields['color'])
+            if 'alpha' in fields:
+                self.set_alpha(index, fields['alpha'])
+            for p in 'abc':
+                if f'param_{p}' in fields:
+                    self.set_param(index, p, fields[f'param_{p}'])
+            if 'type_id' in fields:
+                self.set_type(index, fields['type_id'])
+
+    # ------------------------------------------------------------------
+    # Commit
+    # ------------------------------------------------------------------
+
+    @property
+    def dirty(self) -> bool:
+        """True if the board differs from the last committed state."""
+        return self.board.data != self._committed
+
+    def commit(self) -> str:
+        """Encode the board (only if it changed) and return the code."""
+        if self._code is None or self.dirty:
+            self._committed = bytes(self.board.data)
+            self._code = self.board.encode(self.seed)
+        return self._code
+
+    def rollback(self):
+        """Discard edits since the last commit."""
+        if self.dirty:
+            self._push(bytes(self.board.data))
+            self._restore(self._committed)
+
+    @property
+    def code(self) -> str:
+        """Strategy code for the current board, encoded lazily."""
+        return self.commit()
+
+    def to_bytes(self) -> bytes:
+        return self.board.to_bytes()
+
+
+if __name__ == "__main__":
+    sample = "[stgy:abj1sYMCIBpzt8a0+C2ZlTHNWHr9pIj-JN7FoA+dCxfY8slZSfYai+NOwGI-4TVfab6BGd5f2u0KXaJzxu2aRlkchdGOUXKXLJX9EuglvoAEvIJEg8wXllhfBMbsPsNkICncRiAnDU]"
+
+    with EditSession(sample) as session:
+        for i, x in enumerate([100, 256, 412]):
+            session.update(i, x=x, y=192, angle=45 * i, size=120)
+        session.recolor(0, (255, 0, 0))
+        session.undo()  # drop the recolor
+
+    print("Edited:")
+    print(session.code)
+    print(session.board.coords(), session.board.colors()[0])
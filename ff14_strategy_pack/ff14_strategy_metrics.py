@@ -0,0 +1,351 @@
+"""
+FF14 Strategy Codec Metrics
+
+Opt-in per-stage instrumentation for the codec pipeline. Each stage
+reports a StageEvent (wall time, bytes in/out, error category) to every
+registered sink:
+
+    decode.substitution, decode.deobfuscation, decode.base64, decode.crc,
+    decode.inflate, parse (StrategyBoard), encode.deflate, encode.crc,
+    encode.base64, encode.obfuscation, encode.substitution
+
+Bulk decode/encode (ff14_strategy_batch with NumPy) vectorizes the
+substitution and (de)obfuscation stages over a whole chunk, so those two
+report one event per chunk covering every code in it; the other stages
+report one event per code. Cache hits skip the pipeline and emit nothing. With no sinks registered
+the codec checks one list and runs its normal code path, so
+instrumentation costs nothing when off.
+
+Sinks:
+- HistogramSink:  in-memory counters and latency histograms per stage
+- LoggingSink:    one log record per event (errors at WARNING)
+- PrometheusSink: histogram written as Prometheus text to a file
+                  (e.g. for the node_exporter textfile collector)
+
+Usage:
+    from ff14_strategy_metrics import HistogramSink, instrument
+
+    with instrument(HistogramSink()) as sink:
+        for code in codes:
+            decode_strategy(code)
+    print(sink.summary()['decode.inflate'])
+
+Dependencies: None
+"""
+import bisect
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Registered sinks. The codec tests this list directly ("if SINKS:"), so it
+# is only ever mutated in place.
+SINKS: list = []
+
+# Latency histogram upper bounds in seconds (Prometheus "le" buckets)
+DEFAULT_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+_perf_counter = time.perf_counter
+
+_log = logging.getLogger('ff14_strategy.metrics')
+
+
+class StageEvent(NamedTuple):
+    stage: str
+    seconds: float
+    bytes_in: int
+    bytes_out: int
+    error: Optional[str] = None  # error category, None on success
+
+    @property
+    def ratio(self) -> float:
+        """bytes_out / bytes_in (the compression ratio for inflate/deflate)."""
+        return self.bytes_out / self.bytes_in if self.bytes_in else 0.0
+
+
+def error_category(exc: BaseException) -> str:
+    """Short, stable label for an exception raised inside a stage."""
+    if isinstance(exc, ValueError) and str(exc).startswith('CRC mismatch'):
+        return 'crc_mismatch'
+    if type(exc).__module__ in ('zlib', 'binascii'):
+        return f'{type(exc).__module__}_error'
+    return type(exc).__name__
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+_LOCK = threading.Lock()
+
+
+def add_sink(sink) -> object:
+    """Start sending stage events to sink (an object with record(event))."""
+    with _LOCK:
+        if sink not in SINKS:
+            SINKS.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    with _LOCK:
+        if sink in SINKS:
+            SINKS.remove(sink)
+
+
+def enabled() -> bool:
+    return bool(SINKS)
+
+
+@contextmanager
+def instrument(sink=None):
+    """Register sink (default: a new HistogramSink) for the with block."""
+    sink = HistogramSink() if sink is None else sink
+    add_sink(sink)
+    try:
+        yield sink
+    finally:
+        remove_sink(sink)
+        flush = getattr(sink, 'flush', None)
+        if flush is not None:
+            flush()
+
+
+def emit(event: StageEvent):
+    # Runs inside the codec: a failing sink is logged, never raised into a decode
+    for sink in SINKS:
+        try:
+            sink.record(event)
+        except Exception:
+            _log.exception('Metrics sink %r failed', sink)
+
+
+class stage:
+    """
+    Time one pipeline stage and emit its event.
+
+    Set .bytes_out inside the block; exceptions are recorded with their
+    category and re-raised.
+
+        with stage('decode.inflate', len(raw)) as s:
+            data = zlib.decompress(raw)
+            s.bytes_out = len(data)
+    """
+    __slots__ = ('name', 'bytes_in', 'bytes_out', '_start')
+
+    def __init__(self, name: str, bytes_in: int = 0):
+        self.name = name
+        self.bytes_in = bytes_in
+        self.bytes_out = 0
+
+    def __enter__(self) -> 'stage':
+        self._start = _perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = _perf_counter() - self._start
+        emit(StageEvent(self.name, elapsed, self.bytes_in, self.bytes_out,
+                        None if exc is None else error_category(exc)))
+        return False
+
+
+# ============================================================================
+# Sinks
+# ============================================================================
+
+class StageSummary(NamedTuple):
+    count: int
+    errors: Dict[str, int]
+    seconds: float
+    bytes_in: int
+    bytes_out: int
+    p50: float
+    p99: float
+
+    @property
+    def mean(self) -> float:
+        return self.seconds / self.count if self.count else 0.0
+
+    @property
+    def ratio(self) -> float:
+        return self.bytes_out / self.bytes_in if self.bytes_in else 0.0
+
+
+class _StageHistogram:
+    __slots__ = ('count', 'seconds', 'bytes_in', 'bytes_out', 'buckets', 'errors')
+
+    def __init__(self, n_buckets: int):
+        self.count = 0
+        self.seconds = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.buckets = [0] * (n_buckets + 1)  # last bucket is +Inf
+        self.errors: Dict[str, int] = {}
+
+
+class HistogramSink:
+    """
+    Thread-safe in-memory per-stage counters and latency histograms.
+
+    Args:
+        buckets: Ascending latency bucket bounds in seconds
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self._stages: Dict[str, _StageHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, event: StageEvent):
+        with self._lock:
+            h = self._stages.get(event.stage)
+            if h is None:
+                h = self._stages[event.stage] = _StageHistogram(len(self.bounds))
+            h.count += 1
+            h.seconds += event.seconds
+            h.bytes_in += event.bytes_in
+            h.bytes_out += event.bytes_out
+            h.buckets[bisect.bisect_left(self.bounds, event.seconds)] += 1
+            if event.error is not None:
+                h.errors[event.error] = h.errors.get(event.error, 0) + 1
+
+    def _quantile(self, h: _StageHistogram, q: float) -> float:
+        """Upper bound of the bucket holding quantile q."""
+        if not h.count:
+            return 0.0
+        rank = q * h.count
+        seen = 0
+        for i, n in enumerate(h.buckets):
+            seen += n
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else float('inf')
+        return float('inf')
+
+    def summary(self) -> Dict[str, StageSummary]:
+        """Per-stage totals with approximate p50/p99 latency."""
+        with self._lock:
+            return {name: StageSummary(h.count, dict(h.errors), h.seconds, h.bytes_in,
+                                       h.bytes_out, self._quantile(h, 0.5), self._quantile(h, 0.99))
+                    for name, h in self._stages.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def prometheus_text(self, prefix: str = 'ff14_strategy_stage',
+                        description: str = 'Codec pipeline stage wall time.') -> str:
+        """Prometheus text exposition format of the current histograms."""
+        lines = [
+            f'# HELP {prefix}_seconds {description}',
+            f'# TYPE {prefix}_seconds histogram',
+        ]
+        with self._lock:
+            stages = sorted(self._stages.items())
+            for name, h in stages:
+                cumulative = 0
+                for bound, n in zip(self.bounds + (float('inf'),), h.buckets):
+                    cumulative += n
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{prefix}_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{prefix}_seconds_sum{{stage="{name}"}} {h.seconds!r}')
+                lines.append(f'{prefix}_seconds_count{{stage="{name}"}} {h.count}')
+            for metric, attr, text in (('bytes_in', 'bytes_in', 'Bytes consumed'),
+                                       ('bytes_out', 'bytes_out', 'Bytes produced')):
+                lines.append(f'# HELP {prefix}_{metric}_total {text} by the stage.')
+                lines.append(f'# TYPE {prefix}_{metric}_total counter')
+                for name, h in stages:
+                    lines.append(f'{prefix}_{metric}_total{{stage="{name}"}} {getattr(h, attr)}')
+            lines.append(f'# HELP {prefix}_errors_total Stage failures by category.')
+            lines.append(f'# TYPE {prefix}_errors_total counter')
+            for name, h in stages:
+                for category, n in sorted(h.errors.items()):
+                    lines.append(f'{prefix}_errors_total{{stage="{name}",category="{category}"}} {n}')
+        return '\n'.join(lines) + '\n'
+
+
+class PrometheusSink(HistogramSink):
+    """
+    HistogramSink that writes Prometheus text to path.
+
+    The file is replaced atomically on flush(), and at most every interval
+    seconds while recording (interval=None writes only on flush()).
+    """
+
+    def __init__(self, path: str, interval: Optional[float] = 10.0,
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = 'ff14_strategy_stage'):
+        super().__init__(buckets)
+        self.path = path
+        self.interval = interval
+        self.prefix = prefix
+        self._next_write = 0.0 if interval is None else time.monotonic() + interval
+        self._write_lock = threading.Lock()
+
+    def record(self, event: StageEvent):
+        super().record(event)
+        if self.interval is not None and time.monotonic() >= self._next_write:
+            with self._write_lock:
+                # Another thread may have written while this one waited
+                if time.monotonic() >= self._next_write:
+                    self._write()
+
+    def flush(self):
+        with self._write_lock:
+            self._write()
+
+    def _write(self):
+        if self.interval is not None:
+            self._next_write = time.monotonic() + self.interval
+        target = os.path.abspath(self.path)
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(target) + '.', suffix='.tmp',
+                                   dir=os.path.dirname(target))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus_text(self.prefix))
+            os.chmod(tmp, 0o644)  # mkstemp creates 0600; collectors often run as another user
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+
+class LoggingSink:
+    """
+    Log every stage event.
+
+    Args:
+        logger: Target logger (default "ff14_strategy.metrics")
+        level: Level for successful stages
+        error_level: Level for failed stages
+    """
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.DEBUG,
+                 error_level: int = logging.WARNING):
+        self.logger = logger or logging.getLogger('ff14_strategy.metrics')
+        self.level = level
+        self.error_level = error_level
+
+    def record(self, event: StageEvent):
+        if event.error is None:
+            if self.logger.isEnabledFor(self.level):
+                self.logger.log(self.level, '%s %.1fus %d -> %d bytes', event.stage,
+                                event.seconds * 1e6, event.bytes_in, event.bytes_out)
+        else:
+            self.logger.log(self.error_level, '%s failed after %.1fus (%s, %d bytes in)',
+                            event.stage, event.seconds * 1e6, event.error, event.bytes_in)
+
+
+class ListSink:
+    """Keep every event (for tests and one-off debugging)."""
+
+    def __init__(self):
+        self.events: List[StageEvent] = []
+
+    def record(self, event: StageEvent):
+        self.events.append(event)
@@ -0,0 +1,179 @@
+"""
+FF14 Strategy NumPy Backend
+
+Vectorized substitution, index shifting and alphabet mapping for bulk
+workloads. A whole batch of codes is padded into one 2-D uint8 array and
+the obfuscation layer runs as array lookups and arithmetic over it:
+
+    decode: value[row, i] = (DEC[code[row, i + 1]] - i - seed[row]) & 0x3f
+    encode: char[row, i]  = ENC[(B64[text[row, i]] + i + seed) & 0x3f]
+
+Wrapping uint8 arithmetic is safe because 256 is a multiple of 64.
+Base64, CRC32 and zlib still run per item.
+
+NumPy is optional. Without it every function here falls back to the
+pure-Python stages in ff14_strategy.py with identical results.
+
+Dependencies: ff14_strategy.py, ff14_strategy_metrics.py, numpy (optional)
+"""
+from typing import Iterable, List, Optional
+
+from .ff14_strategy import (
+    _DEC_VALUE_TABLE, _ENC_CHAR_TABLE, _B64_VALUE_TABLE, _B64_CHAR_TABLE,
+    _strip_wrapper, _deobfuscate, _obfuscate, _pack_payload, _unpack_payload,
+)
+from .ff14_strategy_metrics import SINKS, stage
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+if HAS_NUMPY:
+    _NP_DEC_VALUE = np.frombuffer(_DEC_VALUE_TABLE, dtype=np.uint8)
+    _NP_ENC_CHAR = np.frombuffer(_ENC_CHAR_TABLE, dtype=np.uint8)
+    _NP_B64_VALUE = np.frombuffer(_B64_VALUE_TABLE, dtype=np.uint8)
+    _NP_B64_CHAR = np.frombuffer(_B64_CHAR_TABLE, dtype=np.uint8)
+
+
+def _pad_rows(rows: list, fill: bytes):
+    """Pack byte strings into a (len(rows), width) uint8 array."""
+    width = max(len(r) for r in rows)
+    buf = b''.join(r.ljust(width, fill) for r in rows)
+    return np.frombuffer(buf, dtype=np.uint8).reshape(len(rows), width), width
+
+
+# ============================================================================
+# Obfuscation Layer
+# ============================================================================
+
+# Each step is one small function shared by the plain and the instrumented
+# paths, like the per-code stages in ff14_strategy.py.
+
+def _code_value_rows(codes: List[str]):
+    """Strip wrappers and apply DEC substitution: (content lengths, value array)."""
+    texts = [_strip_wrapper(c).encode('latin-1', 'replace') for c in codes]
+    arr, _ = _pad_rows(texts, b'\x00')
+    return [len(t) for t in texts], _NP_DEC_VALUE[arr]
+
+
+def _unshift_rows(lengths: List[int], values) -> List[Optional[bytes]]:
+    """First column is the seed; undo the index shift and map to Base64 text."""
+    width = values.shape[1]
+    if width == 0:
+        return [None] * len(lengths)
+    seeds = values[:, :1]
+    index = (np.arange(width - 1) & 0x3f).astype(np.uint8)
+    chars = _NP_B64_CHAR[(values[:, 1:] - index - seeds) & 0x3f]
+
+    buf = chars.tobytes()
+    stride = width - 1
+    return [
+        buf[r * stride: r * stride + n - 1] if n else None
+        for r, n in enumerate(lengths)
+    ]
+
+
+def _shift_rows(b64s: List[bytes], seed: int):
+    """(val + index + seed) & 0x3f over every row's Base64 values."""
+    arr, width = _pad_rows(b64s, b'A')
+    index = ((np.arange(width) + seed) & 0x3f).astype(np.uint8)
+    return (_NP_B64_VALUE[arr] + index) & 0x3f
+
+
+def _wrap_rows(b64s: List[bytes], shifted, seed: int) -> List[str]:
+    """ENC substitution, seed char and wrapper per row."""
+    width = shifted.shape[1]
+    buf = _NP_ENC_CHAR[shifted].tobytes()
+    prefix = f"[stgy:a{chr(_ENC_CHAR_TABLE[seed])}"
+    return [
+        f"{prefix}{buf[r * width: r * width + len(b)].decode('ascii')}]"
+        for r, b in enumerate(b64s)
+    ]
+
+
+def deobfuscate_rows(codes: List[str]) -> List[Optional[bytes]]:
+    """
+    Undo wrapper, substitution and index shift for many codes at once.
+
+    Returns:
+        Base64 text per code, or None for codes with no content
+        (decode_strategy raises on those)
+    """
+    if not codes:
+        return []
+
+    if not HAS_NUMPY:
+        return [_deobfuscate(c) if _strip_wrapper(c) else None for c in codes]
+
+    if SINKS:
+        return _deobfuscate_rows_instrumented(codes)
+    return _unshift_rows(*_code_value_rows(codes))
+
+
+def obfuscate_rows(b64s: List[bytes], seed: int = 10) -> List[str]:
+    """Apply index shift, substitution and wrapper to many Base64 texts."""
+    if not b64s:
+        return []
+
+    if not HAS_NUMPY:
+        return [_obfuscate(b, seed) for b in b64s]
+
+    seed &= 0x3f
+    if SINKS:
+        return _obfuscate_rows_instrumented(b64s, seed)
+    return _wrap_rows(b64s, _shift_rows(b64s, seed), seed)
+
+
+# The steps above, each timed once per batch (one event covers every row).
+# Only used while a metrics sink is registered (see ff14_strategy_metrics).
+
+def _deobfuscate_rows_instrumented(codes: List[str]) -> List[Optional[bytes]]:
+    with stage('decode.substitution', sum(len(c) for c in codes)) as s:
+        lengths, values = _code_value_rows(codes)
+        s.bytes_out = sum(lengths)
+    with stage('decode.deobfuscation', s.bytes_out) as s:
+        texts = _unshift_rows(lengths, values)
+        s.bytes_out = sum(len(t) for t in texts if t)
+    return texts
+
+
+def _obfuscate_rows_instrumented(b64s: List[bytes], seed: int) -> List[str]:
+    with stage('encode.obfuscation', sum(len(b) for b in b64s)) as s:
+        shifted = _shift_rows(b64s, seed)
+        s.bytes_out = s.bytes_in
+    with stage('encode.substitution', s.bytes_out) as s:
+        codes = _wrap_rows(b64s, shifted, seed)
+        s.bytes_out = sum(len(c) for c in codes)
+    return codes
+
+
+# ============================================================================
+# Bulk Codec
+# ============================================================================
+
+def decode_strategies(codes: Iterable[str]) -> List[bytes]:
+    """
+    Decode a batch of strategy codes.
+
+    Equivalent to [decode_strategy(c) for c in codes]; raises on the first
+    invalid code.
+    """
+    codes = list(codes)
+    results = []
+    for code, b64 in zip(codes, deobfuscate_rows(codes)):
+        if b64 is None:
+            b64 = _deobfuscate(code)
+        results.append(_unpack_payload(b64))
+    return results
+
+
+def encode_strategies(binaries: Iterable[bytes], seed: int = 10) -> List[str]:
+    """
+    Encode a batch of strategy binaries.
+
+    Equivalent to [encode_strategy(b, seed) for b in binaries].
+    """
+    return obfuscate_rows([_pack_payload(b) for b in binaries], seed)
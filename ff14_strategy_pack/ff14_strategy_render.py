@@ -0,0 +1,472 @@
+"""
+FF14 Strategy Thumbnail Renderer
+
+Headless CPU renderer that turns strategy boards into PNG thumbnails for
+dashboards, without the web app. Shapes follow the web importer
+(web/src/file/gameTypeMapping.ts) and docs/OBJECT_TYPES.md:
+
+- circle-like AOEs and markers: radius = SIZE x 2.47 px
+- fan: SIZE radius, PARAM_A arc clockwise from ANGLE; the stored position
+  is the center of the fan's bounding box for arcs under 270 degrees
+- donut: SIZE radius, PARAM_A arc, inner radius = SIZE x PARAM_B / 100 px
+- line AOE / general marker / line stack: PARAM_A x PARAM_B rectangle
+  rotated by ANGLE
+- line (tether): center +/- the PARAM_A/B end point (x10), PARAM_C thick
+- job and role icons from assets/icons, SIZE / 4 px wide
+- other objects: a dot of the same footprint in the object's color
+
+Area shapes are drawn first, then icons, each in object order. TRANS
+alpha (0 = opaque .. 100) scales opacity; area fills are half-transparent.
+
+PNG files are read and written with zlib directly (no Pillow). Icons are
+decoded once per process and kept pre-scaled in an atlas keyed by
+(type, pixel size). Batches are rendered on a process pool through the
+batch scheduler.
+
+Usage:
+    python -m ff14_strategy_pack.ff14_strategy_render codes.txt thumbs/ --scale 0.5
+
+Dependencies: ff14_strategy_board.py, ff14_strategy_batch.py,
+              ff14_strategy_types.py (shapes, icon names), numpy
+"""
+import argparse
+import math
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .ff14_strategy_batch import BatchResult, _check_options, _run
+from .ff14_strategy_board import (
+    BLOCK_ANGLE, BLOCK_COORD, BLOCK_PARAM_A, BLOCK_PARAM_B, BLOCK_PARAM_C,
+    BLOCK_SIZE, BLOCK_TRANS, StrategyBoard,
+)
+from .ff14_strategy_types import (
+    FLAG_ICON, ICONS, SHAPE_CIRCLE, SHAPE_RECT, TYPE_IDS, find_type_id, ids_where,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+ICON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'icons')
+
+BOARD_WIDTH = 512
+BOARD_HEIGHT = 384
+DEFAULT_SCALE = 0.5
+BACKGROUND = (40, 42, 48)
+
+SIZE_TO_PX = 2.47        # area radius per SIZE unit
+ICON_PX_PER_SIZE = 0.25  # icon width per SIZE unit (size 100 = 25 px)
+AREA_OPACITY = 0.5
+
+CIRCLE_TYPES = frozenset(ids_where(shape=SHAPE_CIRCLE))
+FAN_TYPE = TYPE_IDS['fan_aoe']
+DONUT_TYPE = TYPE_IDS['donut_aoe']
+RECT_TYPES = frozenset(ids_where(shape=SHAPE_RECT))
+LINE_TYPE = TYPE_IDS['line']
+TEXT_TYPE = TYPE_IDS['text']
+
+# Numbered/sub-role markers reuse the generic role icon
+ICON_FALLBACK = {i: ICONS[i] for i in ids_where(flags=FLAG_ICON) if ICONS[i] != i}
+
+
+Source = Union[str, bytes, StrategyBoard]
+
+
+def _require_numpy():
+    if not HAS_NUMPY:
+        raise ImportError("ff14_strategy_render requires NumPy")
+
+
+# ============================================================================
+# PNG Codec
+# ============================================================================
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def read_png(path: str):
+    """Decode an 8-bit RGB/RGBA non-interlaced PNG into an (h, w, 4) uint8 array."""
+    _require_numpy()
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:8] != _PNG_SIGNATURE:
+        raise ValueError(f"{path}: not a PNG file")
+
+    pos = 8
+    idat = []
+    width = height = color_type = None
+    while pos < len(data):
+        length, kind = struct.unpack_from('>I4s', data, pos)
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b'IHDR':
+            width, height, depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', body)
+            if depth != 8 or color_type not in (2, 6) or interlace:
+                raise ValueError(f"{path}: only 8-bit RGB/RGBA non-interlaced PNGs are supported")
+        elif kind == b'IDAT':
+            idat.append(body)
+        elif kind == b'IEND':
+            break
+
+    channels = 4 if color_type == 6 else 3
+    stride = width * channels
+    raw = zlib.decompress(b''.join(idat))
+    out = bytearray(height * stride)
+    prev = bytearray(stride)
+    for y in range(height):
+        ftype = raw[y * (stride + 1)]
+        row = bytearray(raw[y * (stride + 1) + 1:(y + 1) * (stride + 1)])
+        if ftype == 1:
+            for i in range(channels, stride):
+                row[i] = (row[i] + row[i - channels]) & 0xff
+        elif ftype == 2:
+            for i in range(stride):
+                row[i] = (row[i] + prev[i]) & 0xff
+        elif ftype == 3:
+            for i in range(stride):
+                left = row[i - channels] if i >= channels else 0
+                row[i] = (row[i] + ((left + prev[i]) >> 1)) & 0xff
+        elif ftype == 4:
+            for i in range(stride):
+                left = row[i - channels] if i >= channels else 0
+                upleft = prev[i - channels] if i >= channels else 0
+                row[i] = (row[i] + _paeth(left, prev[i], upleft)) & 0xff
+        out[y * stride:(y + 1) * stride] = row
+        prev = row
+
+    img = np.frombuffer(bytes(out), dtype=np.uint8).reshape(height, width, channels)
+    if channels == 3:
+        img = np.concatenate([img, np.full((height, width, 1), 255, np.uint8)], axis=2)
+    return img
+
+
+def _chunk(kind: bytes, body: bytes) -> bytes:
+    return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+
+def encode_png(rgb, level: int = 6) -> bytes:
+    """Encode an (h, w, 3) uint8 array as an RGB PNG."""
+    height, width = rgb.shape[:2]
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)  # filter type 0 per row
+    rows[:, 1:] = rgb.reshape(height, width * 3)
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (_PNG_SIGNATURE + _chunk(b'IHDR', ihdr)
+            + _chunk(b'IDAT', zlib.compress(rows.tobytes(), level)) + _chunk(b'IEND', b''))
+
+
+# ============================================================================
+# Icon Atlas
+# ============================================================================
+
+def _icon_type_id(filename: str) -> Optional[int]:
+    """Type ID for an icon file name ("DarkKnight.png" -> Dark Knight, "TankRole.png" -> Tank)."""
+    name = re.sub(r'(?<=[a-z])(?=[A-Z])', '_', os.path.splitext(filename)[0]).upper()
+    if name.endswith('ROLE'):
+        name = name[:-4].rstrip('_')
+    return find_type_id(name)
+
+
+@lru_cache(maxsize=1)
+def _icon_sources() -> Dict[int, object]:
+    """Full-size premultiplied float32 RGBA icons by type ID (decoded once per process)."""
+    icons = {}
+    for root, _, files in os.walk(ICON_DIR):
+        for filename in files:
+            type_id = _icon_type_id(filename) if filename.lower().endswith('.png') else None
+            if type_id is None:
+                continue
+            img = read_png(os.path.join(root, filename)).astype(np.float32) / 255.0
+            img[..., :3] *= img[..., 3:]
+            icons[type_id] = img
+    return icons
+
+
+def _resize(img, px: int):
+    """Box-filter downscale (nearest-neighbour upscale) of a square premultiplied icon."""
+    src = img.shape[0]
+    if px >= src:
+        idx = np.clip(((np.arange(px) + 0.5) * src / px).astype(np.int64), 0, src - 1)
+        return img[idx][:, idx]
+    edges = (np.arange(px + 1) * src / px).astype(np.int64)
+    rows = np.add.reduceat(img, edges[:-1], axis=0) / np.diff(edges)[:, None, None]
+    return np.add.reduceat(rows, edges[:-1], axis=1) / np.diff(edges)[None, :, None]
+
+
+@lru_cache(maxsize=1024)
+def atlas_icon(type_id: int, px: int):
+    """Pre-scaled premultiplied RGBA icon for a type, or None if there is no icon."""
+    sources = _icon_sources()
+    img = sources.get(type_id)
+    if img is None:
+        img = sources.get(ICON_FALLBACK.get(type_id))
+    if img is None or px < 1:
+        return None
+    return _resize(img, px)
+
+
+# ============================================================================
+# Rasterizer
+# ============================================================================
+
+class _Canvas:
+    def __init__(self, scale: float):
+        self.scale = scale
+        self.width = max(1, round(BOARD_WIDTH * scale))
+        self.height = max(1, round(BOARD_HEIGHT * scale))
+        self.rgb = np.empty((self.height, self.width, 3), dtype=np.float32)
+        self.rgb[:] = np.array(BACKGROUND, dtype=np.float32) / 255.0
+
+    def region(self, cx: float, cy: float, reach: float):
+        """Pixel-center grids (dx, dy) relative to (cx, cy) and the slice they cover."""
+        x0 = max(int(math.floor(cx - reach)), 0)
+        x1 = min(int(math.ceil(cx + reach)) + 1, self.width)
+        y0 = max(int(math.floor(cy - reach)), 0)
+        y1 = min(int(math.ceil(cy + reach)) + 1, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        dx = (np.arange(x0, x1, dtype=np.float32) + 0.5 - cx)[None, :]
+        dy = (np.arange(y0, y1, dtype=np.float32) + 0.5 - cy)[:, None]
+        return dx, dy, (slice(y0, y1), slice(x0, x1))
+
+    def fill(self, window, coverage, color, opacity: float):
+        a = (coverage * opacity)[..., None]
+        view = self.rgb[window]
+        view += (np.asarray(color, dtype=np.float32) / 255.0 - view) * a
+
+    def blit(self, icon, cx: float, cy: float, opacity: float):
+        px = icon.shape[0]
+        x0 = int(round(cx - px / 2))
+        y0 = int(round(cy - px / 2))
+        sx0, sy0 = max(0, -x0), max(0, -y0)
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1 = min(x0 + px - sx0, self.width)
+        y1 = min(y0 + px - sy0, self.height)
+        if x1 <= x0 or y1 <= y0:
+            return
+        src = icon[sy0:sy0 + (y1 - y0), sx0:sx0 + (x1 - x0)] * opacity
+        view = self.rgb[y0:y1, x0:x1]
+        view *= 1.0 - src[..., 3:]
+        view += src[..., :3]
+
+
+def _arc_mask(dx, dy, start: float, arc: float):
+    """Pixels whose direction lies within [start, start + arc] (0 = north, clockwise)."""
+    if arc >= 360:
+        return 1.0
+    phi = np.degrees(np.arctan2(dx, -dy))
+    return ((phi - start) % 360.0 <= arc).astype(np.float32)
+
+
+def _sector_bbox_center(start: float, arc: float) -> Tuple[float, float]:
+    """Center of a unit sector's bounding box relative to its apex (screen axes)."""
+    angles = [start, start + arc] + [a for a in (0, 90, 180, 270, 360, 450, 540, 630)
+                                     if start < a < start + arc]
+    xs = [0.0] + [math.sin(math.radians(a)) for a in angles]
+    ys = [0.0] + [-math.cos(math.radians(a)) for a in angles]
+    return (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+
+
+def _draw_area(canvas: _Canvas, type_id: int, x: float, y: float, angle: float, size: int,
+               pa: int, pb: int, pc: int, color, opacity: float) -> bool:
+    s = canvas.scale
+    cx, cy = x * s, y * s
+
+    if type_id in CIRCLE_TYPES or type_id in (FAN_TYPE, DONUT_TYPE):
+        radius = size * SIZE_TO_PX * s
+        if type_id == FAN_TYPE:
+            arc = float(pa or 90)
+        elif type_id == DONUT_TYPE:
+            arc = float(pa or 360)
+        else:
+            arc = 360.0
+        if type_id == FAN_TYPE and arc < 270:
+            ox, oy = _sector_bbox_center(angle, arc)
+            cx, cy = cx - ox * radius, cy - oy * radius
+        reg = canvas.region(cx, cy, radius + 1)
+        if reg is None:
+            return True
+        dx, dy, window = reg
+        dist = np.sqrt(dx * dx + dy * dy)
+        cover = np.clip(radius - dist + 0.5, 0.0, 1.0)
+        if type_id == DONUT_TYPE:
+            inner = size * min(pb, 100) / 100.0 * s
+            cover = cover * np.clip(dist - inner + 0.5, 0.0, 1.0)
+        cover = cover * _arc_mask(dx, dy, angle, arc)
+        canvas.fill(window, cover, color, opacity * AREA_OPACITY)
+        return True
+
+    if type_id in RECT_TYPES:
+        w, h = (pa or 10) * s, (pb or 10) * s
+        reg = canvas.region(cx, cy, math.hypot(w, h) / 2 + 1)
+        if reg is None:
+            return True
+        dx, dy, window = reg
+        r = math.radians(angle)
+        u = dx * math.cos(r) + dy * math.sin(r)
+        v = -dx * math.sin(r) + dy * math.cos(r)
+        cover = (np.clip(w / 2 - np.abs(u) + 0.5, 0.0, 1.0)
+                 * np.clip(h / 2 - np.abs(v) + 0.5, 0.0, 1.0))
+        canvas.fill(window, cover, color, opacity * AREA_OPACITY)
+        return True
+
+    if type_id == LINE_TYPE:
+        ex, ey = pa / 10.0 * s, pb / 10.0 * s
+        sx, sy = 2 * cx - ex, 2 * cy - ey
+        half = (pc or 6) * s / 2
+        reg = canvas.region(cx, cy, math.hypot(ex - cx, ey - cy) + half + 1)
+        if reg is None:
+            return True
+        dx, dy, window = reg
+        px, py = dx + cx - sx, dy + cy - sy
+        vx, vy = ex - sx, ey - sy
+        length2 = vx * vx + vy * vy or 1.0
+        t = np.clip((px * vx + py * vy) / length2, 0.0, 1.0)
+        dist = np.hypot(px - t * vx, py - t * vy)
+        canvas.fill(window, np.clip(half - dist + 0.5, 0.0, 1.0), color, opacity)
+        return True
+
+    return False
+
+
+def render_board(board: StrategyBoard, scale: float = DEFAULT_SCALE):
+    """Rasterize a parsed board into an (h, w, 3) uint8 array."""
+    _require_numpy()
+    canvas = _Canvas(scale)
+    n = board.count
+
+    def column(block_id, getter, default):
+        values = getter() if block_id in board.blocks else []
+        return list(values) + [default] * (n - len(values))
+
+    coords = column(BLOCK_COORD, board.coords, (0.0, 0.0))
+    angles = column(BLOCK_ANGLE, board.angles, 0)
+    sizes = column(BLOCK_SIZE, board.sizes, 100)
+    colors = column(BLOCK_TRANS, board.colors, (255, 255, 255))
+    alphas = column(BLOCK_TRANS, board.alphas, 0)
+    pa = column(BLOCK_PARAM_A, lambda: board.params(BLOCK_PARAM_A), 0)
+    pb = column(BLOCK_PARAM_B, lambda: board.params(BLOCK_PARAM_B), 0)
+    pc = column(BLOCK_PARAM_C, lambda: board.params(BLOCK_PARAM_C), 0)
+
+    points = []
+    for i, type_id in enumerate(board.type_ids):
+        if type_id == TEXT_TYPE:
+            continue
+        x, y = coords[i]
+        opacity = max(0.0, 1.0 - min(alphas[i], 100) / 100.0)
+        if not _draw_area(canvas, type_id, x, y, angles[i], sizes[i],
+                          pa[i], pb[i], pc[i], colors[i], opacity):
+            points.append((type_id, x * scale, y * scale, sizes[i], colors[i], opacity))
+
+    for type_id, cx, cy, size, color, opacity in points:
+        px = max(1, round(size * ICON_PX_PER_SIZE * scale))
+        icon = atlas_icon(type_id, px)
+        if icon is not None:
+            canvas.blit(icon, cx, cy, opacity)
+            continue
+        reg = canvas.region(cx, cy, px / 2 + 1)
+        if reg is not None:
+            dx, dy, window = reg
+            cover = np.clip(px / 2 - np.sqrt(dx * dx + dy * dy) + 0.5, 0.0, 1.0)
+            canvas.fill(window, cover, color, opacity)
+
+    return (np.clip(canvas.rgb, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+
+def _as_board(source: Source) -> StrategyBoard:
+    if isinstance(source, StrategyBoard):
+        return source
+    if isinstance(source, str):
+        return StrategyBoard.from_code(source)
+    return StrategyBoard(source)
+
+
+def render_png(source: Source, scale: float = DEFAULT_SCALE, level: int = 6) -> bytes:
+    """PNG thumbnail for a code, binary or parsed board."""
+    return encode_png(render_board(_as_board(source), scale), level)
+
+
+# ============================================================================
+# Batches
+# ============================================================================
+
+def _render_chunk(start: int, sources: list, scale: float, level: int) -> list:
+    results = []
+    for i, source in enumerate(sources, start):
+        try:
+            results.append(BatchResult(i, render_png(source, scale, level)))
+        except Exception as e:
+            results.append(BatchResult(i, error=e))
+    return results
+
+
+def render_many(
+    sources: Iterable[Source],
+    scale: float = DEFAULT_SCALE,
+    mode: str = 'process',
+    workers: int = None,
+    chunk_size: int = 32,
+    level: int = 6,
+) -> Iterator[BatchResult]:
+    """
+    Render many boards to PNG bytes, in input order.
+
+    Rendering is CPU-bound Python/NumPy, so the default is a process pool;
+    each worker builds its icon atlas once.
+    """
+    _require_numpy()
+    _check_options(mode, chunk_size)
+    return _run(_render_chunk, sources, (scale, level), mode, workers, chunk_size)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv=None) -> int:
+    from .ff14_strategy_scan import scan_codes
+
+    parser = argparse.ArgumentParser(description="Render strategy codes found in text files to PNG thumbnails.")
+    parser.add_argument('source', help="Text file containing strategy codes")
+    parser.add_argument('outdir', help="Directory for <n>.png thumbnails")
+    parser.add_argument('--scale', type=float, default=DEFAULT_SCALE)
+    parser.add_argument('--mode', default='process', choices=('serial', 'thread', 'process'))
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.outdir, exist_ok=True)
+    codes = (code for _, code in scan_codes(args.source))
+    start = time.perf_counter()
+    ok = failed = 0
+    for result in render_many(codes, args.scale, args.mode, args.workers):
+        if result.ok:
+            with open(os.path.join(args.outdir, f'{result.index}.png'), 'wb') as f:
+                f.write(result.value)
+            ok += 1
+        else:
+            print(f"{result.index}\tERR\t{result.error}", file=sys.stderr)
+            failed += 1
+    elapsed = time.perf_counter() - start
+    print(f"{ok} rendered, {failed} failed in {elapsed:.2f}s "
+          f"({ok / elapsed if elapsed else 0:.0f} boards/s)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+FF14 Strategy Code Scanner
+
+Streams "[stgy:a...]" codes out of large text dumps (chat logs, exports)
+without loading the whole file. Input is read through fixed-size buffers
+or mmap; codes split across buffer boundaries are carried over to the
+next read.
+
+Scanning is lazy and feeds straight into decode_many, so extraction in
+the calling thread overlaps with decoding in the worker pool.
+
+Input is scanned as bytes, so any ASCII-compatible encoding (UTF-8,
+Latin-1, ...) works.
+
+Usage:
+    python -m ff14_strategy_pack.ff14_strategy_scan chat.log --mmap
+
+Dependencies: ff14_strategy.py, ff14_strategy_batch.py
+"""
+import argparse
+import mmap
+import os
+import re
+import sys
+import time
+from collections import deque
+from typing import BinaryIO, Iterator, Tuple, Union
+
+from .ff14_strategy import _CODE_ALPHABET
+from .ff14_strategy_batch import DEFAULT_CHUNK_SIZE, decode_many
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+# Longest code worth carrying across buffers: a uint16 binary compresses to
+# well under 64 KiB, which is ~88K Base64 chars.
+MAX_CODE_LENGTH = 128 * 1024
+
+CODE_PATTERN = re.compile(
+    rb'\[stgy:a[' + re.escape(_CODE_ALPHABET) + rb']+\]'
+)
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+
+# ============================================================================
+# Extraction
+# ============================================================================
+
+def scan_stream(stream: BinaryIO, buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (offset, code) for every strategy code in a binary stream.
+
+    Offsets are absolute byte positions of the leading '['.
+    """
+    carry = b''
+    base = 0  # stream offset of carry[0]
+    while True:
+        chunk = stream.read(buffer_size)
+        if not chunk:
+            break
+        buf = carry + chunk
+
+        end = 0
+        for m in CODE_PATTERN.finditer(buf):
+            yield base + m.start(), m.group().decode('ascii')
+            end = m.end()
+
+        # Keep a possibly incomplete code at the tail for the next read
+        tail = buf.rfind(b'[', end)
+        if tail == -1 or len(buf) - tail > MAX_CODE_LENGTH:
+            tail = len(buf)
+        carry = buf[tail:]
+        base += tail
+
+
+def scan_mmap(path: Union[str, os.PathLike]) -> Iterator[Tuple[int, str]]:
+    """Yield (offset, code) for every strategy code in a file via mmap."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for m in CODE_PATTERN.finditer(mm):
+                yield m.start(), m.group().decode('ascii')
+
+
+def scan_codes(
+    source: Source,
+    use_mmap: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (offset, code) for every strategy code in a file or stream.
+
+    Args:
+        source: File path or binary file object
+        use_mmap: Map the file instead of reading buffers (paths only)
+        buffer_size: Read size for buffered scanning
+    """
+    if hasattr(source, 'read'):
+        yield from scan_stream(source, buffer_size)
+    elif use_mmap:
+        yield from scan_mmap(source)
+    else:
+        with open(source, 'rb') as f:
+            yield from scan_stream(f, buffer_size)
+
+
+# ============================================================================
+# Extraction + Decoding
+# ============================================================================
+
+def scan_and_decode(
+    source: Source,
+    use_mmap: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    mode: str = 'auto',
+    workers: int = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    verify_only: bool = False,
+) -> Iterator[tuple]:
+    """
+    Yield (offset, code, decoded_bytes | error) for every code in a source.
+
+    Codes are handed to decode_many as they are found, so scanning and
+    decoding overlap. With verify_only=True the third item is a
+    ValidationResult instead of the decoded binary.
+    """
+    offsets = deque()
+    codes = deque()
+
+    def feed():
+        for offset, code in scan_codes(source, use_mmap, buffer_size):
+            offsets.append(offset)
+            codes.append(code)
+            yield code
+
+    for result in decode_many(feed(), mode=mode, workers=workers,
+                              chunk_size=chunk_size, verify_only=verify_only):
+        yield (offsets.popleft(), codes.popleft(),
+               result.value if result.ok else result.error)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Extract and decode FF14 strategy codes from text dumps."
+    )
+    parser.add_argument('files', nargs='+', help="Files to scan")
+    parser.add_argument('--mmap', action='store_true', help="Use mmap instead of buffered reads")
+    parser.add_argument('--buffer-size', type=int, default=DEFAULT_BUFFER_SIZE)
+    parser.add_argument('--mode', default='auto', help="auto, serial, thread or process")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--verify-only', action='store_true', help="Validate without decompressing")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Only print the summary")
+    args = parser.parse_args(argv)
+
+    total_bytes = 0
+    found = 0
+    failed = 0
+    start = time.perf_counter()
+
+    for path in args.files:
+        total_bytes += os.path.getsize(path)
+        for offset, code, value in scan_and_decode(
+            path, args.mmap, args.buffer_size, args.mode,
+            args.workers, args.chunk_size, args.verify_only,
+        ):
+            found += 1
+            if isinstance(value, Exception):
+                ok, detail = False, f"{type(value).__name__}: {value}"
+            elif args.verify_only:
+                ok, detail = value.ok, value.status
+            else:
+                ok, detail = True, f"{len(value)} bytes"
+            failed += not ok
+            if not args.quiet:
+                print(f"{path}:{offset}\t{'OK ' if ok else 'ERR'}\t{detail}\t{code}")
+
+    elapsed = time.perf_counter() - start
+    mb = total_bytes / (1024 * 1024)
+    rate = mb / elapsed if elapsed > 0 else float('inf')
+    print(
+        f"Scanned {mb:.2f} MB in {elapsed:.3f}s ({rate:.1f} MB/s): "
+        f"{found} codes, {failed} failed",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
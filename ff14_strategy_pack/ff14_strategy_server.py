@@ -0,0 +1,467 @@
+"""
+FF14 Strategy HTTP Service
+
+Standalone asyncio HTTP/1.1 service over the library (stdlib only), so
+bots, dashboards and overlays share one warm process instead of each
+importing the codec.
+
+Endpoints (POST, JSON body unless noted):
+
+    /decode    {"code": str}                      -> {"data": base64, "size", "title", "count"}
+    /validate  {"code": str}                      -> {"ok", "status", "detail", "length"}
+    /encode    {"data": base64, "seed"?: int}     -> {"code": str}
+    /generate  {"title": str, "objects": [[type, x, y, color?], ...]} -> {"code": str}
+    /render    {"code": str, "format"?: "png"|"svg", "scale"?: float}  -> image/png or image/svg+xml
+    GET /stats    latency count/p50/p99 per endpoint, batch sizes, caches (JSON)
+    GET /metrics  the same latencies in Prometheus text format
+    GET /health   {"ok": true}
+
+Concurrent decode, validate and encode requests are coalesced by a
+MicroBatcher: the first request of a batch waits up to max_delay for
+others to arrive, then the whole batch runs once through the batch codec
+(ff14_strategy_batch) in a worker thread. Bodies over max_payload bytes
+are rejected with 413 before they are read.
+
+Usage:
+    python -m ff14_strategy_pack.ff14_strategy_server --port 8765
+
+    # or embedded (port=0 picks a free port, handy for tests)
+    server = StrategyServer(port=0)
+    await server.start()
+    print(server.port)
+
+Dependencies: ff14_strategy.py, ff14_strategy_batch.py, strategy_generator.py,
+              ff14_strategy_metrics.py, ff14_strategy_render.py (PNG, needs numpy),
+              ff14_strategy_svg.py
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .ff14_strategy_batch import decode_many, encode_many
+from .ff14_strategy_board import try_parse_board
+from .ff14_strategy_cache import cache_stats
+from .ff14_strategy_metrics import HistogramSink, StageEvent, error_category
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_PAYLOAD = 64 * 1024
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_DELAY = 0.002  # seconds the first request of a batch waits for company
+
+_MAX_HEADER_BYTES = 16 * 1024
+_KEEPALIVE_TIMEOUT = 30.0
+
+# Finer than the codec defaults: ~1.25x steps from 50 us to 10 s
+LATENCY_BUCKETS = tuple(round(50e-6 * 1.25 ** i, 9) for i in range(56))
+
+_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 422: 'Unprocessable Entity',
+    500: 'Internal Server Error', 501: 'Not Implemented',
+}
+
+
+class HTTPError(Exception):
+    """Error returned to the client as {"error": message} with status."""
+
+    def __init__(self, status: int, message: str, category: str = None):
+        super().__init__(message)
+        self.status = status
+        self.category = category
+
+
+# ============================================================================
+# Micro-batching
+# ============================================================================
+
+class MicroBatcher:
+    """
+    Coalesce concurrent submit() calls into one run_batch(items) call.
+
+    run_batch runs in executor and returns one BatchResult per item, in
+    order; each caller gets its own value or exception.
+    """
+
+    def __init__(self, run_batch: Callable[[list], list], executor,
+                 max_batch: int = DEFAULT_MAX_BATCH, max_delay: float = DEFAULT_MAX_DELAY):
+        self.run_batch = run_batch
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: List[Tuple[object, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((item, future))
+        if len(self._queue) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._queue = self._queue, []
+        if batch:
+            self.batches += 1
+            self.items += len(batch)
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.run_batch,
+                                                 [item for item, _ in batch])
+        except Exception as e:
+            results = None
+            error = e
+        for i, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if results is None:
+                future.set_exception(error)
+            elif results[i].ok:
+                future.set_result(results[i].value)
+            else:
+                future.set_exception(results[i].error)
+
+    @property
+    def mean_batch(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+
+def _decode_batch(codes: list) -> list:
+    return list(decode_many(codes, mode='serial', chunk_size=len(codes)))
+
+
+def _validate_batch(codes: list) -> list:
+    return list(decode_many(codes, mode='serial', chunk_size=len(codes), verify_only=True))
+
+
+def _encode_batch(items: list) -> list:
+    """items are (binary, seed); encode_many takes one seed, so group by it."""
+    results = [None] * len(items)
+    by_seed: Dict[int, List[int]] = {}
+    for i, (_, seed) in enumerate(items):
+        by_seed.setdefault(seed, []).append(i)
+    for seed, indexes in by_seed.items():
+        binaries = [items[i][0] for i in indexes]
+        for i, result in zip(indexes, encode_many(binaries, seed, mode='serial',
+                                                  chunk_size=len(binaries))):
+            results[i] = result
+    return results
+
+
+# ============================================================================
+# Request Handling
+# ============================================================================
+
+def _field(body: dict, name: str, kind, default=None):
+    value = body.get(name, default)
+    if value is None:
+        raise HTTPError(400, f"Missing field {name!r}")
+    # JSON true/false are ints to isinstance; no field here takes a bool
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise HTTPError(400, f"Field {name!r} has the wrong type")
+    return value
+
+
+def _generate(title: str, objects: list) -> str:
+    from .strategy_generator import generate_strategy
+    rows = []
+    for obj in objects:
+        if not isinstance(obj, list) or len(obj) not in (3, 4):
+            raise ValueError(f"Invalid object {obj!r}, expected [type, x, y, color?]")
+        if len(obj) == 4 and isinstance(obj[3], list):
+            obj = obj[:3] + [tuple(obj[3])]
+        rows.append(tuple(obj))
+    return generate_strategy(title, rows)
+
+
+def _render(code: str, fmt: str, scale: float) -> bytes:
+    if fmt == 'svg':
+        from .ff14_strategy_svg import iter_svg
+        return ''.join(iter_svg(code, scale)).encode('utf-8')
+    from .ff14_strategy_render import HAS_NUMPY, render_png
+    if not HAS_NUMPY:
+        raise HTTPError(501, "PNG rendering requires NumPy")
+    return render_png(code, scale)
+
+
+class StrategyServer:
+    """
+    The HTTP service. start() binds; serve_forever() runs until cancelled.
+
+    Args:
+        host, port: Bind address (port=0 picks a free port, see .port)
+        max_payload: Largest accepted request body in bytes
+        max_batch: Most requests coalesced into one batch codec call
+        max_delay: Seconds a batch waits for more requests
+        workers: Threads for batches and rendering
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_payload: int = DEFAULT_MAX_PAYLOAD, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_delay: float = DEFAULT_MAX_DELAY, workers: int = 4):
+        self.host = host
+        self.port = port
+        self.max_payload = max_payload
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stgy')
+        self.batchers = {
+            'decode': MicroBatcher(_decode_batch, self.executor, max_batch, max_delay),
+            'validate': MicroBatcher(_validate_batch, self.executor, max_batch, max_delay),
+            'encode': MicroBatcher(_encode_batch, self.executor, max_batch, max_delay),
+        }
+        self.latency = HistogramSink(LATENCY_BUCKETS)
+        self.routes = {
+            ('POST', '/decode'): self.handle_decode,
+            ('POST', '/validate'): self.handle_validate,
+            ('POST', '/encode'): self.handle_encode,
+            ('POST', '/generate'): self.handle_generate,
+            ('POST', '/render'): self.handle_render,
+            ('GET', '/stats'): self.handle_stats,
+            ('GET', '/metrics'): self.handle_metrics,
+            ('GET', '/health'): self.handle_health,
+        }
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port,
+                                                  limit=_MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    async def handle_decode(self, body: dict):
+        data = await self.batchers['decode'].submit(_field(body, 'code', str))
+        board = try_parse_board(data)
+        return {
+            'data': base64.b64encode(data).decode('ascii'),
+            'size': len(data),
+            'title': board.title if board is not None else None,
+            'count': board.count if board is not None else None,
+        }
+
+    async def handle_validate(self, body: dict):
+        result = await self.batchers['validate'].submit(_field(body, 'code', str))
+        return {'ok': result.ok, 'status': result.status, 'detail': result.detail,
+                'length': result.length}
+
+    async def handle_encode(self, body: dict):
+        try:
+            data = base64.b64decode(_field(body, 'data', str), validate=True)
+        except binascii.Error:
+            raise HTTPError(400, "Field 'data' is not valid Base64")
+        seed = _field(body, 'seed', int, default=10)
+        return {'code': await self.batchers['encode'].submit((data, seed & 0x3f))}
+
+    async def handle_generate(self, body: dict):
+        title = _field(body, 'title', str, default='')
+        objects = _field(body, 'objects', list)
+        loop = asyncio.get_running_loop()
+        return {'code': await loop.run_in_executor(self.executor, _generate, title, objects)}
+
+    async def handle_render(self, body: dict):
+        code = _field(body, 'code', str)
+        fmt = _field(body, 'format', str, default='png')
+        scale = _field(body, 'scale', (int, float), default=0.5)
+        if fmt not in ('png', 'svg'):
+            raise HTTPError(400, f"Unknown format {fmt!r}, expected 'png' or 'svg'")
+        if not 0 < scale <= 4:
+            raise HTTPError(400, "Field 'scale' must be in (0, 4]")
+        loop = asyncio.get_running_loop()
+        image = await loop.run_in_executor(self.executor, _render, code, fmt, float(scale))
+        return ('image/svg+xml' if fmt == 'svg' else 'image/png'), image
+
+    async def handle_stats(self, body):
+        return {
+            'latency': {name: {'count': s.count, 'errors': s.errors, 'mean': s.mean,
+                               'p50': s.p50, 'p99': s.p99}
+                        for name, s in sorted(self.latency.summary().items())},
+            'batches': {name: {'batches': b.batches, 'items': b.items, 'mean_size': b.mean_batch}
+                        for name, b in self.batchers.items()},
+            'caches': {name: s._asdict() for name, s in cache_stats().items()},
+        }
+
+    async def handle_metrics(self, body):
+        return 'text/plain; version=0.0.4', self.latency.prometheus_text(
+            'ff14_strategy_http', 'Request latency by endpoint.').encode()
+
+    async def handle_health(self, body):
+        return {'ok': True}
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """(method, path, headers, body), or None when the client is done."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), _KEEPALIVE_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(400, "Request header too large")
+
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        headers[':version'] = version
+
+        body = b''
+        if method == 'POST':
+            if 'content-length' not in headers:
+                raise HTTPError(411, "Content-Length required")
+            try:
+                length = int(headers['content-length'])
+            except ValueError:
+                raise HTTPError(400, "Invalid Content-Length")
+            if length < 0:
+                raise HTTPError(400, "Invalid Content-Length")
+            if length > self.max_payload:
+                raise HTTPError(413, f"Body of {length} bytes exceeds the {self.max_payload} byte limit")
+            body = await reader.readexactly(length)
+        return method, target.split('?', 1)[0], headers, body
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, str, bytes]:
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(p == path for _, p in self.routes):
+                raise HTTPError(405, f"{method} not allowed on {path}")
+            raise HTTPError(404, f"No endpoint {path}")
+        parsed = None
+        if method == 'POST':
+            try:
+                parsed = json.loads(body or b'{}')
+            except (ValueError, UnicodeDecodeError):
+                raise HTTPError(400, "Body is not valid JSON")
+            if not isinstance(parsed, dict):
+                raise HTTPError(400, "Body must be a JSON object")
+        try:
+            result = await handler(parsed)
+        except HTTPError:
+            raise
+        except (ValueError, KeyError, IndexError, TypeError, binascii.Error) as e:
+            raise HTTPError(422, str(e), error_category(e))
+        except Exception as e:
+            # zlib.error, struct.error, ... from malformed input
+            raise HTTPError(422 if type(e).__module__ in ('zlib', 'struct') else 500,
+                            str(e), error_category(e))
+        if isinstance(result, tuple):
+            return 200, result[0], result[1]
+        return 200, 'application/json', json.dumps(result).encode('utf-8')
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                start = time.perf_counter()
+                keep_alive = True
+                path = None
+                body = b''
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = (connection != 'close' if headers[':version'] == 'HTTP/1.1'
+                                  else connection == 'keep-alive')
+                    status, content_type, payload = await self._dispatch(method, path, body)
+                    error = None
+                except HTTPError as e:
+                    status, content_type = e.status, 'application/json'
+                    payload = json.dumps({'error': str(e), 'category': e.category}).encode('utf-8')
+                    error = e.category or str(status)
+                    if status in (400, 411, 413):
+                        keep_alive = False  # the rest of the stream is unreliable
+
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + payload)
+                await writer.drain()
+                if path in (p for _, p in self.routes):
+                    self.latency.record(StageEvent(path.lstrip('/'), time.perf_counter() - start,
+                                                   len(body), len(payload), error))
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the strategy code library over HTTP.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-payload', type=int, default=DEFAULT_MAX_PAYLOAD)
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument('--max-delay', type=float, default=DEFAULT_MAX_DELAY)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    server = StrategyServer(args.host, args.port, args.max_payload, args.max_batch,
+                            args.max_delay, args.workers)
+
+    async def run():
+        await server.start()
+        print(f"Listening on http://{server.host}:{server.port}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,253 @@
+"""
+FF14 Strategy Similarity Search
+
+Finds near-duplicate boards: the same mechanic with slightly nudged
+markers, a different title, or a swapped job icon. Exact-hash dedup
+(ff14_strategy_corpus) misses these.
+
+Each board becomes a fixed-length float32 feature vector:
+
+    [ type histogram (256 bins) | coarse occupancy grid (8 x 6 cells) ]
+
+Both halves are L2-normalized and weighted, so the cosine similarity of
+two boards blends "same objects" with "same layout". Vectors for a whole
+batch are built at once with NumPy straight from the TYPE and COORD
+columns of the parsed boards.
+
+Usage:
+    from ff14_strategy_similarity import SimilarityIndex
+
+    index = SimilarityIndex()
+    index.add_codes(range(len(codes)), codes)
+    for board_id, score in index.topk(query_code, k=5):
+        ...
+    clusters = index.cluster(threshold=0.95)
+
+Dependencies: ff14_strategy_board.py, ff14_strategy_batch.py, numpy
+"""
+from typing import Hashable, Iterable, List, Sequence, Tuple, Union
+
+from .ff14_strategy_batch import decode_many
+from .ff14_strategy_board import BLOCK_COORD, StrategyBoard, try_parse_board
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+TYPE_BINS = 256
+GRID_COLS = 8
+GRID_ROWS = 6
+BOARD_WIDTH = 512
+BOARD_HEIGHT = 384
+
+FEATURE_SIZE = TYPE_BINS + GRID_COLS * GRID_ROWS
+
+DEFAULT_TYPE_WEIGHT = 0.5
+DEFAULT_THRESHOLD = 0.95
+
+# Tile edge (rows and columns) when comparing a corpus against itself
+_BLOCK_ROWS = 2048
+
+BoardLike = Union[str, bytes, StrategyBoard]
+
+
+def _require_numpy():
+    if not HAS_NUMPY:
+        raise ImportError("ff14_strategy_similarity requires NumPy")
+
+
+def _as_board(item: BoardLike) -> StrategyBoard:
+    if isinstance(item, StrategyBoard):
+        return item
+    if isinstance(item, str):
+        return StrategyBoard.from_code(item)
+    return StrategyBoard(item)
+
+
+def _normalize_rows(m):
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    m /= norms
+    return m
+
+
+# ============================================================================
+# Features
+# ============================================================================
+
+def board_features(boards: Sequence[StrategyBoard], type_weight: float = DEFAULT_TYPE_WEIGHT):
+    """
+    Feature matrix (len(boards), FEATURE_SIZE) for parsed boards.
+
+    All TYPE and COORD values are concatenated into flat arrays first, so
+    the histograms for the whole batch are two bincount calls.
+    """
+    _require_numpy()
+    n = len(boards)
+    counts = np.fromiter((b.count for b in boards), dtype=np.int64, count=n)
+    rows = np.repeat(np.arange(n), counts)
+
+    types = np.fromiter((t for b in boards for t in b.type_ids), dtype=np.int64, count=int(counts.sum()))
+    types = np.minimum(types, TYPE_BINS - 1)
+    hist = np.bincount(rows * TYPE_BINS + types, minlength=n * TYPE_BINS)
+    hist = hist.reshape(n, TYPE_BINS).astype(np.float32)
+
+    # COORD columns read in place (little-endian int16 pairs, x10)
+    coord_parts = []
+    coord_rows = []
+    for r, b in enumerate(boards):
+        block = b.blocks.get(BLOCK_COORD)
+        if block is None or not block.count:
+            continue
+        coord_parts.append(np.frombuffer(b.data, dtype='<i2', count=block.count * 2, offset=block.offset))
+        coord_rows.append(np.full(block.count, r))
+    grid = np.zeros((n, GRID_ROWS * GRID_COLS), dtype=np.float32)
+    if coord_parts:
+        xy = np.concatenate(coord_parts).reshape(-1, 2).astype(np.float32) / 10.0
+        col = np.clip((xy[:, 0] * GRID_COLS / BOARD_WIDTH).astype(np.int64), 0, GRID_COLS - 1)
+        row = np.clip((xy[:, 1] * GRID_ROWS / BOARD_HEIGHT).astype(np.int64), 0, GRID_ROWS - 1)
+        owner = np.concatenate(coord_rows)
+        cells = GRID_ROWS * GRID_COLS
+        grid = np.bincount(owner * cells + row * GRID_COLS + col, minlength=n * cells)
+        grid = grid.reshape(n, cells).astype(np.float32)
+
+    features = np.empty((n, FEATURE_SIZE), dtype=np.float32)
+    features[:, :TYPE_BINS] = _normalize_rows(hist) * type_weight
+    features[:, TYPE_BINS:] = _normalize_rows(grid) * (1.0 - type_weight)
+    return _normalize_rows(features)
+
+
+def similarity(a: BoardLike, b: BoardLike, type_weight: float = DEFAULT_TYPE_WEIGHT) -> float:
+    """Cosine similarity of two boards (1.0 = same objects in the same cells)."""
+    f = board_features([_as_board(a), _as_board(b)], type_weight)
+    return float(f[0] @ f[1])
+
+
+# ============================================================================
+# Index
+# ============================================================================
+
+class SimilarityIndex:
+    """
+    In-memory feature matrix with top-k lookup and clustering.
+
+    Args:
+        type_weight: Share of the type histogram vs the occupancy grid (0-1)
+    """
+
+    def __init__(self, type_weight: float = DEFAULT_TYPE_WEIGHT):
+        _require_numpy()
+        self.type_weight = type_weight
+        self.ids: List[Hashable] = []
+        self._parts = []
+        self._matrix = np.zeros((0, FEATURE_SIZE), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def matrix(self):
+        """(len, FEATURE_SIZE) float32 feature matrix."""
+        if self._parts:
+            self._matrix = np.concatenate([self._matrix] + self._parts)
+            self._parts = []
+        return self._matrix
+
+    def add(self, ids: Iterable[Hashable], boards: Sequence[BoardLike]):
+        """Add boards (parsed boards, binaries or codes) under the given ids."""
+        ids = list(ids)
+        boards = [_as_board(b) for b in boards]
+        if len(ids) != len(boards):
+            raise ValueError(f"Got {len(ids)} ids for {len(boards)} boards")
+        if boards:
+            self._parts.append(board_features(boards, self.type_weight))
+            self.ids.extend(ids)
+
+    def add_codes(self, ids: Iterable[Hashable], codes: Iterable[str], mode: str = 'auto',
+                  workers: int = None) -> int:
+        """
+        Decode codes in bulk and add the ones that parse.
+
+        Returns the number of boards added.
+        """
+        kept_ids = []
+        boards = []
+        for board_id, result in zip(ids, decode_many(codes, mode, workers)):
+            board = try_parse_board(result.value) if result.ok else None
+            if board is not None:
+                kept_ids.append(board_id)
+                boards.append(board)
+        self.add(kept_ids, boards)
+        return len(boards)
+
+    def add_corpus(self, corpus, **options) -> int:
+        """Add every board of a StrategyCorpus under its corpus id."""
+        rows = corpus.conn.execute('SELECT id, code FROM boards ORDER BY id').fetchall()
+        return self.add_codes([r[0] for r in rows], [r[1] for r in rows], **options)
+
+    def topk(self, query: BoardLike, k: int = 10) -> List[Tuple[Hashable, float]]:
+        """The k most similar indexed boards as (id, score), best first."""
+        matrix = self.matrix
+        if not len(matrix):
+            return []
+        q = board_features([_as_board(query)], self.type_weight)[0]
+        scores = matrix @ q
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+    def pairs(self, threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[Hashable, Hashable, float]]:
+        """All (id_a, id_b, score) pairs at or above threshold."""
+        ids = self.ids
+        return [(ids[i], ids[j], s) for i, j, s in self._pairs(threshold)]
+
+    def _pairs(self, threshold: float):
+        # Square tiles over the upper triangle keep peak memory at one
+        # _BLOCK_ROWS x _BLOCK_ROWS score block, whatever the corpus size
+        matrix = self.matrix
+        n = len(matrix)
+        for start in range(0, n, _BLOCK_ROWS):
+            rows = matrix[start:start + _BLOCK_ROWS]
+            hits_i, hits_j, hits_s = [], [], []
+            for col in range(start, n, _BLOCK_ROWS):
+                block = rows @ matrix[col:col + _BLOCK_ROWS].T
+                i, j = np.nonzero(block >= threshold)
+                if col == start:
+                    upper = j > i  # diagonal tile: keep the upper triangle only
+                    i, j = i[upper], j[upper]
+                hits_i.append(i)
+                hits_j.append(j + col)
+                hits_s.append(block[i, j])
+            i, j, scores = np.concatenate(hits_i), np.concatenate(hits_j), np.concatenate(hits_s)
+            order = np.lexsort((j, i))  # row-major, as if the block row were one product
+            for a, b, score in zip(i[order], j[order], scores[order]):
+                yield start + int(a), int(b), float(score)
+
+    def cluster(self, threshold: float = DEFAULT_THRESHOLD) -> List[List[Hashable]]:
+        """
+        Group boards whose similarity chains at or above threshold.
+
+        Returns clusters (largest first), each a list of ids; boards with no
+        near-duplicate form singleton clusters.
+        """
+        parent = list(range(len(self.ids)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for i, j, _ in self._pairs(threshold):
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+        groups = {}
+        for i in range(len(parent)):
+            groups.setdefault(find(i), []).append(self.ids[i])
+        return sorted(groups.values(), key=len, reverse=True)
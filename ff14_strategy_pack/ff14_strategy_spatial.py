@@ -0,0 +1,355 @@
+"""
+FF14 Strategy Spatial Index
+
+Uniform-grid index over object positions across many boards, answering
+geometric queries without touching binaries again:
+
+- radius:   objects within r of a point ("a tank within 30 of (256,192)")
+- box:      objects inside a rectangle
+- overlaps: pairs of objects on the same board whose footprints intersect
+            ("a stack marker overlapping a donut")
+
+Positions come from the COORD block (pixels, 512 x 384 board). Footprints
+follow docs/OBJECT_TYPES.md:
+
+- circle-like AOEs/markers: radius_px = SIZE x 2.47
+- fan: bounded by its outer radius (as a circle)
+- donut: outer radius as above, inner radius = SIZE x PARAM_B / 100
+- line AOE / general marker / line stack: PARAM_A x PARAM_B rectangle,
+  indexed by its bounding circle
+- line (tether): center to PARAM_A/B end point (x10) half-length
+- everything else (icons, waymarks, text): a point
+
+Entries live in flat arrays and each grid cell holds an array of entry
+numbers, so millions of objects stay compact. Boards can be added and
+removed at any time; SpatialIndex.sync() pulls new boards from a
+StrategyCorpus incrementally.
+
+Usage:
+    from ff14_strategy_spatial import SpatialIndex
+
+    index = SpatialIndex()
+    index.sync(corpus)
+    boards = {h.board_id for h in index.radius(256, 192, 30, types={'tank'})}
+    pairs = list(index.overlaps({0x0E}, {0x11}))
+
+Dependencies: ff14_strategy_board.py, ff14_strategy_batch.py,
+              ff14_strategy_types.py (shapes, type names)
+"""
+import math
+import pickle
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .ff14_strategy_batch import decode_many
+from .ff14_strategy_board import (
+    BLOCK_COORD, BLOCK_PARAM_A, BLOCK_PARAM_B, BLOCK_SIZE, StrategyBoard, try_parse_board,
+)
+from .ff14_strategy_types import (
+    SHAPE_CIRCLE, SHAPE_DONUT, SHAPE_FAN, SHAPE_RECT, SHAPE_TETHER, SHAPES, TABLE_SIZE,
+    type_id as resolve_type_id,
+)
+
+BOARD_WIDTH = 512
+BOARD_HEIGHT = 384
+DEFAULT_CELL_SIZE = 32
+
+# radius_px = size x 2.47 (docs/OBJECT_TYPES.md, "Size / Radius Conversion")
+SIZE_TO_PX = 2.47
+
+class Hit(NamedTuple):
+    """One indexed object."""
+    board_id: int
+    index: int
+    type_id: int
+    x: float
+    y: float
+    radius: float
+    inner: float
+
+
+def object_extent(type_id: int, x: float, y: float, size: int,
+                  param_a: int = 0, param_b: int = 0) -> Tuple[float, float]:
+    """(outer radius, inner radius) of an object's footprint in pixels."""
+    shape = SHAPES[type_id] if type_id < TABLE_SIZE else None
+    if shape == SHAPE_CIRCLE or shape == SHAPE_FAN:
+        return size * SIZE_TO_PX, 0.0
+    if shape == SHAPE_DONUT:
+        return size * SIZE_TO_PX, size * min(param_b, 100) / 100.0
+    if shape == SHAPE_RECT:
+        return math.hypot(param_a, param_b) / 2.0, 0.0
+    if shape == SHAPE_TETHER:
+        return math.hypot(param_a / 10.0 - x, param_b / 10.0 - y), 0.0
+    return 0.0, 0.0
+
+
+def footprints_overlap(ax: float, ay: float, ar: float, ai: float,
+                       bx: float, by: float, br: float, bi: float) -> bool:
+    """Whether two (possibly hollow) discs intersect."""
+    d = math.hypot(ax - bx, ay - by)
+    if d > ar + br:
+        return False
+    # Entirely inside the other's hole
+    if d + br < ai or d + ar < bi:
+        return False
+    return True
+
+
+def _type_set(types) -> Optional[Set[int]]:
+    if types is None:
+        return None
+    if isinstance(types, (int, str)):
+        types = (types,)
+    return {resolve_type_id(t) for t in types}
+
+
+class SpatialIndex:
+    """
+    Grid index over object positions of many boards.
+
+    Args:
+        cell_size: Grid cell edge in pixels
+    """
+
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = -(-BOARD_WIDTH // cell_size)
+        self.rows = -(-BOARD_HEIGHT // cell_size)
+        self._cells: List[array] = [array('I') for _ in range(self.cols * self.rows)]
+
+        # Entry columns
+        self._board = array('q')
+        self._index = array('H')
+        self._type = array('H')
+        self._x = array('f')
+        self._y = array('f')
+        self._r = array('f')
+        self._inner = array('f')
+        self._alive = bytearray()
+
+        self._ranges: Dict[int, Tuple[int, int]] = {}  # board_id -> entry range
+        self._boards_by_type: Dict[int, Set[int]] = {}  # type_id -> board_ids
+        self._dead = 0                                 # removed entries
+        self.max_radius = 0.0
+        self.last_corpus_id = 0
+
+    def __len__(self) -> int:
+        """Number of indexed boards."""
+        return len(self._ranges)
+
+    def __contains__(self, board_id: int) -> bool:
+        return board_id in self._ranges
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _cell(self, x: float, y: float) -> int:
+        cs = self.cell_size
+        col = min(max(int(x // cs), 0), self.cols - 1)
+        row = min(max(int(y // cs), 0), self.rows - 1)
+        return row * self.cols + col
+
+    def add_board(self, board_id: int, board: StrategyBoard):
+        """Index (or re-index) every object of a board."""
+        if board_id in self._ranges:
+            self.remove_board(board_id)
+
+        n = board.count
+        coords = board.coords() if board.offset(BLOCK_COORD) >= 0 else []
+        sizes = board.sizes() if board.offset(BLOCK_SIZE) >= 0 else []
+        pa = board.params(BLOCK_PARAM_A) if board.offset(BLOCK_PARAM_A) >= 0 else []
+        pb = board.params(BLOCK_PARAM_B) if board.offset(BLOCK_PARAM_B) >= 0 else []
+
+        start = len(self._board)
+        for i in range(min(n, len(coords))):
+            x, y = coords[i]
+            type_id = board.type_ids[i]
+            r, inner = object_extent(
+                type_id, x, y,
+                sizes[i] if i < len(sizes) else 0,
+                pa[i] if i < len(pa) else 0,
+                pb[i] if i < len(pb) else 0,
+            )
+            entry = len(self._board)
+            self._board.append(board_id)
+            self._index.append(i)
+            self._type.append(type_id)
+            self._x.append(x)
+            self._y.append(y)
+            self._r.append(r)
+            self._inner.append(inner)
+            self._alive.append(1)
+            self._cells[self._cell(x, y)].append(entry)
+            if r > self.max_radius:
+                self.max_radius = r
+            self._boards_by_type.setdefault(type_id, set()).add(board_id)
+        self._ranges[board_id] = (start, len(self._board))
+
+    def add_binary(self, board_id: int, binary_data: bytes) -> bool:
+        """Parse and index a decoded binary; False if it does not parse."""
+        board = try_parse_board(binary_data)
+        if board is None:
+            return False
+        self.add_board(board_id, board)
+        return True
+
+    def remove_board(self, board_id: int):
+        """Drop a board from query results (space is reclaimed by compact())."""
+        start, end = self._ranges.pop(board_id, (0, 0))
+        for type_id in set(self._type[start:end]):
+            self._boards_by_type[type_id].discard(board_id)
+        self._alive[start:end] = bytes(end - start)
+        self._dead += end - start
+
+    def sync(self, corpus, mode: str = 'auto', workers: int = None) -> int:
+        """
+        Index boards added to a StrategyCorpus since the last sync.
+
+        Returns the number of boards indexed.
+        """
+        rows = corpus.conn.execute(
+            'SELECT id, code FROM boards WHERE id > ? ORDER BY id', (self.last_corpus_id,)).fetchall()
+        added = 0
+        for (board_id, _), result in zip(rows, decode_many([c for _, c in rows], mode, workers)):
+            if result.ok and self.add_binary(board_id, result.value):
+                added += 1
+        if rows:
+            self.last_corpus_id = rows[-1][0]
+        return added
+
+    def compact(self):
+        """Rebuild storage without removed boards."""
+        if not self._dead:
+            return
+        columns = (self._board, self._index, self._type, self._x, self._y, self._r, self._inner)
+        keep = [e for e in range(len(self._board)) if self._alive[e]]
+        (self._board, self._index, self._type, self._x,
+         self._y, self._r, self._inner) = [array(col.typecode, (col[e] for e in keep)) for col in columns]
+        self._alive = bytearray(b'\x01' * len(keep))
+        self._dead = 0
+
+        renumber = {old: new for new, old in enumerate(keep)}
+        self._ranges = {
+            board_id: (renumber[start], renumber[end - 1] + 1) if end > start else (0, 0)
+            for board_id, (start, end) in self._ranges.items()
+        }
+        self._cells = [array('I') for _ in range(self.cols * self.rows)]
+        for e in range(len(self._board)):
+            self._cells[self._cell(self._x[e], self._y[e])].append(e)
+        self.max_radius = max(self._r, default=0.0)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _hit(self, e: int) -> Hit:
+        return Hit(self._board[e], self._index[e], self._type[e],
+                   self._x[e], self._y[e], self._r[e], self._inner[e])
+
+    def _live(self, e: int) -> bool:
+        return self._alive[e] == 1
+
+    def _entries_in(self, x0: float, y0: float, x1: float, y1: float) -> Iterator[int]:
+        cs = self.cell_size
+        c0 = max(int(x0 // cs), 0)
+        c1 = min(int(x1 // cs), self.cols - 1)
+        r0 = max(int(y0 // cs), 0)
+        r1 = min(int(y1 // cs), self.rows - 1)
+        # Off-board positions are clamped into edge cells; widen to them
+        if x0 <= 0:
+            c0 = 0
+        if y0 <= 0:
+            r0 = 0
+        if x1 >= BOARD_WIDTH:
+            c1 = self.cols - 1
+        if y1 >= BOARD_HEIGHT:
+            r1 = self.rows - 1
+        for row in range(r0, r1 + 1):
+            base = row * self.cols
+            for col in range(c0, c1 + 1):
+                yield from self._cells[base + col]
+
+    def box(self, x0: float, y0: float, x1: float, y1: float, types=None) -> List[Hit]:
+        """Objects whose position lies inside [x0, x1] x [y0, y1]."""
+        wanted = _type_set(types)
+        xs, ys, ts = self._x, self._y, self._type
+        return [
+            self._hit(e) for e in self._entries_in(x0, y0, x1, y1)
+            if x0 <= xs[e] <= x1 and y0 <= ys[e] <= y1
+            and (wanted is None or ts[e] in wanted) and self._live(e)
+        ]
+
+    def radius(self, x: float, y: float, r: float, types=None, touch: bool = False) -> List[Hit]:
+        """
+        Objects within r of (x, y).
+
+        By default an object's position must be within r; with touch=True
+        any part of its footprint may be.
+        """
+        wanted = _type_set(types)
+        reach = r + (self.max_radius if touch else 0.0)
+        xs, ys, rs, ts = self._x, self._y, self._r, self._type
+        hits = []
+        for e in self._entries_in(x - reach, y - reach, x + reach, y + reach):
+            limit = r + rs[e] if touch else r
+            if (math.hypot(xs[e] - x, ys[e] - y) <= limit
+                    and (wanted is None or ts[e] in wanted) and self._live(e)):
+                hits.append(self._hit(e))
+        return hits
+
+    def _boards_with(self, wanted: Optional[Set[int]]) -> Set[int]:
+        if wanted is None:
+            return set(self._ranges)
+        boards = set()
+        for type_id in wanted:
+            boards |= self._boards_by_type.get(type_id, set())
+        return boards
+
+    def overlaps(self, types_a=None, types_b=None) -> Iterator[Tuple[Hit, Hit]]:
+        """
+        Pairs (a, b) on the same board whose footprints intersect.
+
+        Either side may be None for any type. Only boards holding both
+        sides' types are visited.
+        """
+        wanted_a = _type_set(types_a)
+        wanted_b = _type_set(types_b)
+        ts, xs, ys, rs, inner = self._type, self._x, self._y, self._r, self._inner
+        boards = self._boards_with(wanted_a) & self._boards_with(wanted_b)
+        for board_id in sorted(boards, key=lambda b: self._ranges[b][0]):
+            entries = range(*self._ranges[board_id])
+            side_b = [e for e in entries if wanted_b is None or ts[e] in wanted_b]
+            for a in entries:
+                if wanted_a is not None and ts[a] not in wanted_a:
+                    continue
+                for b in side_b:
+                    if a != b and footprints_overlap(xs[a], ys[a], rs[a], inner[a],
+                                                     xs[b], ys[b], rs[b], inner[b]):
+                        yield self._hit(a), self._hit(b)
+
+    def objects(self, board_id: int) -> List[Hit]:
+        """Every indexed object of one board."""
+        start, end = self._ranges.get(board_id, (0, 0))
+        return [self._hit(e) for e in range(start, end)]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        self.compact()
+        with open(path, 'wb') as f:
+            pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'SpatialIndex':
+        index = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            index.__dict__.update(pickle.load(f))
+        if not hasattr(index, '_boards_by_type'):  # saved before the type map existed
+            index._boards_by_type = {}
+            for board_id, (start, end) in index._ranges.items():
+                for type_id in index._type[start:end]:
+                    index._boards_by_type.setdefault(type_id, set()).add(board_id)
+        return index
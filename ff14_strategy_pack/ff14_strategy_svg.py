@@ -0,0 +1,271 @@
+"""
+FF14 Strategy SVG Export
+
+Streams boards as SVG for the wiki. The writer is a generator of text
+fragments straight from the parsed board columns; no DOM is built.
+
+Every icon or marker type is a <symbol> (id "t<TypeID>") referenced with
+<use>, so a 48-icon board embeds each job icon once. Area shapes follow
+the thumbnail renderer (ff14_strategy_render) and are written as plain
+circle/path/rect/line elements.
+
+Bulk mode writes one sprite sheet holding the symbols of every type used,
+and each board SVG references "sprites.svg#t<TypeID>" instead of carrying
+its own <defs>.
+
+Usage:
+    from ff14_strategy_svg import write_svg, export_many
+
+    write_svg(code, 'board.svg')
+    export_many(codes, 'wiki/boards')   # 0.svg, 1.svg, ..., sprites.svg
+
+Dependencies: ff14_strategy_board.py, ff14_strategy_render.py (shape rules, icons),
+              ff14_strategy_types.py
+"""
+import base64
+import math
+import os
+from functools import lru_cache
+from typing import IO, Dict, Iterable, Iterator, Optional, Set, Union
+from xml.sax.saxutils import escape, quoteattr
+
+from .ff14_strategy_board import (
+    BLOCK_ANGLE, BLOCK_COORD, BLOCK_PARAM_A, BLOCK_PARAM_B, BLOCK_PARAM_C,
+    BLOCK_SIZE, BLOCK_TRANS, StrategyBoard,
+)
+from .ff14_strategy_render import (
+    AREA_OPACITY, BACKGROUND, BOARD_HEIGHT, BOARD_WIDTH, CIRCLE_TYPES, DONUT_TYPE, FAN_TYPE,
+    ICON_DIR, ICON_FALLBACK, ICON_PX_PER_SIZE, LINE_TYPE, RECT_TYPES, SIZE_TO_PX, TEXT_TYPE,
+    _icon_type_id, _sector_bbox_center,
+)
+from .ff14_strategy_types import is_area
+
+SPRITE_SHEET_NAME = 'sprites.svg'
+
+_SVG_OPEN = ('<svg xmlns="http://www.w3.org/2000/svg" '
+             'xmlns:xlink="http://www.w3.org/1999/xlink" ')
+
+Source = Union[str, bytes, StrategyBoard]
+
+
+def _as_board(source: Source) -> StrategyBoard:
+    if isinstance(source, StrategyBoard):
+        return source
+    if isinstance(source, str):
+        return StrategyBoard.from_code(source)
+    return StrategyBoard(source)
+
+
+def _num(v: float) -> str:
+    """Compact number formatting (no trailing zeros)."""
+    return f'{v:.2f}'.rstrip('0').rstrip('.') or '0'
+
+
+def _rgb(color) -> str:
+    return '#%02x%02x%02x' % tuple(color[:3])
+
+
+# ============================================================================
+# Symbols
+# ============================================================================
+
+@lru_cache(maxsize=1)
+def _icon_files() -> Dict[int, str]:
+    """Type ID -> icon PNG path."""
+    files = {}
+    for root, _, names in os.walk(ICON_DIR):
+        for name in names:
+            type_id = _icon_type_id(name) if name.lower().endswith('.png') else None
+            if type_id is not None:
+                files[type_id] = os.path.join(root, name)
+    return files
+
+
+@lru_cache(maxsize=256)
+def symbol(type_id: int) -> str:
+    """<symbol> definition for a point-like type (icon image or colored dot)."""
+    files = _icon_files()
+    path = files.get(type_id) or files.get(ICON_FALLBACK.get(type_id))
+    if path is None:
+        return (f'<symbol id="t{type_id}" viewBox="-1 -1 2 2">'
+                f'<circle r="1" fill="currentColor"/></symbol>')
+    with open(path, 'rb') as f:
+        data = base64.b64encode(f.read()).decode('ascii')
+    return (f'<symbol id="t{type_id}" viewBox="0 0 1 1">'
+            f'<image width="1" height="1" href="data:image/png;base64,{data}" '
+            f'xlink:href="data:image/png;base64,{data}"/></symbol>')
+
+
+def is_area_type(type_id: int) -> bool:
+    return is_area(type_id)
+
+
+def iter_sprite_sheet(type_ids: Iterable[int]) -> Iterator[str]:
+    """Stream a standalone SVG holding the symbols for type_ids."""
+    yield _SVG_OPEN + 'width="0" height="0">\n<defs>\n'
+    for type_id in sorted(set(type_ids)):
+        yield symbol(type_id) + '\n'
+    yield '</defs>\n</svg>\n'
+
+
+# ============================================================================
+# Board Elements
+# ============================================================================
+
+def _point(cx: float, cy: float, r: float, angle: float) -> str:
+    a = math.radians(angle)
+    return f'{_num(cx + r * math.sin(a))} {_num(cy - r * math.cos(a))}'
+
+
+def _arc_path(cx: float, cy: float, outer: float, inner: float, start: float, arc: float) -> str:
+    """Path for a sector or ring segment (0 = north, clockwise)."""
+    end = start + arc
+    large = 1 if arc > 180 else 0
+    if inner <= 0:
+        return (f'M{_num(cx)} {_num(cy)}L{_point(cx, cy, outer, start)}'
+                f'A{_num(outer)} {_num(outer)} 0 {large} 1 {_point(cx, cy, outer, end)}Z')
+    return (f'M{_point(cx, cy, outer, start)}'
+            f'A{_num(outer)} {_num(outer)} 0 {large} 1 {_point(cx, cy, outer, end)}'
+            f'L{_point(cx, cy, inner, end)}'
+            f'A{_num(inner)} {_num(inner)} 0 {large} 0 {_point(cx, cy, inner, start)}Z')
+
+
+def _area_element(type_id: int, x: float, y: float, angle: float, size: int,
+                  pa: int, pb: int, pc: int, color, opacity: float) -> Optional[str]:
+    fill = f'fill="{_rgb(color)}" fill-opacity="{_num(opacity * AREA_OPACITY)}"'
+    if type_id in CIRCLE_TYPES:
+        return f'<circle cx="{_num(x)}" cy="{_num(y)}" r="{_num(size * SIZE_TO_PX)}" {fill}/>'
+
+    if type_id in (FAN_TYPE, DONUT_TYPE):
+        outer = size * SIZE_TO_PX
+        arc = float(pa or (90 if type_id == FAN_TYPE else 360))
+        inner = size * min(pb, 100) / 100.0 if type_id == DONUT_TYPE else 0.0
+        if arc >= 360:
+            ring = (f'M{_num(x - outer)} {_num(y)}a{_num(outer)} {_num(outer)} 0 1 0 {_num(2 * outer)} 0'
+                    f'a{_num(outer)} {_num(outer)} 0 1 0 {_num(-2 * outer)} 0Z')
+            if inner > 0:
+                ring += (f'M{_num(x - inner)} {_num(y)}a{_num(inner)} {_num(inner)} 0 1 0 {_num(2 * inner)} 0'
+                         f'a{_num(inner)} {_num(inner)} 0 1 0 {_num(-2 * inner)} 0Z')
+            return f'<path d="{ring}" fill-rule="evenodd" {fill}/>'
+        if type_id == FAN_TYPE and arc < 270:
+            ox, oy = _sector_bbox_center(angle, arc)
+            x, y = x - ox * outer, y - oy * outer
+        return f'<path d="{_arc_path(x, y, outer, inner, angle, arc)}" {fill}/>'
+
+    if type_id in RECT_TYPES:
+        w, h = pa or 10, pb or 10
+        return (f'<rect x="{_num(-w / 2)}" y="{_num(-h / 2)}" width="{w}" height="{h}" '
+                f'transform="translate({_num(x)} {_num(y)}) rotate({_num(angle)})" {fill}/>')
+
+    if type_id == LINE_TYPE:
+        ex, ey = pa / 10.0, pb / 10.0
+        return (f'<line x1="{_num(2 * x - ex)}" y1="{_num(2 * y - ey)}" x2="{_num(ex)}" y2="{_num(ey)}" '
+                f'stroke="{_rgb(color)}" stroke-opacity="{_num(opacity)}" '
+                f'stroke-width="{pc or 6}" stroke-linecap="round"/>')
+    return None
+
+
+def iter_svg(source: Source, scale: float = 1.0, sprite_href: str = None,
+             used_types: Set[int] = None) -> Iterator[str]:
+    """
+    Stream one board as SVG text fragments.
+
+    Args:
+        scale: Output size relative to the 512 x 384 board
+        sprite_href: Reference symbols in this sprite sheet instead of
+            embedding <defs> (e.g. "sprites.svg")
+        used_types: Collects the symbol type IDs the board references
+    """
+    board = _as_board(source)
+    n = board.count
+
+    def column(block_id, getter, default):
+        values = getter() if block_id in board.blocks else []
+        return list(values) + [default] * (n - len(values))
+
+    coords = column(BLOCK_COORD, board.coords, (0.0, 0.0))
+    angles = column(BLOCK_ANGLE, board.angles, 0)
+    sizes = column(BLOCK_SIZE, board.sizes, 100)
+    colors = column(BLOCK_TRANS, board.colors, (255, 255, 255))
+    alphas = column(BLOCK_TRANS, board.alphas, 0)
+    pa = column(BLOCK_PARAM_A, lambda: board.params(BLOCK_PARAM_A), 0)
+    pb = column(BLOCK_PARAM_B, lambda: board.params(BLOCK_PARAM_B), 0)
+    pc = column(BLOCK_PARAM_C, lambda: board.params(BLOCK_PARAM_C), 0)
+    opacity = [max(0.0, 1.0 - min(a, 100) / 100.0) for a in alphas]
+
+    width, height = BOARD_WIDTH * scale, BOARD_HEIGHT * scale
+    yield (_SVG_OPEN + f'width="{_num(width)}" height="{_num(height)}" '
+           f'viewBox="0 0 {BOARD_WIDTH} {BOARD_HEIGHT}">\n')
+    yield f'<title>{escape(board.title)}</title>\n'
+
+    point_types = sorted({t for t in board.type_ids if not is_area_type(t) and t != TEXT_TYPE})
+    if used_types is not None:
+        used_types.update(point_types)
+    if sprite_href is None and point_types:
+        yield '<defs>\n'
+        for type_id in point_types:
+            yield symbol(type_id) + '\n'
+        yield '</defs>\n'
+    prefix = sprite_href or ''
+
+    yield f'<rect width="{BOARD_WIDTH}" height="{BOARD_HEIGHT}" fill="{_rgb(BACKGROUND)}"/>\n'
+
+    for i, type_id in enumerate(board.type_ids):
+        x, y = coords[i]
+        element = _area_element(type_id, x, y, angles[i], sizes[i], pa[i], pb[i], pc[i],
+                                colors[i], opacity[i])
+        if element is not None:
+            yield element + '\n'
+
+    for i, type_id in enumerate(board.type_ids):
+        if is_area_type(type_id):
+            continue
+        x, y = coords[i]
+        if type_id == TEXT_TYPE:
+            yield (f'<text x="{_num(x)}" y="{_num(y)}" fill="{_rgb(colors[i])}" '
+                   f'fill-opacity="{_num(opacity[i])}" text-anchor="middle" '
+                   f'dominant-baseline="middle" font-size="{_num(sizes[i] * 0.16)}">'
+                   f'{escape(board.texts.get(i, ""))}</text>\n')
+            continue
+        px = sizes[i] * ICON_PX_PER_SIZE
+        yield (f'<use href={quoteattr(f"{prefix}#t{type_id}")} xlink:href={quoteattr(f"{prefix}#t{type_id}")} '
+               f'x="{_num(x - px / 2)}" y="{_num(y - px / 2)}" width="{_num(px)}" height="{_num(px)}" '
+               f'color="{_rgb(colors[i])}" opacity="{_num(opacity[i])}"/>\n')
+
+    yield '</svg>\n'
+
+
+# ============================================================================
+# Writers
+# ============================================================================
+
+def _write(fragments: Iterable[str], target: Union[str, IO[str]]):
+    if isinstance(target, str):
+        with open(target, 'w', encoding='utf-8') as f:
+            f.writelines(fragments)
+    else:
+        target.writelines(fragments)
+
+
+def write_svg(source: Source, target: Union[str, IO[str]], scale: float = 1.0,
+              sprite_href: str = None):
+    """Write one board as SVG to a path or text file object."""
+    _write(iter_svg(source, scale, sprite_href), target)
+
+
+def export_many(sources: Iterable[Source], outdir: str, scale: float = 1.0,
+                sprite_name: str = SPRITE_SHEET_NAME) -> int:
+    """
+    Write <n>.svg for every board plus one shared sprite sheet.
+
+    Boards are streamed one at a time; the sprite sheet is written last
+    with the symbols of every type seen. Returns the number of boards.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    used: Set[int] = set()
+    count = 0
+    for index, source in enumerate(sources):
+        _write(iter_svg(source, scale, sprite_name, used), os.path.join(outdir, f'{index}.svg'))
+        count += 1
+    _write(iter_sprite_sheet(used), os.path.join(outdir, sprite_name))
+    return count
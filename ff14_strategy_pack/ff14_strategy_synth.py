@@ -0,0 +1,403 @@
+"""
+FF14 Strategy Synthetic Corpus
+
+Seeded generator of realistic-looking strategy codes for load-testing
+ingestion without shipping real users' boards.
+
+Distributions (per board):
+- object count: mostly party-sized (4/8) or small (1-12), long tail up
+  to MAX_OBJECTS
+- types: roles/jobs, AoEs, mechanic markers, waymarks/signs, enemies and
+  text objects, drawn from the type registry (ff14_strategy_types)
+- positions: players clustered around the arena center, waymarks on a
+  ring, AoEs anywhere on the 512 x 384 board
+- colours: white for icons, PALETTE_GRID colours for AoEs
+- angles, sizes, transparency and PARAM_A/B/C per shape (fan arcs,
+  donut inner radius, line AoE width/height, tether end points)
+- titles and text in English, Japanese, Chinese, Korean and emoji
+  (multibyte UTF-8)
+
+Board i of seed s depends only on (s, i), so output is identical for any
+worker count or chunk size. The first boards of every corpus are fixed
+edge cases: MAX_OBJECTS objects, longest ASCII and multibyte titles,
+longest text objects, extreme positions/sizes/angles.
+
+Output is one code per line, streamed in order through the batch
+scheduler (ff14_strategy_batch).
+
+Usage:
+    from ff14_strategy_synth import synthetic_codes, write_corpus
+
+    codes = list(synthetic_codes(1000, seed=7))
+    write_corpus('synthetic.txt', 1_000_000, seed=7, workers=8)
+
+    python -m ff14_strategy_pack.ff14_strategy_synth synthetic.txt --count 1000000
+
+Dependencies: strategy_generator.py (StrategyTemplate), ff14_strategy_batch.py,
+              ff14_strategy_types.py
+"""
+import argparse
+import bisect
+import math
+import random
+import sys
+import time
+from itertools import accumulate
+from typing import Iterator, List, NamedTuple
+
+from .ff14_strategy import encode_strategy
+from .ff14_strategy_batch import BatchResult, _check_options, _run
+from .ff14_strategy_types import (
+    CATEGORY_CLASS, CATEGORY_ENEMY, CATEGORY_FIELD, CATEGORY_JOB, CATEGORY_MARKER,
+    CATEGORY_MECHANIC, CATEGORY_ROLE, CATEGORY_SIGN, CATEGORY_TARGET, CATEGORY_WAYMARK,
+    ROLE_LIMITED, ROLES, SHAPE_CIRCLE, SHAPE_POINT, SHAPE_RECT, TYPE_IDS, ids_where,
+)
+from .strategy_generator import MAX_TEXT_CHARS, PALETTE_GRID, get_template
+
+BOARD_WIDTH = 512
+BOARD_HEIGHT = 384
+
+# In-game board limits assumed by the edge cases
+MAX_OBJECTS = 50
+MAX_TITLE_CHARS = 30
+
+DEFAULT_CHUNK_SIZE = 512
+
+# ============================================================================
+# Type Tables (ff14_strategy_types)
+# ============================================================================
+
+JOB_TYPES = tuple(i for i in ids_where(category=CATEGORY_JOB) if ROLES[i] != ROLE_LIMITED)
+ROLE_TYPES = ids_where(category=CATEGORY_ROLE)
+CLASS_TYPES = ids_where(category=CATEGORY_CLASS) + ids_where(role=ROLE_LIMITED)
+CIRCLE_AOE_TYPES = ids_where(shape=SHAPE_CIRCLE)
+FAN_TYPE = TYPE_IDS['fan_aoe']
+DONUT_TYPE = TYPE_IDS['donut_aoe']
+RECT_TYPES = ids_where(shape=SHAPE_RECT)                 # PARAM_A x PARAM_B
+LINE_TYPE = TYPE_IDS['line']
+MECHANIC_TYPES = ids_where(category=CATEGORY_MECHANIC, shape=SHAPE_POINT) + ids_where(
+    category=CATEGORY_MARKER, shape=SHAPE_POINT)
+WAYMARK_TYPES = ids_where(category=CATEGORY_WAYMARK)
+MARKER_TYPES = ids_where(category=CATEGORY_TARGET)
+SIGN_TYPES = ids_where(category=CATEGORY_SIGN, shape=SHAPE_POINT)
+FIELD_TYPES = ids_where(category=CATEGORY_FIELD)
+ENEMY_TYPES = ids_where(category=CATEGORY_ENEMY)
+TEXT_TYPE = TYPE_IDS['text']
+
+# Category -> relative frequency of an object
+_CATEGORY_WEIGHTS = (
+    ('player', 40), ('aoe', 25), ('mechanic', 8), ('waymark', 8),
+    ('marker', 6), ('sign', 4), ('enemy', 4), ('text', 3), ('field', 1), ('line', 1),
+)
+_CATEGORIES = tuple(c for c, _ in _CATEGORY_WEIGHTS)
+_CATEGORY_CUM = tuple(accumulate(w for _, w in _CATEGORY_WEIGHTS))
+
+_PALETTE = tuple(PALETTE_GRID.values())
+_WHITE = (255, 255, 255)
+
+# ============================================================================
+# Text Tables
+# ============================================================================
+
+_TITLE_WORDS = (
+    'P1', 'P2', 'P3', 'P4', 'Light Party', 'Full Party', 'Spread', 'Stack', 'Tower',
+    'Knockback', 'Towers', 'Limit Cut', 'Enrage', 'Adds', 'Tankbuster', 'Raidwide',
+    '散開', '頭割り', '塔', 'ノックバック', 'リミットカット', '線', '安置',
+    '分摊', '分散', '击退', '塔处理', '산개', '쉐어', '넉백', '탑',
+    '⚔️', '🛡️', '💥', '✨', 'M1S', 'M2S', 'M3S', 'M4S', 'FRU', 'TOP', 'DSR',
+)
+_TEXT_WORDS = (
+    'MT', 'ST', 'H1', 'H2', 'D1', 'D2', 'D3', 'D4', 'Stack', 'Spread', 'Safe', 'Go',
+    '北', '南', '東', '西', '安置', '頭割り', '散開', '先', '後', '分摊', '安全', '쉐어', '산개',
+    '→', '←', '↑', '↓', '①', '②', '③', '④', '★', '😀',
+)
+
+
+class SynthBoard(NamedTuple):
+    """One generated board before encoding."""
+    title: str
+    type_ids: tuple
+    texts: tuple          # (index, text) pairs for Text objects
+    coords: list          # (x, y) pixels
+    colors: list
+    angles: list
+    sizes: list
+    alphas: list
+    params: list          # (PARAM_A, PARAM_B, PARAM_C)
+    seed: int             # obfuscation seed
+
+    def binary(self) -> bytes:
+        template = get_template(self.title, self.type_ids, self.texts)
+        return template.render(self.coords, self.colors, self.angles, self.sizes,
+                               self.alphas, params=self.params)
+
+    def code(self) -> str:
+        return encode_strategy(self.binary(), self.seed)
+
+
+# ============================================================================
+# Random Boards
+# ============================================================================
+
+def _rng(seed: int, index: int) -> random.Random:
+    # String seeds hash deterministically (SHA-512), unlike hash()-based tuples
+    return random.Random(f"ff14-synth:{seed}:{index}")
+
+
+def _clamp(v: float, hi: int) -> float:
+    return min(max(round(v, 1), 0.0), float(hi))
+
+
+def _object_count(rng: random.Random) -> int:
+    roll = rng.random()
+    if roll < 0.35:
+        return rng.choice((4, 8, 8, 8))
+    if roll < 0.80:
+        return rng.randint(1, 12)
+    return min(MAX_OBJECTS, max(1, int(rng.lognormvariate(math.log(18), 0.5))))
+
+
+def _words(rng: random.Random, words: tuple, max_chars: int, count: int) -> str:
+    text = ' '.join(rng.choice(words) for _ in range(count))
+    return text[:max_chars]
+
+
+def random_title(rng: random.Random) -> str:
+    return _words(rng, _TITLE_WORDS, MAX_TITLE_CHARS, rng.choice((1, 2, 2, 3, 3, 4)))
+
+
+def random_text(rng: random.Random) -> str:
+    return _words(rng, _TEXT_WORDS, MAX_TEXT_CHARS, rng.choice((1, 1, 2, 3)))
+
+
+def _random_object(rng: random.Random, category: str, waymark_slot: int):
+    """(type_id, (x, y), color, angle, size, alpha, params, text)."""
+    cx, cy = BOARD_WIDTH / 2, BOARD_HEIGHT / 2
+    color, angle, size, alpha, params, text = _WHITE, 0, 100, 0, (0, 0, 0), None
+
+    if category == 'player':
+        type_id = rng.choice(JOB_TYPES + ROLE_TYPES * 2 + CLASS_TYPES[:2])
+        pos = (rng.gauss(cx, 70), rng.gauss(cy, 60))
+        if rng.random() < 0.1:
+            size = rng.choice((50, 75, 125, 150))
+    elif category == 'aoe':
+        kind = rng.random()
+        color = rng.choice(_PALETTE)
+        alpha = rng.choice((0, 0, 20, 30, 50))
+        pos = (rng.uniform(0, BOARD_WIDTH), rng.uniform(0, BOARD_HEIGHT))
+        angle = rng.choice((0, 0, 45, 90, 135, 180, -90, -45, rng.randrange(-180, 180)))
+        if kind < 0.45:
+            type_id = rng.choice(CIRCLE_AOE_TYPES)
+            size = rng.randint(10, 120)
+        elif kind < 0.7:
+            type_id = FAN_TYPE
+            size = rng.randint(30, 160)
+            params = (rng.choice((30, 45, 60, 90, 90, 120, 180, 270)), 0, 0)
+        elif kind < 0.85:
+            type_id = DONUT_TYPE
+            size = rng.randint(40, 160)
+            params = (rng.choice((360, 360, 360, 180, 90)), rng.randint(20, 80), 0)
+        else:
+            type_id = rng.choice(RECT_TYPES)
+            params = (rng.randint(10, 200), rng.randint(20, 400), 0)
+    elif category == 'line':
+        type_id = LINE_TYPE
+        pos = (rng.uniform(40, BOARD_WIDTH - 40), rng.uniform(40, BOARD_HEIGHT - 40))
+        end = (rng.uniform(0, BOARD_WIDTH), rng.uniform(0, BOARD_HEIGHT))
+        angle = round(math.degrees(math.atan2(end[1] - pos[1], end[0] - pos[0])))
+        params = (int(end[0] * 10), int(end[1] * 10), rng.choice((6, 6, 2, 4, 8, 10)))
+        color = rng.choice(_PALETTE)
+    elif category == 'mechanic':
+        type_id = rng.choice(MECHANIC_TYPES)
+        pos = (rng.gauss(cx, 90), rng.gauss(cy, 70))
+        if type_id == 0x6E:
+            params = (rng.randint(1, 4), 0, 0)
+            angle = rng.choice((0, 90, 180, -90))
+    elif category == 'waymark':
+        type_id = WAYMARK_TYPES[waymark_slot % len(WAYMARK_TYPES)]
+        # A, B, C, D on the cardinal points, 1-4 on the diagonals
+        a = math.radians((waymark_slot % 4) * 90 + (45 if waymark_slot % 8 >= 4 else 0))
+        pos = (cx + 140 * math.sin(a), cy - 140 * math.cos(a))
+    elif category == 'marker':
+        type_id = rng.choice(MARKER_TYPES)
+        pos = (rng.gauss(cx, 80), rng.gauss(cy - 20, 60))
+    elif category == 'sign':
+        type_id = rng.choice(SIGN_TYPES)
+        pos = (rng.uniform(0, BOARD_WIDTH), rng.uniform(0, BOARD_HEIGHT))
+        angle = rng.choice((0, 0, 90, 180, -90))
+    elif category == 'enemy':
+        type_id = rng.choice(ENEMY_TYPES)
+        pos = (rng.gauss(cx, 30), rng.gauss(cy - 40, 30))
+        size = rng.choice((100, 100, 150, 200))
+    elif category == 'field':
+        type_id = rng.choice(FIELD_TYPES)
+        pos = (cx, cy)
+        size = rng.randint(100, 255)
+        alpha = rng.choice((0, 50, 80))
+    else:  # text
+        type_id = TEXT_TYPE
+        pos = (rng.uniform(20, BOARD_WIDTH - 20), rng.uniform(20, BOARD_HEIGHT - 20))
+        color = rng.choice((_WHITE, _WHITE, rng.choice(_PALETTE)))
+        text = random_text(rng)
+
+    x, y = _clamp(pos[0], BOARD_WIDTH), _clamp(pos[1], BOARD_HEIGHT)
+    return type_id, (x, y), color, angle, size, alpha, params, text
+
+
+def random_board(seed: int, index: int) -> SynthBoard:
+    """Board index of the corpus for seed (edge cases first)."""
+    if index < len(_EDGE_CASES):
+        return _EDGE_CASES[index](_rng(seed, index))
+
+    rng = _rng(seed, index)
+    n = _object_count(rng)
+    columns = [[] for _ in range(8)]
+    waymark_slot = 0
+    for _ in range(n):
+        category = _CATEGORIES[bisect.bisect_right(_CATEGORY_CUM, rng.random() * _CATEGORY_CUM[-1])]
+        obj = _random_object(rng, category, waymark_slot)
+        waymark_slot += category == 'waymark'
+        for column, value in zip(columns, obj):
+            column.append(value)
+    type_ids, coords, colors, angles, sizes, alphas, params, texts = columns
+    return SynthBoard(
+        random_title(rng), tuple(type_ids),
+        tuple((i, t) for i, t in enumerate(texts) if t is not None),
+        coords, colors, angles, sizes, alphas, params, rng.randrange(64),
+    )
+
+
+# ============================================================================
+# Edge Cases
+# ============================================================================
+
+def _uniform_board(title: str, type_ids: list, texts: tuple = (), seed: int = 10, **columns) -> SynthBoard:
+    n = len(type_ids)
+    coords = columns.get('coords') or [(BOARD_WIDTH / 2, BOARD_HEIGHT / 2)] * n
+    return SynthBoard(
+        title, tuple(type_ids), texts, coords,
+        columns.get('colors') or [_WHITE] * n,
+        columns.get('angles') or [0] * n,
+        columns.get('sizes') or [100] * n,
+        columns.get('alphas') or [0] * n,
+        columns.get('params') or [(0, 0, 0)] * n,
+        seed,
+    )
+
+
+def _edge_max_objects(rng):
+    types = [rng.choice(JOB_TYPES + ROLE_TYPES + CIRCLE_AOE_TYPES) for _ in range(MAX_OBJECTS)]
+    coords = [(10 + (i % 10) * 54.5, 10 + (i // 10) * 90) for i in range(MAX_OBJECTS)]
+    return _uniform_board('Max objects', types, coords=coords)
+
+
+def _edge_max_title_ascii(rng):
+    return _uniform_board('W' * MAX_TITLE_CHARS, [0x2F])
+
+
+def _edge_max_title_multibyte(rng):
+    return _uniform_board('頭割り散開' * (MAX_TITLE_CHARS // 5), [0x32])
+
+
+def _edge_emoji_title(rng):
+    return _uniform_board('💥⚔️🛡️✨' * 5, [0x35, 0x35])
+
+
+def _edge_empty_title(rng):
+    return _uniform_board('', [0x09], sizes=[120], colors=[rng.choice(_PALETTE)])
+
+
+def _edge_max_text(rng):
+    texts = ((0, 'X' * MAX_TEXT_CHARS), (1, '安' * MAX_TEXT_CHARS), (2, '😀' * MAX_TEXT_CHARS))
+    return _uniform_board('Text limits', [TEXT_TYPE] * 3, texts,
+                          coords=[(100, 100), (256, 192), (400, 300)])
+
+
+def _edge_extremes(rng):
+    types = [0x2F, 0x09, FAN_TYPE, DONUT_TYPE, 0x01, LINE_TYPE, 0x4F, 0x41]
+    coords = [(0, 0), (BOARD_WIDTH, BOARD_HEIGHT), (0, BOARD_HEIGHT), (BOARD_WIDTH, 0),
+              (BOARD_WIDTH / 2, 0), (BOARD_WIDTH / 2, BOARD_HEIGHT / 2), (0, BOARD_HEIGHT / 2),
+              (BOARD_WIDTH, BOARD_HEIGHT / 2)]
+    return _uniform_board(
+        'Extremes', types, coords=coords,
+        angles=[-180, 0, 359, -1, 180, 90, 0, 0],
+        sizes=[0, 255, 255, 1, 100, 100, 255, 0],
+        alphas=[100, 0, 50, 100, 0, 0, 0, 100],
+        params=[(0, 0, 0), (0, 0, 0), (360, 0, 0), (1, 100, 0), (1, 65535, 0),
+                (BOARD_WIDTH * 10, BOARD_HEIGHT * 10, 10), (0, 0, 0), (0, 0, 0)],
+        seed=63,
+    )
+
+
+def _edge_single_object(rng):
+    return _uniform_board('1', [0x2F], seed=0)
+
+
+_EDGE_CASES = (
+    _edge_max_objects, _edge_max_title_ascii, _edge_max_title_multibyte, _edge_emoji_title,
+    _edge_empty_title, _edge_max_text, _edge_extremes, _edge_single_object,
+)
+
+EDGE_CASE_COUNT = len(_EDGE_CASES)
+
+
+# ============================================================================
+# Corpus
+# ============================================================================
+
+def _synth_chunk(start: int, indexes: list, seed: int) -> List[BatchResult]:
+    results = []
+    for i in indexes:
+        try:
+            results.append(BatchResult(i, random_board(seed, i).code()))
+        except Exception as e:
+            results.append(BatchResult(i, error=e))
+    return results
+
+
+def synthetic_codes(count: int, seed: int = 0, mode: str = 'serial', workers: int = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield count codes for seed, in order (same output for every mode)."""
+    _check_options(mode, chunk_size)
+    for result in _run(_synth_chunk, range(count), (seed,), mode, workers, chunk_size):
+        if not result.ok:
+            raise result.error
+        yield result.value
+
+
+def write_corpus(path: str, count: int, seed: int = 0, mode: str = 'process',
+                 workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Stream count codes to path, one per line. Returns the count written."""
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for code in synthetic_codes(count, seed, mode, workers, chunk_size):
+            f.write(code)
+            f.write('\n')
+            written += 1
+    return written
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic corpus of strategy codes.")
+    parser.add_argument('output', help="Output text file (one code per line)")
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mode', default='process', choices=('serial', 'thread', 'process'))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    written = write_corpus(args.output, args.count, args.seed, args.mode, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"{written} codes in {elapsed:.2f}s ({written / elapsed if elapsed else 0:,.0f} codes/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
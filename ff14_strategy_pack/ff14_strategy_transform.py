@@ -0,0 +1,321 @@
+"""
+FF14 Strategy Board Transforms
+
+Whole-board geometric transforms: mirror, rotate, scale and translate
+every object in one pass instead of one modify_coordinates() round trip
+per object.
+
+An Affine maps pixel positions (origin top-left, +y down, 512 x 384
+board). Applying one to a board:
+
+- transforms every COORD entry and clamps it to the board
+- transforms Line (tether) end points stored in PARAM_A/PARAM_B (x10)
+- turns every ANGLE by transforming its direction vector, so rotations
+  add their angle and mirrors reflect it (0 = north, clockwise; tethers
+  use 0 = right, 90 = down)
+- re-anchors Fan/Donut arcs under mirrors, since a clockwise arc becomes
+  counter-clockwise
+
+SIZE is left unchanged by scaling.
+
+With NumPy installed, batches run as one vectorized pass over all boards'
+columns; otherwise a pure-Python path gives the same result.
+
+Usage:
+    from ff14_strategy_transform import flip_vertical, rotate, transform_code
+
+    south = transform_code(north_code, flip_vertical())
+    turned = transform_codes(codes, rotate(90))
+
+Dependencies: ff14_strategy_board.py, ff14_strategy_batch.py, ff14_strategy_types.py,
+              numpy (optional)
+"""
+import math
+import struct
+from typing import Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+from .ff14_strategy_batch import DEFAULT_CHUNK_SIZE, decode_many, encode_many
+from .ff14_strategy_board import (
+    BLOCK_ANGLE, BLOCK_COORD, BLOCK_PARAM_A, BLOCK_PARAM_B, StrategyBoard,
+)
+from .ff14_strategy_types import FLAG_ARC, TYPE_IDS, ids_where
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+BOARD_WIDTH = 512
+BOARD_HEIGHT = 384
+CENTER = (BOARD_WIDTH / 2, BOARD_HEIGHT / 2)
+
+LINE_TYPE_ID = TYPE_IDS['line']
+ARC_TYPE_IDS = ids_where(flags=FLAG_ARC)  # Fan, Donut: PARAM_A is the arc in degrees
+
+_MAX_X10 = BOARD_WIDTH * 10
+_MAX_Y10 = BOARD_HEIGHT * 10
+
+
+class Affine(NamedTuple):
+    """x' = a*x + b*y + tx,  y' = c*x + d*y + ty  (pixels)."""
+    a: float = 1.0
+    b: float = 0.0
+    c: float = 0.0
+    d: float = 1.0
+    tx: float = 0.0
+    ty: float = 0.0
+
+    def __matmul__(self, other: 'Affine') -> 'Affine':
+        """self @ other applies other first, then self."""
+        return Affine(
+            self.a * other.a + self.b * other.c,
+            self.a * other.b + self.b * other.d,
+            self.c * other.a + self.d * other.c,
+            self.c * other.b + self.d * other.d,
+            self.a * other.tx + self.b * other.ty + self.tx,
+            self.c * other.tx + self.d * other.ty + self.ty,
+        )
+
+    def then(self, other: 'Affine') -> 'Affine':
+        """Apply self, then other."""
+        return other @ self
+
+    @property
+    def det(self) -> float:
+        return self.a * self.d - self.b * self.c
+
+    def apply(self, x: float, y: float) -> Tuple[float, float]:
+        return self.a * x + self.b * y + self.tx, self.c * x + self.d * y + self.ty
+
+    def apply10(self, x: float, y: float) -> Tuple[float, float]:
+        """apply() on x10 pixel values, as stored in COORD and Line params."""
+        return (self.a * x + self.b * y + self.tx * 10,
+                self.c * x + self.d * y + self.ty * 10)
+
+
+# ============================================================================
+# Constructors
+# ============================================================================
+
+def _about(center: Tuple[float, float], m: Affine) -> Affine:
+    cx, cy = center
+    return translate(cx, cy) @ m @ translate(-cx, -cy)
+
+
+def identity() -> Affine:
+    return Affine()
+
+
+def translate(dx: float, dy: float) -> Affine:
+    return Affine(tx=dx, ty=dy)
+
+
+def scale(sx: float, sy: float = None, center: Tuple[float, float] = CENTER) -> Affine:
+    return _about(center, Affine(sx, 0.0, 0.0, sx if sy is None else sy))
+
+
+def rotate(degrees: float, center: Tuple[float, float] = CENTER) -> Affine:
+    """Clockwise rotation on screen (+y down) about center."""
+    r = math.radians(degrees)
+    cos, sin = math.cos(r), math.sin(r)
+    # Snap quarter turns so 90/180/270 stay exact
+    cos, sin = round(cos, 12), round(sin, 12)
+    return _about(center, Affine(cos, -sin, sin, cos))
+
+
+def flip_horizontal(center_x: float = CENTER[0]) -> Affine:
+    """Mirror left/right (x -> 2*center_x - x)."""
+    return Affine(a=-1.0, tx=2 * center_x)
+
+
+def flip_vertical(center_y: float = CENTER[1]) -> Affine:
+    """Mirror top/bottom, e.g. north vs south variants (y -> 2*center_y - y)."""
+    return Affine(d=-1.0, ty=2 * center_y)
+
+
+# ============================================================================
+# Angles
+# ============================================================================
+
+def transform_angle(m: Affine, angle: float, east_zero: bool = False) -> int:
+    """Angle (degrees) of a direction after the linear part of m."""
+    r = math.radians(angle)
+    if east_zero:
+        vx, vy = math.cos(r), math.sin(r)
+    else:
+        vx, vy = math.sin(r), -math.cos(r)
+    wx, wy = m.a * vx + m.b * vy, m.c * vx + m.d * vy
+    out = math.atan2(wy, wx) if east_zero else math.atan2(wx, -wy)
+    return round(math.degrees(out)) % 360
+
+
+def _int16(v: int) -> int:
+    return ((v + 0x8000) & 0xffff) - 0x8000
+
+
+# ============================================================================
+# Single Board (pure Python)
+# ============================================================================
+
+def _clamp(v: float, hi: int) -> int:
+    return min(max(int(round(v)), 0), hi)
+
+
+def transform_board(board: StrategyBoard, m: Affine) -> StrategyBoard:
+    """Apply m to a parsed board in place and return it."""
+    data = board.data
+    coord = board.blocks.get(BLOCK_COORD)
+    if coord is not None:
+        for i in range(coord.count):
+            off = coord.offset + i * 4
+            x, y = struct.unpack_from('<hh', data, off)
+            nx, ny = m.apply10(x, y)
+            struct.pack_into('<hh', data, off, _clamp(nx, _MAX_X10), _clamp(ny, _MAX_Y10))
+
+    pa, pb = board.blocks.get(BLOCK_PARAM_A), board.blocks.get(BLOCK_PARAM_B)
+    angle = board.blocks.get(BLOCK_ANGLE)
+    mirrored = m.det < 0
+    for i, type_id in enumerate(board.type_ids):
+        if type_id == LINE_TYPE_ID and pa is not None and pb is not None and i < pa.count:
+            ex = struct.unpack_from('<H', data, pa.offset + i * 2)[0]
+            ey = struct.unpack_from('<H', data, pb.offset + i * 2)[0]
+            nx, ny = m.apply10(ex, ey)
+            struct.pack_into('<H', data, pa.offset + i * 2, _clamp(nx, _MAX_X10))
+            struct.pack_into('<H', data, pb.offset + i * 2, _clamp(ny, _MAX_Y10))
+        if angle is not None and i < angle.count:
+            off = angle.offset + i * 2
+            a = struct.unpack_from('<h', data, off)[0]
+            new = transform_angle(m, a, east_zero=type_id == LINE_TYPE_ID)
+            if mirrored and type_id in ARC_TYPE_IDS and pa is not None and i < pa.count:
+                arc = struct.unpack_from('<H', data, pa.offset + i * 2)[0]
+                if arc < 360:
+                    new = (new - arc) % 360
+            struct.pack_into('<h', data, off, _int16(new))
+    return board
+
+
+# ============================================================================
+# Batches (NumPy fast path)
+# ============================================================================
+
+def _angles_np(m: Affine, angles, east_zero):
+    r = np.radians(angles)
+    vx = np.where(east_zero, np.cos(r), np.sin(r))
+    vy = np.where(east_zero, np.sin(r), -np.cos(r))
+    wx, wy = m.a * vx + m.b * vy, m.c * vx + m.d * vy
+    out = np.where(east_zero, np.arctan2(wy, wx), np.arctan2(wx, -wy))
+    return np.mod(np.rint(np.degrees(out)), 360).astype(np.int64)
+
+
+def _transform_boards_np(boards: Sequence[StrategyBoard], m: Affine):
+    # Writable little-endian views straight into each board's buffer
+    coords, angles, types, arcs, lines = [], [], [], [], []
+    for b in boards:
+        block = b.blocks.get(BLOCK_COORD)
+        if block is not None and block.count:
+            coords.append(np.frombuffer(b.data, dtype='<i2', count=block.count * 2,
+                                        offset=block.offset).reshape(-1, 2))
+        block = b.blocks.get(BLOCK_ANGLE)
+        if block is None or not block.count:
+            continue
+        n = block.count
+        angles.append(np.frombuffer(b.data, dtype='<i2', count=n, offset=block.offset))
+        types.append(np.array(b.type_ids[:n] + [0] * (n - len(b.type_ids[:n])), dtype=np.int64))
+        pa = b.blocks.get(BLOCK_PARAM_A)
+        arcs.append(np.frombuffer(b.data, dtype='<u2', count=n, offset=pa.offset).astype(np.int64)
+                    if pa is not None and pa.count >= n else np.full(n, 360, dtype=np.int64))
+
+    def apply10(pts):
+        # Same operations, in the same order, as Affine.apply10 so both
+        # paths round identically at .5 boundaries
+        x, y = pts[:, 0], pts[:, 1]
+        out = np.stack([m.a * x + m.b * y + m.tx * 10, m.c * x + m.d * y + m.ty * 10], axis=1)
+        return np.clip(np.rint(out), 0, limits)
+
+    limits = np.array([_MAX_X10, _MAX_Y10])
+    if coords:
+        flat = np.concatenate(coords).astype(np.float64)
+        out = apply10(flat).astype('<i2')
+        pos = 0
+        for view in coords:
+            view[:] = out[pos:pos + len(view)]
+            pos += len(view)
+
+    # Line end points (rare): per board, vectorized within the board
+    for b in boards:
+        if LINE_TYPE_ID not in b.type_ids:
+            continue
+        pa, pb = b.blocks.get(BLOCK_PARAM_A), b.blocks.get(BLOCK_PARAM_B)
+        if pa is None or pb is None:
+            continue
+        idx = np.array([i for i, t in enumerate(b.type_ids) if t == LINE_TYPE_ID and i < pa.count])
+        ex = np.frombuffer(b.data, dtype='<u2', count=pa.count, offset=pa.offset)
+        ey = np.frombuffer(b.data, dtype='<u2', count=pb.count, offset=pb.offset)
+        pts = np.stack([ex[idx], ey[idx]], axis=1).astype(np.float64)
+        out = apply10(pts).astype('<u2')
+        ex[idx], ey[idx] = out[:, 0], out[:, 1]
+
+    if angles:
+        flat = np.concatenate(angles).astype(np.float64)
+        t = np.concatenate(types)
+        new = _angles_np(m, flat, t == LINE_TYPE_ID)
+        if m.det < 0:
+            arc = np.concatenate(arcs)
+            fix = np.isin(t, ARC_TYPE_IDS) & (arc < 360)
+            new = np.where(fix, np.mod(new - arc, 360), new)
+        new = new.astype('<i2')
+        pos = 0
+        for view in angles:
+            view[:] = new[pos:pos + len(view)]
+            pos += len(view)
+
+
+def transform_boards(boards: Sequence[StrategyBoard], m: Affine) -> Sequence[StrategyBoard]:
+    """Apply m to many parsed boards in place (vectorized across boards with NumPy)."""
+    if HAS_NUMPY and boards:
+        _transform_boards_np(boards, m)
+    else:
+        for b in boards:
+            transform_board(b, m)
+    return boards
+
+
+# ============================================================================
+# Codes
+# ============================================================================
+
+def transform_code(code: str, m: Affine, seed: int = 10) -> str:
+    """Decode, transform and re-encode one strategy code."""
+    return transform_board(StrategyBoard.from_code(code), m).encode(seed)
+
+
+def transform_codes(codes: Iterable[str], m: Affine, seed: int = 10, mode: str = 'auto',
+                    workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Transform many codes: bulk decode, one transform pass per chunk, bulk encode.
+
+    Raises the first decode/parse error.
+    """
+    def chunks():
+        batch: List[StrategyBoard] = []
+        for result in decode_many(codes, mode, workers, chunk_size):
+            if not result.ok:
+                raise result.error
+            batch.append(StrategyBoard(result.value))
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def binaries():
+        for batch in chunks():
+            for b in transform_boards(batch, m):
+                yield b.to_bytes()
+
+    for result in encode_many(binaries(), seed, mode, workers, chunk_size):
+        if not result.ok:
+            raise result.error
+        yield result.value
@@ -0,0 +1,364 @@
+"""
+FF14 Strategy Type Registry
+
+Single source of truth for object type IDs (docs/OBJECT_TYPES.md). One
+source table is compiled at import into:
+
+- tuples indexed by type ID: display name, key, category, role, shape,
+  icon and flags (O(1) lookups, no hashing)
+- one dict of interned names -> ID holding every accepted spelling
+  (key, display name, upper-case key, aliases), so resolving a name is a
+  single exact probe; normalisation only runs for unusual spellings
+
+Keys are lower snake case display names ("dark_knight", "circle_aoe",
+"waymark_a"). Aliases keep the names used by earlier versions of the
+generator and ff14_job_ids ("marker", "physcial_ranged_dps").
+
+Shapes follow docs/OBJECT_TYPES.md:
+- circle:  radius = SIZE x 2.47 px
+- fan:     SIZE radius, PARAM_A arc
+- donut:   SIZE radius, PARAM_A arc, inner radius = SIZE x PARAM_B / 100
+- rect:    PARAM_A x PARAM_B rectangle
+- tether:  center to the PARAM_A/B end point (x10), PARAM_C thick
+- text:    Text object (content in a text block)
+- point:   icons, markers, waymarks
+
+Usage:
+    from ff14_strategy_types import type_id, type_name, SHAPES, SHAPE_DONUT
+
+    type_id('Dark Knight')        # 0x26
+    type_name(0x09)               # 'Circle AOE'
+    SHAPES[0x11] == SHAPE_DONUT   # True
+    ids_where(category=CATEGORY_JOB)
+
+Dependencies: None
+"""
+import sys
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+TABLE_SIZE = 256  # type IDs are one byte in practice
+
+# Categories (docs/OBJECT_TYPES.md sections)
+CATEGORY_JOB = 'job'
+CATEGORY_CLASS = 'class'
+CATEGORY_ROLE = 'role'
+CATEGORY_AOE = 'aoe'
+CATEGORY_MECHANIC = 'mechanic'
+CATEGORY_MARKER = 'marker'
+CATEGORY_WAYMARK = 'waymark'
+CATEGORY_TARGET = 'target'
+CATEGORY_ENEMY = 'enemy'
+CATEGORY_FIELD = 'field'
+CATEGORY_SIGN = 'sign'
+CATEGORY_TEXT = 'text'
+
+# Combat roles of jobs, classes and generic role icons
+ROLE_TANK = 'tank'
+ROLE_HEALER = 'healer'
+ROLE_DPS = 'dps'
+ROLE_MELEE = 'melee'
+ROLE_RANGED = 'ranged'
+ROLE_PHYSICAL_RANGED = 'physical_ranged'
+ROLE_MAGICAL_RANGED = 'magical_ranged'
+ROLE_LIMITED = 'limited'
+
+SHAPE_POINT = 'point'
+SHAPE_CIRCLE = 'circle'
+SHAPE_FAN = 'fan'
+SHAPE_DONUT = 'donut'
+SHAPE_RECT = 'rect'
+SHAPE_TETHER = 'tether'
+SHAPE_TEXT = 'text'
+
+FLAG_PLAYER = 0x01   # job, class or role icon
+FLAG_AREA = 0x02     # drawn as a sized area (circle, fan, donut, rect, tether)
+FLAG_ICON = 0x04     # has an icon in assets/icons (possibly shared, see ICONS)
+FLAG_ARC = 0x08      # PARAM_A is an arc in degrees
+FLAG_PARAMS = 0x10   # uses PARAM_A/B/C
+
+_SHAPE_FLAGS = {
+    SHAPE_POINT: 0, SHAPE_TEXT: 0,
+    SHAPE_CIRCLE: FLAG_AREA,
+    SHAPE_FAN: FLAG_AREA | FLAG_ARC | FLAG_PARAMS,
+    SHAPE_DONUT: FLAG_AREA | FLAG_ARC | FLAG_PARAMS,
+    SHAPE_RECT: FLAG_AREA | FLAG_PARAMS,
+    SHAPE_TETHER: FLAG_AREA | FLAG_PARAMS,
+}
+
+_J, _C, _R = CATEGORY_JOB, CATEGORY_CLASS, CATEGORY_ROLE
+_PT, _CI, _RE = SHAPE_POINT, SHAPE_CIRCLE, SHAPE_RECT
+
+
+class TypeInfo(NamedTuple):
+    """One source table row."""
+    type_id: int
+    name: str
+    category: str
+    role: Optional[str] = None
+    shape: str = SHAPE_POINT
+    icon: Optional[int] = None     # type ID whose icon is drawn
+    aliases: Tuple[str, ...] = ()
+
+
+# ============================================================================
+# Source Table (docs/OBJECT_TYPES.md)
+# ============================================================================
+
+SOURCE = (
+    # 1. Jobs
+    TypeInfo(0x1B, 'Paladin', _J, ROLE_TANK, icon=0x1B, aliases=('pld',)),
+    TypeInfo(0x1D, 'Warrior', _J, ROLE_TANK, icon=0x1D, aliases=('war',)),
+    TypeInfo(0x26, 'Dark Knight', _J, ROLE_TANK, icon=0x26, aliases=('drk',)),
+    TypeInfo(0x2B, 'Gunbreaker', _J, ROLE_TANK, icon=0x2B, aliases=('gnb',)),
+    TypeInfo(0x20, 'White Mage', _J, ROLE_HEALER, icon=0x20, aliases=('whm',)),
+    TypeInfo(0x23, 'Scholar', _J, ROLE_HEALER, icon=0x23, aliases=('sch',)),
+    TypeInfo(0x27, 'Astrologian', _J, ROLE_HEALER, icon=0x27, aliases=('ast',)),
+    TypeInfo(0x2E, 'Sage', _J, ROLE_HEALER, icon=0x2E, aliases=('sge',)),
+    TypeInfo(0x1C, 'Monk', _J, ROLE_MELEE, icon=0x1C, aliases=('mnk',)),
+    TypeInfo(0x1E, 'Dragoon', _J, ROLE_MELEE, icon=0x1E, aliases=('drg',)),
+    TypeInfo(0x24, 'Ninja', _J, ROLE_MELEE, icon=0x24, aliases=('nin',)),
+    TypeInfo(0x28, 'Samurai', _J, ROLE_MELEE, icon=0x28, aliases=('sam',)),
+    TypeInfo(0x2D, 'Reaper', _J, ROLE_MELEE, icon=0x2D, aliases=('rpr',)),
+    TypeInfo(0x65, 'Viper', _J, ROLE_MELEE, icon=0x65, aliases=('vpr',)),
+    TypeInfo(0x1F, 'Bard', _J, ROLE_PHYSICAL_RANGED, icon=0x1F, aliases=('brd',)),
+    TypeInfo(0x25, 'Machinist', _J, ROLE_PHYSICAL_RANGED, icon=0x25, aliases=('mch',)),
+    TypeInfo(0x2C, 'Dancer', _J, ROLE_PHYSICAL_RANGED, icon=0x2C, aliases=('dnc',)),
+    TypeInfo(0x21, 'Black Mage', _J, ROLE_MAGICAL_RANGED, icon=0x21, aliases=('blm',)),
+    TypeInfo(0x22, 'Summoner', _J, ROLE_MAGICAL_RANGED, icon=0x22, aliases=('smn',)),
+    TypeInfo(0x29, 'Red Mage', _J, ROLE_MAGICAL_RANGED, icon=0x29, aliases=('rdm',)),
+    TypeInfo(0x66, 'Pictomancer', _J, ROLE_MAGICAL_RANGED, icon=0x66, aliases=('pct',)),
+    TypeInfo(0x2A, 'Blue Mage', _J, ROLE_LIMITED, icon=0x2A, aliases=('blu',)),
+
+    # 2. Classes
+    TypeInfo(0x12, 'Gladiator', _C, ROLE_TANK, icon=0x12, aliases=('gla',)),
+    TypeInfo(0x13, 'Pugilist', _C, ROLE_MELEE, icon=0x13, aliases=('pgl',)),
+    TypeInfo(0x14, 'Marauder', _C, ROLE_TANK, icon=0x14, aliases=('mrd',)),
+    TypeInfo(0x15, 'Lancer', _C, ROLE_MELEE, icon=0x15, aliases=('lnc',)),
+    TypeInfo(0x16, 'Archer', _C, ROLE_PHYSICAL_RANGED, icon=0x16, aliases=('arc',)),
+    TypeInfo(0x17, 'Conjurer', _C, ROLE_HEALER, icon=0x17, aliases=('cnj',)),
+    TypeInfo(0x18, 'Thaumaturge', _C, ROLE_MAGICAL_RANGED, icon=0x18, aliases=('thm',)),
+    TypeInfo(0x19, 'Arcanist', _C, ROLE_MAGICAL_RANGED, icon=0x19, aliases=('acn',)),
+    TypeInfo(0x1A, 'Rogue', _C, ROLE_MELEE, icon=0x1A, aliases=('rog',)),
+
+    # 3. Generic roles (numbered and sub-roles share the generic icon)
+    TypeInfo(0x2F, 'Tank', _R, ROLE_TANK, icon=0x2F),
+    TypeInfo(0x30, 'Tank 1', _R, ROLE_TANK, icon=0x2F, aliases=('mt',)),
+    TypeInfo(0x31, 'Tank 2', _R, ROLE_TANK, icon=0x2F, aliases=('st',)),
+    TypeInfo(0x32, 'Healer', _R, ROLE_HEALER, icon=0x32),
+    TypeInfo(0x33, 'Healer 1', _R, ROLE_HEALER, icon=0x32, aliases=('h1',)),
+    TypeInfo(0x34, 'Healer 2', _R, ROLE_HEALER, icon=0x32, aliases=('h2',)),
+    TypeInfo(0x35, 'DPS', _R, ROLE_DPS, icon=0x35),
+    TypeInfo(0x36, 'DPS 1', _R, ROLE_DPS, icon=0x35, aliases=('d1',)),
+    TypeInfo(0x37, 'DPS 2', _R, ROLE_DPS, icon=0x35, aliases=('d2',)),
+    TypeInfo(0x38, 'DPS 3', _R, ROLE_DPS, icon=0x35, aliases=('d3',)),
+    TypeInfo(0x39, 'DPS 4', _R, ROLE_DPS, icon=0x35, aliases=('d4',)),
+    TypeInfo(0x76, 'Melee DPS', _R, ROLE_MELEE, icon=0x35),
+    TypeInfo(0x77, 'Ranged DPS', _R, ROLE_RANGED, icon=0x35),
+    TypeInfo(0x78, 'Physical Ranged DPS', _R, ROLE_PHYSICAL_RANGED, icon=0x35,
+             aliases=('physcial_ranged_dps',)),
+    TypeInfo(0x79, 'Magical Ranged DPS', _R, ROLE_MAGICAL_RANGED, icon=0x35),
+    TypeInfo(0x7A, 'Pure Healer', _R, ROLE_HEALER, icon=0x32),
+    TypeInfo(0x7B, 'Barrier Healer', _R, ROLE_HEALER, icon=0x32),
+
+    # 4. Attack markers & mechanics
+    TypeInfo(0x01, 'Line AOE', CATEGORY_AOE, shape=_RE),
+    TypeInfo(0x09, 'Circle AOE', CATEGORY_AOE, shape=_CI),
+    TypeInfo(0x0A, 'Fan AOE', CATEGORY_AOE, shape=SHAPE_FAN, aliases=('cone_aoe',)),
+    TypeInfo(0x0B, 'General Marker', CATEGORY_MARKER, shape=_RE, aliases=('marker',)),
+    TypeInfo(0x0D, 'Gaze', CATEGORY_MECHANIC),
+    TypeInfo(0x0E, 'Stack', CATEGORY_MARKER, shape=_CI),
+    TypeInfo(0x0F, 'Line Stack', CATEGORY_MARKER, shape=_RE),
+    TypeInfo(0x10, 'Proximity', CATEGORY_AOE, shape=_CI),
+    TypeInfo(0x11, 'Donut AOE', CATEGORY_AOE, shape=SHAPE_DONUT),
+    TypeInfo(0x6A, 'Stack (Multi-hit)', CATEGORY_MARKER, aliases=('stack_multi',)),
+    TypeInfo(0x6B, 'Proximity (Player)', CATEGORY_MARKER),
+    TypeInfo(0x6C, 'Tankbuster (Single)', CATEGORY_MARKER, aliases=('tankbuster',)),
+    TypeInfo(0x6D, 'Radial Knockback', CATEGORY_MECHANIC, shape=_CI, aliases=('radial_kb',)),
+    TypeInfo(0x6E, 'Linear Knockback', CATEGORY_MECHANIC, aliases=('linear_kb',)),
+    TypeInfo(0x6F, 'Tower', CATEGORY_MECHANIC, shape=_CI),
+    TypeInfo(0x70, 'Targeting Indicator', CATEGORY_MARKER),
+    TypeInfo(0x7E, 'Moving Circle AOE', CATEGORY_AOE, shape=_CI),
+    TypeInfo(0x7F, '1-Person AOE', CATEGORY_AOE, shape=_CI),
+    TypeInfo(0x80, '2-Person AOE', CATEGORY_AOE, shape=_CI),
+    TypeInfo(0x81, '3-Person AOE', CATEGORY_AOE, shape=_CI),
+    TypeInfo(0x82, '4-Person AOE', CATEGORY_AOE, shape=_CI),
+
+    # 5. Waymarks, target markers, lock-ons, enemies & effects
+    TypeInfo(0x4F, 'Waymark A', CATEGORY_WAYMARK),
+    TypeInfo(0x50, 'Waymark B', CATEGORY_WAYMARK),
+    TypeInfo(0x51, 'Waymark C', CATEGORY_WAYMARK),
+    TypeInfo(0x52, 'Waymark D', CATEGORY_WAYMARK),
+    TypeInfo(0x53, 'Waymark 1', CATEGORY_WAYMARK),
+    TypeInfo(0x54, 'Waymark 2', CATEGORY_WAYMARK),
+    TypeInfo(0x55, 'Waymark 3', CATEGORY_WAYMARK),
+    TypeInfo(0x56, 'Waymark 4', CATEGORY_WAYMARK),
+    TypeInfo(0x41, 'Attack 1', CATEGORY_TARGET),
+    TypeInfo(0x42, 'Attack 2', CATEGORY_TARGET),
+    TypeInfo(0x43, 'Attack 3', CATEGORY_TARGET),
+    TypeInfo(0x44, 'Attack 4', CATEGORY_TARGET),
+    TypeInfo(0x45, 'Attack 5', CATEGORY_TARGET),
+    TypeInfo(0x73, 'Attack 6', CATEGORY_TARGET),
+    TypeInfo(0x74, 'Attack 7', CATEGORY_TARGET),
+    TypeInfo(0x75, 'Attack 8', CATEGORY_TARGET),
+    TypeInfo(0x46, 'Bind 1', CATEGORY_TARGET),
+    TypeInfo(0x47, 'Bind 2', CATEGORY_TARGET),
+    TypeInfo(0x48, 'Bind 3', CATEGORY_TARGET),
+    TypeInfo(0x49, 'Ignore 1', CATEGORY_TARGET),
+    TypeInfo(0x4A, 'Ignore 2', CATEGORY_TARGET),
+    TypeInfo(0x4B, 'Square', CATEGORY_TARGET),
+    TypeInfo(0x4C, 'Circle', CATEGORY_TARGET),
+    TypeInfo(0x4D, 'Plus', CATEGORY_TARGET),
+    TypeInfo(0x4E, 'Triangle', CATEGORY_TARGET),
+    TypeInfo(0x83, 'Red Lock-on', CATEGORY_TARGET),
+    TypeInfo(0x84, 'Blue Lock-on', CATEGORY_TARGET),
+    TypeInfo(0x85, 'Purple Lock-on', CATEGORY_TARGET),
+    TypeInfo(0x86, 'Green Lock-on', CATEGORY_TARGET),
+    TypeInfo(0x71, 'Enhancement Effect', CATEGORY_ENEMY, aliases=('enhancement',)),
+    TypeInfo(0x72, 'Enfeeblement Effect', CATEGORY_ENEMY, aliases=('enfeeblement',)),
+    TypeInfo(0x3C, 'Small Enemy', CATEGORY_ENEMY),
+    TypeInfo(0x3E, 'Medium Enemy', CATEGORY_ENEMY),
+    TypeInfo(0x40, 'Large Enemy', CATEGORY_ENEMY),
+
+    # 6. Fields, lines, arrows, rotation, highlighted shapes, signs, text
+    TypeInfo(0x04, 'Checkered Circle', CATEGORY_FIELD),
+    TypeInfo(0x08, 'Checkered Square', CATEGORY_FIELD),
+    TypeInfo(0x7C, 'Grey Circle', CATEGORY_FIELD),
+    TypeInfo(0x7D, 'Grey Square', CATEGORY_FIELD),
+    TypeInfo(0x0C, 'Line', CATEGORY_SIGN, shape=SHAPE_TETHER, aliases=('tether',)),
+    TypeInfo(0x5E, 'Up Arrow', CATEGORY_SIGN),
+    TypeInfo(0x67, 'Rotate', CATEGORY_SIGN),
+    TypeInfo(0x8B, 'Rotate CW', CATEGORY_SIGN),
+    TypeInfo(0x8C, 'Rotate CCW', CATEGORY_SIGN),
+    TypeInfo(0x87, 'Highlighted Circle', CATEGORY_SIGN),
+    TypeInfo(0x88, 'Highlighted X', CATEGORY_SIGN),
+    TypeInfo(0x89, 'Highlighted Square', CATEGORY_SIGN),
+    TypeInfo(0x8A, 'Highlighted Triangle', CATEGORY_SIGN),
+    TypeInfo(0x57, 'Circle Sign', CATEGORY_SIGN),
+    TypeInfo(0x58, 'X Sign', CATEGORY_SIGN),
+    TypeInfo(0x59, 'Triangle Sign', CATEGORY_SIGN),
+    TypeInfo(0x5A, 'Square Sign', CATEGORY_SIGN),
+    TypeInfo(0x64, 'Text', CATEGORY_TEXT, shape=SHAPE_TEXT),
+)
+
+
+# ============================================================================
+# Compiled Tables
+# ============================================================================
+
+def normalize(name: str) -> str:
+    """Lookup key for a spelling: "Dark Knight", "DARK_KNIGHT", "dark-knight" -> "dark_knight"."""
+    key = name.strip().lower()
+    for ch in '()':
+        key = key.replace(ch, '')
+    for ch in ' -':
+        key = key.replace(ch, '_')
+    return sys.intern(key)
+
+
+def _compile():
+    names = [None] * TABLE_SIZE
+    keys = [None] * TABLE_SIZE
+    categories = [None] * TABLE_SIZE
+    roles = [None] * TABLE_SIZE
+    shapes = [SHAPE_POINT] * TABLE_SIZE
+    icons = [None] * TABLE_SIZE
+    flags = [0] * TABLE_SIZE
+    ids = {}
+
+    for info in SOURCE:
+        i = info.type_id
+        if names[i] is not None:
+            raise ValueError(f"Duplicate type ID 0x{i:02x} in the type table")
+        key = normalize(info.name)
+        names[i] = sys.intern(info.name)
+        keys[i] = key
+        categories[i] = info.category
+        roles[i] = info.role
+        shapes[i] = info.shape
+        icons[i] = info.icon
+        flags[i] = (_SHAPE_FLAGS[info.shape]
+                    | (FLAG_PLAYER if info.category in (_J, _C, _R) else 0)
+                    | (FLAG_ICON if info.icon is not None else 0))
+
+        spellings = [key, info.name, key.upper()]
+        for alias in info.aliases:
+            alias = normalize(alias)
+            spellings += [alias, alias.upper()]
+        for spelling in spellings:
+            spelling = sys.intern(spelling)
+            other = ids.setdefault(spelling, i)
+            if other != i:
+                raise ValueError(f"Type name {spelling!r} maps to 0x{other:02x} and 0x{i:02x}")
+
+    return (tuple(names), tuple(keys), tuple(categories), tuple(roles), tuple(shapes),
+            tuple(icons), tuple(flags), ids)
+
+
+NAMES, KEYS, CATEGORIES, ROLES, SHAPES, ICONS, FLAGS, _IDS = _compile()
+
+# Canonical key -> ID (no aliases), e.g. for listing the known types
+TYPE_IDS: Dict[str, int] = {KEYS[i]: i for i in range(TABLE_SIZE) if KEYS[i] is not None}
+
+
+# ============================================================================
+# Lookups
+# ============================================================================
+
+def find_type_id(name: str) -> Optional[int]:
+    """Type ID for any accepted spelling, or None."""
+    type_id = _IDS.get(name)
+    if type_id is None:
+        type_id = _IDS.get(normalize(name))
+    return type_id
+
+
+def type_id(t: Union[int, str]) -> int:
+    """Type ID from a raw ID or a name ("Dark Knight", "dark_knight", "DARK_KNIGHT", alias)."""
+    if isinstance(t, int):
+        return t
+    found = _IDS.get(t)
+    if found is None:
+        found = _IDS.get(normalize(t))
+        if found is None:
+            raise ValueError(f"Unknown object type {t!r}")
+    return found
+
+
+def type_name(type_id: int) -> str:
+    """Display name ("Circle AOE"), or "Type 0x.." for unknown IDs."""
+    name = NAMES[type_id] if 0 <= type_id < TABLE_SIZE else None
+    return name if name is not None else f"Type 0x{type_id:02x}"
+
+
+def type_key(type_id: int) -> Optional[str]:
+    """Canonical key ("circle_aoe"), or None for unknown IDs."""
+    return KEYS[type_id] if 0 <= type_id < TABLE_SIZE else None
+
+
+def shape_of(type_id: int) -> str:
+    return SHAPES[type_id] if 0 <= type_id < TABLE_SIZE else SHAPE_POINT
+
+
+def flags_of(type_id: int) -> int:
+    return FLAGS[type_id] if 0 <= type_id < TABLE_SIZE else 0
+
+
+def is_player(type_id: int) -> bool:
+    return bool(flags_of(type_id) & FLAG_PLAYER)
+
+
+def is_area(type_id: int) -> bool:
+    return bool(flags_of(type_id) & FLAG_AREA)
+
+
+def ids_where(category: str = None, role: str = None, shape: str = None,
+              flags: int = 0) -> Tuple[int, ...]:
+    """Known type IDs (ascending) matching every given attribute."""
+    return tuple(
+        i for i in range(TABLE_SIZE)
+        if NAMES[i] is not None
+        and (category is None or CATEGORIES[i] == category)
+        and (role is None or ROLES[i] == role)
+        and (shape is None or SHAPES[i] == shape)
+        and FLAGS[i] & flags == flags
+    )
@@ -4,10 +4,95 @@ FF14 Strategy Code Utilities
 Functions for modifying strategy code parameters including coordinates,
 object size, angle, and transparency.
 
-Dependencies: ff14_strategy.py (decode_strategy, encode_strategy)
+Blocks are located through the single-pass parser in ff14_strategy_board;
+signature scanning is only used as a fallback for binaries it rejects.
+
+Dependencies: ff14_strategy.py (decode_strategy, encode_strategy),
+              ff14_strategy_board.py (StrategyBoard)
 """
 import struct
+from array import array
 from .ff14_strategy import decode_strategy, encode_strategy
+from .ff14_strategy_board import (
+    StrategyBoard, try_parse_board, NATIVE_LITTLE_ENDIAN,
+    BLOCK_ANGLE, BLOCK_COORD, BLOCK_SIZE, BLOCK_TRANS,
+)
+
+
+_PARAM_BLOCK_IDS = {
+    'angle': BLOCK_ANGLE,
+    'size': BLOCK_SIZE,
+    'trans': BLOCK_TRANS,
+}
+
+
+def _parse_code(code: str, num_objs: int = None):
+    """
+    Decode and parse a code, optionally checking the object count.
+
+    Returns (board, None), or (None, bytearray of the binary) when the
+    parser rejects it; callers then fall back to signature scanning.
+    """
+    data = decode_strategy(code)
+    board = try_parse_board(data)
+    if board is None:
+        return None, bytearray(data)
+    if num_objs is not None and board.count != num_objs:
+        raise ValueError(f"Expected {num_objs} objects, strategy has {board.count}")
+    return board, None
+
+
+_BLOCK_LABELS = {'size': 'Size', 'angle': 'Angle', 'trans': 'Transparency'}
+
+
+def _scan_patch(data: bytearray, block_type: str, num_objs: int, values: list[int],
+                required: bool = True):
+    """Write a column found by signature scan (binaries the parser rejects)."""
+    offset = _find_param_block(data, block_type, num_objs)
+    if offset == -1:
+        if required:
+            raise ValueError(f"{_BLOCK_LABELS[block_type]} parameter block not found")
+        return
+    for i, v in enumerate(values):
+        if block_type == 'size':
+            data[offset + i] = v
+        elif block_type == 'angle':
+            struct.pack_into('<h', data, offset + i * 2, v)
+        else:
+            data[offset + i * 4 + 3] = v
+
+
+# ============================================================================
+# Column Writers
+# ============================================================================
+# Whole columns are written through the board's memoryview views, so one
+# slice assignment patches the decoded buffer in place.
+
+def _write_sizes(board: StrategyBoard, sizes: list[int]):
+    if not NATIVE_LITTLE_ENDIAN:
+        for i, v in enumerate(sizes):
+            board.set_size(i, v)
+        return
+    board.size_view()[:len(sizes)] = bytes(sizes)
+
+
+def _write_angles(board: StrategyBoard, angles: list[int]):
+    if not NATIVE_LITTLE_ENDIAN:
+        for i, v in enumerate(angles):
+            board.set_angle(i, v)
+        return
+    # Wrap to int16 (0-360 and negative angles share the same bits)
+    values = array('h', [((v + 0x8000) & 0xffff) - 0x8000 for v in angles])
+    board.angle_view()[:len(values)] = values
+
+
+def _write_alphas(board: StrategyBoard, trans_values: list[int]):
+    if not NATIVE_LITTLE_ENDIAN:
+        for i, v in enumerate(trans_values):
+            board.set_alpha(i, v)
+        return
+    # Alpha is byte 3 of each RGBA entry
+    board.column(BLOCK_TRANS)[3:len(trans_values) * 4:4] = bytes(trans_values)
 
 
 # ============================================================================
@@ -31,6 +116,13 @@ def _find_param_block(data: bytes, block_type: str, num_objs: int) -> int:
     Returns the offset of the data section (after the 6-byte header),
     or -1 if not found.
     """
+    board = try_parse_board(data)
+    if board is not None:
+        if block_type not in _PARAM_BLOCK_IDS or board.count != num_objs:
+            return -1
+        return board.offset(_PARAM_BLOCK_IDS[block_type])
+
+    # Fallback: signature scan for binaries the parser rejects
     sigs = _get_param_signatures(num_objs)
     if block_type not in sigs:
         return -1
@@ -46,10 +138,14 @@ def find_coord_block(data: bytes, num_objs: int) -> int:
     """
     Locate the coordinate block in strategy binary data.
     
-    Uses object-count-specific footer signature (05 00 03 00 NN 00)
-    for high precision, with fallback to general signature search or
-    value-based detection.
+    Uses the parsed block index; for binaries the parser rejects, falls
+    back to the object-count-specific signature (05 00 03 00 NN 00),
+    a general signature search, or value-based detection.
     """
+    board = try_parse_board(data)
+    if board is not None and BLOCK_COORD in board.blocks:
+        return board.offset(BLOCK_COORD)
+
     # Method 1: Precise match with object count
     target_sig = struct.pack('<HHH', 0x0005, 0x0003, num_objs)
     pos = data.find(target_sig)
@@ -78,8 +174,7 @@ def find_coord_block(data: bytes, num_objs: int) -> int:
 
     # Method 3: Value-based detection (fallback)
     for i in range(40, len(data) - num_objs * 4):
-        x = struct.unpack('<h', data[i:i+2])[0]
-        y = struct.unpack('<h', data[i+2:i+4])[0]
+        x, y = struct.unpack_from('<hh', data, i)
         # Real coords are usually not all near-zero and within board bounds
         if 500 <= x <= 5000 and 500 <= y <= 3800:
             return i
@@ -100,20 +195,17 @@ def modify_coordinates(code: str, obj_index: int, new_x: float, new_y: float) ->
     Returns:
         Modified strategy code string
     """
-    data = bytearray(decode_strategy(code))
-    
-    # Estimate object count from data size
-    # Rough estimate: (size - 100) / 10
+    board, data = _parse_code(code)
+    if board is not None:
+        board.set_coord(obj_index, new_x, new_y)
+        return board.encode()
+
+    # Unparseable binary: estimate the object count and scan for the block
     num_objs = max(1, (len(data) - 100) // 10)
-    
     coord_start = find_coord_block(data, num_objs)
     if coord_start == -1:
         raise ValueError("Could not locate coordinate block")
-    
-    offset = coord_start + obj_index * 4
-    data[offset:offset+2] = struct.pack('<h', int(new_x * 10))
-    data[offset+2:offset+4] = struct.pack('<h', int(new_y * 10))
-    
+    struct.pack_into('<hh', data, coord_start + obj_index * 4, int(new_x * 10), int(new_y * 10))
     return encode_strategy(bytes(data))
 
 
@@ -140,16 +232,13 @@ def modify_sizes(code: str, num_objs: int, sizes: list[int]) -> str:
     if len(sizes) != num_objs:
         raise ValueError(f"Expected {num_objs} sizes, got {len(sizes)}")
     
-    data = bytearray(decode_strategy(code))
-    offset = _find_param_block(data, 'size', num_objs)
-    
-    if offset == -1:
-        raise ValueError("Size parameter block not found")
+    board, data = _parse_code(code, num_objs)
+    if board is None:
+        _scan_patch(data, 'size', num_objs, sizes)
+        return encode_strategy(bytes(data))
+    _write_sizes(board, sizes)
     
-    for i, size in enumerate(sizes):
-        data[offset + i] = size
-    
-    return encode_strategy(bytes(data))
+    return board.encode()
 
 
 # ============================================================================
@@ -174,16 +263,13 @@ def modify_angles(code: str, num_objs: int, angles: list[int]) -> str:
     if len(angles) != num_objs:
         raise ValueError(f"Expected {num_objs} angles, got {len(angles)}")
     
-    data = bytearray(decode_strategy(code))
-    offset = _find_param_block(data, 'angle', num_objs)
+    board, data = _parse_code(code, num_objs)
+    if board is None:
+        _scan_patch(data, 'angle', num_objs, angles)
+        return encode_strategy(bytes(data))
+    _write_angles(board, angles)
     
-    if offset == -1:
-        raise ValueError("Angle parameter block not found")
-    
-    for i, angle in enumerate(angles):
-        data[offset + i*2 : offset + i*2 + 2] = struct.pack('<H', angle)
-    
-    return encode_strategy(bytes(data))
+    return board.encode()
 
 
 # ============================================================================
@@ -209,16 +295,13 @@ def modify_transparency(code: str, num_objs: int, trans_values: list[int]) -> st
     if len(trans_values) != num_objs:
         raise ValueError(f"Expected {num_objs} values, got {len(trans_values)}")
     
-    data = bytearray(decode_strategy(code))
-    offset = _find_param_block(data, 'trans', num_objs)
-    
-    if offset == -1:
-        raise ValueError("Transparency parameter block not found")
+    board, data = _parse_code(code, num_objs)
+    if board is None:
+        _scan_patch(data, 'trans', num_objs, trans_values)
+        return encode_strategy(bytes(data))
+    _write_alphas(board, trans_values)
     
-    for i, trans in enumerate(trans_values):
-        data[offset + i*4 + 3] = trans
-    
-    return encode_strategy(bytes(data))
+    return board.encode()
 
 
 # ============================================================================
@@ -245,33 +328,34 @@ def modify_all_params(
     Returns:
         Modified strategy code string
     """
-    data = bytearray(decode_strategy(code))
+    board, data = _parse_code(code, num_objs)
+    if board is None:
+        for block_type, values in (('size', sizes), ('angle', angles), ('trans', trans_values)):
+            if values:
+                if len(values) != num_objs:
+                    raise ValueError(f"Expected {num_objs} {_BLOCK_LABELS[block_type].lower()} values")
+                _scan_patch(data, block_type, num_objs, values, required=False)
+        return encode_strategy(bytes(data))
     
     if sizes:
         if len(sizes) != num_objs:
             raise ValueError(f"Expected {num_objs} sizes")
-        offset = _find_param_block(data, 'size', num_objs)
-        if offset != -1:
-            for i, v in enumerate(sizes):
-                data[offset + i] = v
+        if BLOCK_SIZE in board.blocks:
+            _write_sizes(board, sizes)
     
     if angles:
         if len(angles) != num_objs:
             raise ValueError(f"Expected {num_objs} angles")
-        offset = _find_param_block(data, 'angle', num_objs)
-        if offset != -1:
-            for i, v in enumerate(angles):
-                data[offset + i*2 : offset + i*2 + 2] = struct.pack('<H', v)
+        if BLOCK_ANGLE in board.blocks:
+            _write_angles(board, angles)
     
     if trans_values:
         if len(trans_values) != num_objs:
             raise ValueError(f"Expected {num_objs} transparency values")
-        offset = _find_param_block(data, 'trans', num_objs)
-        if offset != -1:
-            for i, v in enumerate(trans_values):
-                data[offset + i*4 + 3] = v
+        if BLOCK_TRANS in board.blocks:
+            _write_alphas(board, trans_values)
     
-    return encode_strategy(bytes(data))
+    return board.encode()
 
 
 # ============================================================================
@@ -287,21 +371,32 @@ def analyze_strategy(code: str) -> dict:
         - size: Raw binary size in bytes
         - title_offset: Offset of title string (typically 28)
         - title: Extracted title string if found
+        - object_count: Number of objects
+        - type_ids: Object type IDs in board order
+        - blocks: Block name -> data offset
+        (only size, title_offset and title for binaries the parser rejects)
     """
     data = decode_strategy(code)
+    board = try_parse_board(data)
+    if board is None:
+        # Partial result for binaries the parser rejects
+        result = {'size': len(data), 'title_offset': 28, 'title': None}
+        try:
+            end = data.index(0, 28)
+            result['title'] = data[28:end].decode('utf-8')
+        except (ValueError, UnicodeDecodeError):
+            pass
+        return result
+
     result = {
-        'size': len(data),
+        'size': len(board.data),
         'title_offset': 28,
-        'title': None,
+        'title': board.title,
+        'object_count': board.count,
+        'type_ids': list(board.type_ids),
+        'blocks': {b.name: b.offset for b in board.blocks.values()},
     }
     
-    # Extract title (null-terminated UTF-8 string at offset 28)
-    try:
-        end = data.index(0, 28)
-        result['title'] = data[28:end].decode('utf-8')
-    except (ValueError, UnicodeDecodeError):
-        pass
-    
     return result
 
 
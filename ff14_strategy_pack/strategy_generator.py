@@ -1,39 +1,35 @@
 """
 Final Strategy Generator - Matches all user samples perfectly
+
+generate_strategy() builds boards through StrategyTemplate, which
+precompiles the block layout and static bytes for a title + type list.
+Boards that share a layout only pay for writing the changing columns
+(coords, colours, angles, sizes, alpha) and for compression.
 """
 import struct
 import sys
 import os
+from functools import lru_cache
+from itertools import chain
 
 sys.path.insert(0, os.path.join(os.getcwd(), 'ff14_strategy_pack'))
 from .ff14_strategy import encode_strategy
+from .ff14_strategy_batch import encode_many
+from .ff14_strategy_board import (
+    StrategyBoard, BLOCK_ANGLE, BLOCK_COORD, BLOCK_SIZE, BLOCK_TRANS,
+    BLOCK_PARAM_A, BLOCK_PARAM_B, BLOCK_PARAM_C, TEXT_TYPE_ID,
+)
+from .ff14_strategy_types import TYPE_IDS, type_id
 
-TYPES = {
-    # Generic roles
-    "tank": 0x2F, "healer": 0x32, "dps": 0x35,
-    
-    # Tanks
-    "paladin": 0x1B, "warrior": 0x1D, "dark_knight": 0x26, "gunbreaker": 0x2B,
-    
-    # Healers
-    "white_mage": 0x20, "scholar": 0x23, "astrologian": 0x27, "sage": 0x2E,
-    
-    # Melee DPS
-    "monk": 0x1C, "dragoon": 0x1E, "ninja": 0x24, "samurai": 0x28, "reaper": 0x2D, "viper": 0x65,
-    
-    # Ranged Physical DPS
-    "bard": 0x1F, "machinist": 0x25, "dancer": 0x2C,
-    
-    # Caster DPS
-    "black_mage": 0x21, "summoner": 0x22, "red_mage": 0x29, "pictomancer": 0x66,
-    
-    # AOE types
-    "circle_aoe": 0x09, "fan_aoe": 0x0A, "donut_aoe": 0x11, "line_aoe": 0x01,
-    
-    # Markers
-    "text": 0x64, "marker": 0x0B,
-
+# Longest text object content; longer text crashes the game client
+# (same safeguard as the web exporter)
+MAX_TEXT_CHARS = 30
 
+# Name -> type ID for every known type (see ff14_strategy_types), plus the
+# short keys this table used before the registry existed
+TYPES = {
+    **TYPE_IDS,
+    "marker": TYPE_IDS["general_marker"],
 }
 
 
@@ -56,66 +52,32 @@ PALETTE_GRID = {
 }
 
 
-def generate_strategy(title: str, objects: list) -> str:
+def _build_binary(title: str, type_ids: list, coords: list, colors: list,
+                  texts: dict = None) -> bytes:
     """
-    Generate FF14 strategy code.
-    objects: list of tuples. Supported formats:
-      - (type, x, y): Default color
-      - (type, x, y, color): Custom color
-    
-    'color' can be:
-      - Tuple (r, g, b)
-      - String "x,y" for palette lookup (e.g. "1,7")
+    Assemble a strategy binary block by block.
+
+    texts maps object index -> content for Text (0x64) objects.
     """
-    num = len(objects)
-    
-    # Prepare data
-    type_ids = []
-    coords = []
-    colors = []
-    
-    for obj in objects:
-        # Unpack based on length
-        if len(obj) == 3:
-            t, x, y = obj
-            c = None
-        elif len(obj) == 4:
-            t, x, y, c = obj
-        else:
-            raise ValueError(f"Invalid object format: {obj}")
-            
-        tid = TYPES.get(t.lower(), t) if isinstance(t, str) else t
-        type_ids.append(tid)
-        coords.append((int(x * 10), int(y * 10)))
-        
-        # Resolve color
-        final_color = (255, 255, 255) # Default white
-        if c:
-            if isinstance(c, tuple) and len(c) >= 3:
-                final_color = (c[0], c[1], c[2])
-            elif isinstance(c, str):
-                # Try to parse "x,y" for palette
-                try:
-                    px, py = map(int, c.split(','))
-                    if (px, py) in PALETTE_GRID:
-                        final_color = PALETTE_GRID[(px, py)]
-                except:
-                    pass
-        colors.append(final_color)
-    
+    num = len(type_ids)
+
     # Title - ensure (28 + title_len) is multiple of 4
     title_bytes = title.encode('utf-8') + b'\x00'
     # Pad to ensure 4-byte alignment of content start
-    while (28 + len(title_bytes)) % 4 != 0:
-        title_bytes += b'\x00'
+    title_bytes += bytes(-(28 + len(title_bytes)) % 4)
     title_len = len(title_bytes)
     
     # Build content
     content = bytearray()
     
-    # TYPE: 4 bytes each
-    for tid in type_ids:
+    # TYPE: 4 bytes each, Text objects followed by 03 00 [Len] + UTF-8
+    # (null-terminated, padded to 4 bytes)
+    for i, tid in enumerate(type_ids):
         content += struct.pack('<HH', 0x0002, tid)
+        if tid == TEXT_TYPE_ID and texts and texts.get(i):
+            text_bytes = texts[i][:MAX_TEXT_CHARS].encode('utf-8') + b'\x00'
+            text_bytes += bytes(-len(text_bytes) % 4)
+            content += struct.pack('<HH', 0x0003, len(text_bytes)) + text_bytes
     
     # LAYER: uint16 per object
     content += struct.pack('<HHH', 0x0004, 0x0001, num)
@@ -166,8 +128,195 @@ def generate_strategy(title: str, objects: list) -> str:
     header += struct.pack('<H', title_len)
     header += title_bytes
     
-    binary = bytes(header) + bytes(content)
-    return encode_strategy(binary)
+    return bytes(header) + bytes(content)
+
+
+# ============================================================================
+# Templates
+# ============================================================================
+
+class StrategyTemplate:
+    """
+    Precompiled layout for boards with a fixed title and type list.
+
+    The static bytes (header, title, TYPE/LAYER blocks, block headers,
+    default sizes and params, footer) are built once. render() copies
+    them into a fresh buffer and writes only the supplied columns with
+    precompiled struct.Struct.pack_into calls.
+
+    Usage:
+        template = StrategyTemplate("Light Party", [0x2F, 0x32, 0x35, 0x35])
+        code = template.code([(180, 120), (330, 120), (180, 260), (330, 260)])
+    """
+
+    def __init__(self, title: str, type_ids: list, texts: dict = None):
+        self.title = title
+        self.type_ids = tuple(type_ids)
+        self.texts = dict(texts or {})
+        n = self.count = len(self.type_ids)
+
+        self._static = _build_binary(title, self.type_ids, [(0, 0)] * n, [(255, 255, 255)] * n,
+                                     self.texts)
+
+        board = StrategyBoard(self._static)
+        self._type_offs = [off + 2 for off in board.type_offsets]
+        self._coord_off = board.offset(BLOCK_COORD)
+        self._angle_off = board.offset(BLOCK_ANGLE)
+        self._size_off = board.offset(BLOCK_SIZE)
+        self._trans_off = board.offset(BLOCK_TRANS)
+        self._param_offs = [board.offset(b) for b in (BLOCK_PARAM_A, BLOCK_PARAM_B, BLOCK_PARAM_C)]
+
+        self._coord_struct = struct.Struct(f'<{2 * n}h')
+        self._angle_struct = struct.Struct(f'<{n}h')
+        self._color_struct = struct.Struct('<' + '3Bx' * n)
+        self._param_struct = struct.Struct(f'<{n}H')
+
+    @property
+    def size(self) -> int:
+        """Binary size of every board rendered from this template."""
+        return len(self._static)
+
+    def _check(self, name: str, values: list):
+        if len(values) != self.count:
+            raise ValueError(f"Expected {self.count} {name}, got {len(values)}")
+
+    def render(self, coords: list, colors: list = None, angles: list = None,
+               sizes: list = None, alphas: list = None, types: list = None,
+               params: list = None) -> bytes:
+        """
+        Build one board binary.
+
+        Args:
+            coords: (x, y) per object in game units
+            colors: Optional (r, g, b) per object (default white)
+            angles: Optional rotation per object in degrees
+            sizes: Optional size per object (0-255, default 100)
+            alphas: Optional transparency per object (0 = opaque)
+            types: Optional type IDs replacing the template's
+            params: Optional (PARAM_A, PARAM_B, PARAM_C) per object
+        """
+        self._check('coords', coords)
+        buf = bytearray(self._static)
+        if types is not None:
+            self._check('types', types)
+            for off, tid in zip(self._type_offs, types):
+                struct.pack_into('<H', buf, off, tid)
+        self._coord_struct.pack_into(
+            buf, self._coord_off, *[int(v * 10) for xy in coords for v in xy]
+        )
+        if colors is not None:
+            self._check('colors', colors)
+            self._color_struct.pack_into(buf, self._trans_off, *chain.from_iterable(colors))
+        if alphas is not None:
+            self._check('alphas', alphas)
+            buf[self._trans_off + 3:self._trans_off + 4 * self.count:4] = bytes(alphas)
+        if angles is not None:
+            self._check('angles', angles)
+            self._angle_struct.pack_into(buf, self._angle_off, *angles)
+        if sizes is not None:
+            self._check('sizes', sizes)
+            buf[self._size_off:self._size_off + self.count] = bytes(sizes)
+        if params is not None:
+            self._check('params', params)
+            for off, column in zip(self._param_offs, zip(*params)):
+                self._param_struct.pack_into(buf, off, *column)
+        return bytes(buf)
+
+    def code(self, coords: list, colors: list = None, angles: list = None,
+             sizes: list = None, alphas: list = None, seed: int = 10,
+             types: list = None, params: list = None) -> str:
+        """Build one board (see render()) and encode it to a strategy code."""
+        return encode_strategy(
+            self.render(coords, colors, angles, sizes, alphas, types, params), seed)
+
+    def render_many(self, rows):
+        """Yield a binary per row; each row is a dict of render() arguments."""
+        for row in rows:
+            yield self.render(**row)
+
+    def code_many(self, rows, seed: int = 10, mode: str = 'serial',
+                  workers: int = None, chunk_size: int = 256):
+        """
+        Yield a strategy code per row, encoding through encode_many.
+
+        Rendering happens in the calling thread; compression and
+        obfuscation fan out according to mode (see ff14_strategy_batch).
+        """
+        for result in encode_many(self.render_many(rows), seed, mode, workers, chunk_size):
+            if not result.ok:
+                raise result.error
+            yield result.value
+
+
+@lru_cache(maxsize=256)
+def get_template(title: str, type_ids: tuple, texts: tuple = ()) -> StrategyTemplate:
+    """Cached StrategyTemplate for a title, type list and (index, text) pairs."""
+    return StrategyTemplate(title, type_ids, dict(texts))
+
+
+# ============================================================================
+# Generation
+# ============================================================================
+
+def resolve_type(t) -> int:
+    """Type ID for a type name or alias (see ff14_strategy_types) or a raw ID."""
+    return type_id(t)
+
+
+def resolve_color(c) -> tuple:
+    """(r, g, b) for a color tuple, "x,y" palette string, or None (white)."""
+    final_color = (255, 255, 255) # Default white
+    if c:
+        if isinstance(c, tuple) and len(c) >= 3:
+            final_color = (c[0], c[1], c[2])
+        elif isinstance(c, str):
+            # Try to parse "x,y" for palette
+            try:
+                px, py = map(int, c.split(','))
+                if (px, py) in PALETTE_GRID:
+                    final_color = PALETTE_GRID[(px, py)]
+            except:
+                pass
+    return final_color
+
+
+def resolve_objects(objects: list) -> tuple:
+    """Split generate_strategy object tuples into (type_ids, coords, colors)."""
+    type_ids = []
+    coords = []
+    colors = []
+    
+    for obj in objects:
+        # Unpack based on length
+        if len(obj) == 3:
+            t, x, y = obj
+            c = None
+        elif len(obj) == 4:
+            t, x, y, c = obj
+        else:
+            raise ValueError(f"Invalid object format: {obj}")
+            
+        type_ids.append(resolve_type(t))
+        coords.append((x, y))
+        colors.append(resolve_color(c))
+    
+    return type_ids, coords, colors
+
+
+def generate_strategy(title: str, objects: list) -> str:
+    """
+    Generate FF14 strategy code.
+    objects: list of tuples. Supported formats:
+      - (type, x, y): Default color
+      - (type, x, y, color): Custom color
+    
+    'color' can be:
+      - Tuple (r, g, b)
+      - String "x,y" for palette lookup (e.g. "1,7")
+    """
+    type_ids, coords, colors = resolve_objects(objects)
+    template = get_template(title, tuple(type_ids))
+    return encode_strategy(template.render(coords, colors))
 
 
 if __name__ == "__main__":
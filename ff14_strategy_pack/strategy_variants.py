@@ -0,0 +1,228 @@
+"""
+Strategy Variant Generator
+
+Enumerates every combination (or a random sample) of per-slot type
+choices over a fixed base layout, e.g. all 4 x 4 x 5 x 6 light-party
+compositions, and exports them as strategy codes.
+
+All variants share one StrategyTemplate: only the TYPE entries are
+patched per variant, and compression/encoding fans out through
+encode_many.
+
+Variants are numbered in mixed radix over the slot choice lists, last
+slot fastest (the same order as itertools.product), so a variant index
+alone identifies its composition.
+
+Output file format (text, one variant per line after the header):
+    #ff14-variants {"title": ..., "layout": [...], "slots": {...}, "total": N}
+    <variant index>\t<strategy code>
+
+Dependencies: strategy_generator.py (StrategyTemplate, resolve_objects)
+"""
+import json
+import random
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .strategy_generator import get_template, resolve_objects, resolve_type
+
+FILE_MAGIC = '#ff14-variants'
+
+# Unique sampling gives up after this many new indices in a row fail the
+# uniqueness check (the space has fewer valid variants than requested, or
+# they are too sparse to find by rejection)
+MAX_REJECTIONS = 1_000_000
+
+
+class VariantSpace:
+    """
+    All type assignments for the chosen slots of a base layout.
+
+    Args:
+        title: Board title shared by every variant
+        layout: Base objects in generate_strategy format
+            ((type, x, y) or (type, x, y, color))
+        slots: Object index -> list of candidate types (names or IDs)
+        unique: Skip variants that use the same type in two slots
+    """
+
+    def __init__(self, title: str, layout: list, slots: Dict[int, list], unique: bool = False):
+        self.title = title
+        self.layout = list(layout)
+        self.type_ids, self.coords, self.colors = resolve_objects(self.layout)
+        for index in slots:
+            if not 0 <= index < len(self.layout):
+                raise ValueError(f"Slot {index} out of range (0-{len(self.layout) - 1})")
+            if not slots[index]:
+                raise ValueError(f"Slot {index} has no choices")
+
+        self.slot_indices = sorted(slots)
+        self.slot_names = [list(slots[i]) for i in self.slot_indices]
+        self.slot_choices = [[resolve_type(t) for t in slots[i]] for i in self.slot_indices]
+        self.unique = unique
+        self.template = get_template(title, tuple(self.type_ids))
+
+        self.total = 1
+        for choices in self.slot_choices:
+            self.total *= len(choices)
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def choice_indices(self, index: int) -> Tuple[int, ...]:
+        """Per-slot choice positions for a variant index."""
+        if not 0 <= index < self.total:
+            raise IndexError(f"Variant {index} out of range (0-{self.total - 1})")
+        picks = []
+        for choices in reversed(self.slot_choices):
+            index, pick = divmod(index, len(choices))
+            picks.append(pick)
+        return tuple(reversed(picks))
+
+    def index_of(self, picks: Iterable[int]) -> int:
+        """Variant index for per-slot choice positions."""
+        index = 0
+        for pick, choices in zip(picks, self.slot_choices):
+            index = index * len(choices) + pick
+        return index
+
+    def types_for(self, index: int) -> List[int]:
+        """Full type ID list of a variant."""
+        types = list(self.type_ids)
+        for slot, choices, pick in zip(self.slot_indices, self.slot_choices, self.choice_indices(index)):
+            types[slot] = choices[pick]
+        return types
+
+    def names_for(self, index: int) -> List:
+        """Slot choices of a variant as originally given (names or IDs)."""
+        return [names[p] for names, p in zip(self.slot_names, self.choice_indices(index))]
+
+    def _accept(self, index: int) -> bool:
+        if not self.unique:
+            return True
+        picked = [c[p] for c, p in zip(self.slot_choices, self.choice_indices(index))]
+        return len(set(picked)) == len(picked)
+
+    def indices(self, sample: int = None, rng_seed: int = None) -> Iterator[int]:
+        """
+        Yield variant indices: all of them in order, or a random sample.
+
+        Sampling never materialises the full space, so it also works for
+        spaces with billions of variants. With unique=True it raises
+        ValueError after MAX_REJECTIONS consecutive invalid draws.
+        """
+        if sample is None:
+            yield from (i for i in range(self.total) if self._accept(i))
+            return
+
+        rng = random.Random(rng_seed)
+        if not self.unique:
+            yield from rng.sample(range(self.total), min(sample, self.total))
+            return
+
+        # Rejection sampling for unique assignments
+        seen = set()
+        rejected = 0
+        while len(seen) < self.total and sample > 0:
+            index = rng.randrange(self.total)
+            if index in seen:
+                continue
+            seen.add(index)
+            if self._accept(index):
+                rejected = 0
+                sample -= 1
+                yield index
+                continue
+            rejected += 1
+            if rejected >= MAX_REJECTIONS:
+                raise ValueError(
+                    f"No unique variant found in {MAX_REJECTIONS} draws; "
+                    f"the space may hold fewer than the {sample} still requested")
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+
+    def render(self, index: int) -> bytes:
+        """Binary for one variant."""
+        return self.template.render(self.coords, self.colors, types=self.types_for(index))
+
+    def codes(self, indices: Iterable[int] = None, seed: int = 10, mode: str = 'serial',
+              workers: int = None, chunk_size: int = 256) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (variant index, code), encoding in parallel per mode.
+
+        Args:
+            indices: Variant indices (default: every variant)
+            seed, mode, workers, chunk_size: see encode_many. 'process' and
+                'auto' start worker processes, which re-import the calling
+                script under the spawn start method (Windows/macOS): scripts
+                need an if __name__ == "__main__" guard.
+        """
+        if indices is None:
+            indices = self.indices()
+        pending = deque()  # indices handed to code_many, not yet yielded back
+
+        def rows():
+            for index in indices:
+                pending.append(index)
+                yield {'coords': self.coords, 'colors': self.colors, 'types': self.types_for(index)}
+
+        for code in self.template.code_many(rows(), seed, mode, workers, chunk_size):
+            yield pending.popleft(), code
+
+    def header(self) -> dict:
+        return {
+            'title': self.title,
+            'layout': [list(obj) for obj in self.layout],
+            'slots': {str(i): names for i, names in zip(self.slot_indices, self.slot_names)},
+            'unique': self.unique,
+            'total': self.total,
+        }
+
+    def write(self, path: str, sample: int = None, rng_seed: int = None, **encode_options) -> int:
+        """
+        Stream variants to an indexed output file.
+
+        Returns:
+            Number of variants written
+        """
+        written = 0
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(f"{FILE_MAGIC} {json.dumps(self.header(), ensure_ascii=False)}\n")
+            for index, code in self.codes(self.indices(sample, rng_seed), **encode_options):
+                f.write(f"{index}\t{code}\n")
+                written += 1
+        return written
+
+
+def read_variants(path: str) -> Tuple[dict, Iterator[Tuple[int, str]]]:
+    """
+    Open a variant file.
+
+    Returns:
+        (header dict, iterator of (variant index, code))
+    """
+    f = open(path, encoding='utf-8')
+    first = f.readline()
+    if not first.startswith(FILE_MAGIC):
+        f.close()
+        raise ValueError(f"{path} is not a variant file")
+    header = json.loads(first[len(FILE_MAGIC):])
+
+    def rows():
+        with f:
+            for line in f:
+                index, code = line.rstrip('\n').split('\t', 1)
+                yield int(index), code
+
+    return header, rows()
+
+
+def load_space(header: dict) -> VariantSpace:
+    """Rebuild the VariantSpace described by a variant file header."""
+    slots = {int(i): names for i, names in header['slots'].items()}
+    # JSON turns color tuples into lists
+    layout = [tuple(tuple(v) if isinstance(v, list) else v for v in obj) for obj in header['layout']]
+    return VariantSpace(header['title'], layout, slots, header.get('unique', False))